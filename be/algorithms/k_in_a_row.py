@@ -0,0 +1,219 @@
+import random
+import time
+from functools import lru_cache
+
+# Generalised N x N, k-in-a-row engine. Each player's stones are one int
+# bitboard (bit r * size + c), every possible winning line is a precomputed
+# mask, and the search is negamax with alpha-beta, a Zobrist-hashed
+# transposition table and iterative deepening under a time limit.
+WIN = 1_000_000
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class Game:
+    def __init__(self, size, k):
+        if not 3 <= size <= 19:
+            raise ValueError("size must be between 3 and 19")
+        if not 3 <= k <= size:
+            raise ValueError("k must be between 3 and size")
+        self.size = size
+        self.k = k
+        self.cells = size * size
+        self.full = (1 << self.cells) - 1
+        self.lines = []
+        for r in range(size):
+            for c in range(size):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                    if 0 <= end_r < size and 0 <= end_c < size:
+                        mask = 0
+                        for i in range(k):
+                            mask |= 1 << ((r + dr * i) * size + c + dc * i)
+                        self.lines.append(mask)
+        self.lines_through = [[m for m in self.lines if m >> cell & 1] for cell in range(self.cells)]
+        # Cells on more winning lines are tried first when nothing better is known.
+        self.static_order = sorted(range(self.cells), key=lambda cell: -len(self.lines_through[cell]))
+        rng = random.Random(size * 131 + k)
+        self.zobrist = [[rng.getrandbits(64) for _ in range(self.cells)] for _ in range(2)]
+        self.neighbourhood = []
+        for cell in range(self.cells):
+            r, c = divmod(cell, size)
+            mask = 0
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    if 0 <= r + dr < size and 0 <= c + dc < size:
+                        mask |= 1 << ((r + dr) * size + c + dc)
+            self.neighbourhood.append(mask)
+
+    def wins(self, stones, cell):
+        for mask in self.lines_through[cell]:
+            if stones & mask == mask:
+                return True
+        return False
+
+    def winner(self, stones):
+        for mask in self.lines:
+            if stones & mask == mask:
+                return True
+        return False
+
+    def evaluate(self, mine, theirs):
+        score = 0
+        for mask in self.lines:
+            if mask & theirs == 0:
+                count = bin(mask & mine).count("1")
+                if count:
+                    score += 1 << (2 * count)
+            elif mask & mine == 0:
+                score -= 1 << (2 * bin(mask & theirs).count("1"))
+        return score
+
+    def candidates(self, mine, theirs):
+        occupied = mine | theirs
+        empty = [cell for cell in self.static_order if not occupied >> cell & 1]
+        if self.cells <= 16 or not occupied:
+            return empty
+        # On large boards only cells next to an existing stone are worth trying.
+        return [cell for cell in empty if self.neighbourhood[cell] & occupied]
+
+
+class Search:
+    def __init__(self, game, time_limit_ms):
+        self.game = game
+        self.deadline = time.perf_counter() + time_limit_ms / 1000
+        self.table = {}
+        self.nodes = 0
+
+    def order(self, mine, theirs, tt_move):
+        game = self.game
+        moves = game.candidates(mine, theirs)
+        winning, blocking, rest = [], [], []
+        for cell in moves:
+            bit = 1 << cell
+            if game.wins(mine | bit, cell):
+                winning.append(cell)
+            elif game.wins(theirs | bit, cell):
+                blocking.append(cell)
+            else:
+                rest.append(cell)
+        ordered = winning + blocking + rest
+        if tt_move in ordered:
+            ordered.remove(tt_move)
+            ordered.insert(0, tt_move)
+        return ordered
+
+    def negamax(self, mine, theirs, key, side, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        game = self.game
+        if (mine | theirs) == game.full:
+            return 0, None
+        if depth == 0:
+            return game.evaluate(mine, theirs), None
+
+        alpha_orig = alpha
+        entry = self.table.get(key)
+        tt_move = None
+        if entry is not None:
+            e_depth, e_value, e_flag, tt_move = entry
+            if e_depth >= depth:
+                if e_flag == EXACT:
+                    return e_value, tt_move
+                if e_flag == LOWER:
+                    alpha = max(alpha, e_value)
+                elif e_flag == UPPER:
+                    beta = min(beta, e_value)
+                if alpha >= beta:
+                    return e_value, tt_move
+
+        best_value, best_move = -WIN * 2, None
+        for cell in self.order(mine, theirs, tt_move):
+            bit = 1 << cell
+            child_key = key ^ game.zobrist[side][cell]
+            if game.wins(mine | bit, cell):
+                value = WIN - ply
+            else:
+                value, _ = self.negamax(theirs, mine | bit, child_key, 1 - side, depth - 1, -beta, -alpha, ply + 1)
+                value = -value
+            if value > best_value:
+                best_value, best_move = value, cell
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        flag = EXACT
+        if best_value <= alpha_orig:
+            flag = UPPER
+        elif best_value >= beta:
+            flag = LOWER
+        self.table[key] = (depth, best_value, flag, best_move)
+        return best_value, best_move
+
+
+@lru_cache(maxsize=32)
+def get_game(size, k):
+    return Game(size, k)
+
+
+def best_move(board, k, ai_player='O', human_player='X', time_limit_ms=1000, stats=None):
+    return search_move(board, k, ai_player, human_player, time_limit_ms, stats)[0]
+
+
+# Returns (move, timed_out); timed_out is True when the deadline stopped the
+# iterative deepening before it proved a result or searched the whole game.
+def search_move(board, k, ai_player='O', human_player='X', time_limit_ms=1000, stats=None):
+    size = len(board)
+    game = get_game(size, k)
+    mine = theirs = key = 0
+    for r in range(size):
+        for c in range(size):
+            cell = r * size + c
+            if board[r][c] == ai_player:
+                mine |= 1 << cell
+                key ^= game.zobrist[0][cell]
+            elif board[r][c] == human_player:
+                theirs |= 1 << cell
+                key ^= game.zobrist[1][cell]
+    empties = game.cells - bin(mine | theirs).count("1")
+    if empties == 0:
+        return None, False
+
+    began = time.perf_counter()
+    search = Search(game, time_limit_ms)
+    move = game.candidates(mine, theirs)[0]
+    timed_out = False
+    for depth in range(1, empties + 1):
+        try:
+            value, found = search.negamax(mine, theirs, key, 0, depth, -WIN * 2, WIN * 2, 0)
+        except SearchTimeout:
+            timed_out = True
+            break
+        if found is not None:
+            move = found
+        if abs(value) >= WIN - game.cells:
+            break
+    if stats is not None:
+        stats.algorithm = "negamax"
+        stats.nodes_expanded += search.nodes
+        stats.peak_closed = max(stats.peak_closed, len(search.table))
+        stats.add_phase("search", time.perf_counter() - began)
+    return divmod(move, size), timed_out
+
+
+def check_winner(board, k):
+    size = len(board)
+    game = get_game(size, k)
+    for player in ('X', 'O'):
+        stones = 0
+        for r in range(size):
+            for c in range(size):
+                if board[r][c] == player:
+                    stones |= 1 << (r * size + c)
+        if game.winner(stones):
+            return player
+    return None
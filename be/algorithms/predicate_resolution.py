@@ -1,12 +1,62 @@
+import re
+from functools import lru_cache
 from nltk import logic
-from nltk.inference import ResolutionProver
+from algorithms.proof_pool import get_pool
 
-def prove_custom_logic(premises_raw, goal_raw):
-    lp = logic.LogicParser()
-    
+PARSE_CACHE_SIZE = 1024
+PROOF_CACHE_SIZE = 512
+# "nltk" runs nltk's ResolutionProver; "indexed" runs resolution_engine.py,
+# which scales to larger knowledge bases and reports the derivation.
+ENGINES = ("nltk", "indexed")
+VARIABLE = re.compile(r"\bz\d+\b")
+
+# Parsed formulas are normalized so that alpha-equivalent inputs share one
+# cache entry. nltk's normalize() gives every variable its own z<n> name but
+# numbers them in sorted order of the original names, so they are numbered
+# again in order of first appearance.
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_formula(text):
+    parser = logic.LogicParser()
+    names = {}
+    renamed = VARIABLE.sub(lambda m: names.setdefault(m.group(), f"z{len(names) + 1}"),
+                           str(parser.parse(text).normalize()))
+    return parser.parse(renamed)
+
+
+def canonical_problem(premises_raw, goal_raw):
+    premises = tuple(sorted({str(parse_formula(" ".join(p.split()))) for p in premises_raw}))
+    goal = str(parse_formula(" ".join(goal_raw.split())))
+    return premises, goal
+
+
+class ProofAborted(Exception):
+    def __init__(self, result):
+        super().__init__(result["status"])
+        self.result = result
+
+
+# Keyed on the canonical problem, so premise order, duplicates, whitespace and
+# bound-variable names do not cause misses. Proofs that hit a limit raise, so
+# only finished proofs are cached.
+@lru_cache(maxsize=PROOF_CACHE_SIZE)
+def prove_canonical(premises, goal, time_limit_ms, max_clauses, pool_size, engine="nltk"):
+    result = get_pool(pool_size).prove(list(premises), goal, time_limit_ms, max_clauses, engine)
+    if result["status"] not in ("proved", "not_proved"):
+        raise ProofAborted(result)
+    return result
+
+
+def cache_stats():
+    stats = {}
+    for name, cached in (("parse", parse_formula), ("proof", prove_canonical)):
+        info = cached.cache_info()
+        stats[name] = {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+    return stats
+
+
+def prove_custom_logic(premises_raw, goal_raw, time_limit_ms=5000, max_clauses=1000, pool_size=2, engine="nltk"):
     try:
-        premises = [lp.parse(p) for p in premises_raw]
-        goal = lp.parse(goal_raw)
+        premises, goal = canonical_problem(premises_raw, goal_raw)
     except Exception as e:
         return {
             "success": False,
@@ -14,15 +64,32 @@ def prove_custom_logic(premises_raw, goal_raw):
             "explanation": []
         }
 
-    prover = ResolutionProver()
-    proof = prover.prove(goal, premises, verbose=True)
-    
-    explanation = []
-    for i, p in enumerate(premises_raw, start=1):
-        explanation.append(f"{i}. {p}")
-    explanation.append(f"{len(premises_raw) + 1}. GOAL: {goal_raw}")
-    
-    return {
-        "success": proof,
-        "explanation": explanation
-    }
\ No newline at end of file
+    try:
+        result = prove_canonical(premises, goal, time_limit_ms, max_clauses, pool_size, engine)
+        success = result["status"] == "proved"
+    except ProofAborted as e:
+        result = e.result
+        success = None
+
+    # The indexed engine reports the clauses the refutation used; otherwise
+    # the explanation restates the problem.
+    explanation = list(result.get("steps", []))
+    if not explanation:
+        for i, p in enumerate(premises_raw, start=1):
+            explanation.append(f"{i}. {p}")
+        explanation.append(f"{len(premises_raw) + 1}. GOAL: {goal_raw}")
+
+    response = {
+        "success": success,
+        "status": result["status"],
+        "explanation": explanation,
+        "stats": {
+            "clauses_generated": result["clauses_generated"],
+            "elapsed_ms": result["elapsed_ms"],
+        },
+    }
+    if "clauses_subsumed" in result:
+        response["stats"]["clauses_subsumed"] = result["clauses_subsumed"]
+    if "error" in result:
+        response["error"] = result["error"]
+    return response
@@ -0,0 +1,146 @@
+import multiprocessing
+import queue
+import threading
+import time
+
+# Longest a new worker may take to import its provers before a proof is sent
+# to it anyway.
+BOOT_TIMEOUT_S = 60
+
+# Resolution proofs run in a small pool of pre-warmed worker processes, so a
+# runaway proof costs one worker process rather than a request thread. The
+# parent enforces the wall-clock limit by killing the worker and starting a
+# fresh one; the worker enforces the clause limit itself.
+
+class ClauseLimitExceeded(Exception):
+    pass
+
+
+class BoundedClauses(list):
+    def __init__(self, clauses, limit, counter=None):
+        super().__init__(clauses)
+        self.initial = len(clauses)
+        self.limit = limit
+        self.counter = counter
+
+    def append(self, clause):
+        if len(self) - self.initial >= self.limit:
+            raise ClauseLimitExceeded()
+        super().append(clause)
+        if self.counter is not None:
+            self.counter.value += 1
+
+
+def run_proof(premises, goal, max_clauses, engine="nltk", counter=None):
+    if engine == "indexed":
+        from algorithms.resolution_engine import prove
+        return prove(premises, goal, max_clauses, counter)
+
+    from nltk import logic
+    from nltk.inference.resolution import ResolutionProver
+
+    state = {}
+
+    class BoundedResolutionProver(ResolutionProver):
+        def _attempt_proof(self, clauses):
+            state["clauses"] = BoundedClauses(clauses, max_clauses, counter)
+            return super()._attempt_proof(state["clauses"])
+
+    parser = logic.LogicParser()
+    try:
+        proved = BoundedResolutionProver().prove(parser.parse(goal), [parser.parse(p) for p in premises])
+        status = "proved" if proved else "not_proved"
+    except ClauseLimitExceeded:
+        status = "limit"
+    clauses = state.get("clauses")
+    generated = len(clauses) - clauses.initial if clauses is not None else 0
+    return {"status": status, "clauses_generated": generated}
+
+
+# `counter` is shared memory the parent can still read after it has killed a
+# worker that ran out of time. It stays at -1 until the worker has booted.
+def _worker_main(conn, counter):
+    # Importing nltk up front is the slow part of a cold proof.
+    import nltk.inference.resolution
+    import algorithms.resolution_engine
+    counter.value = 0
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        counter.value = 0
+        try:
+            conn.send(run_proof(*job, counter=counter))
+        except Exception as e:
+            conn.send({"status": "error", "error": str(e), "clauses_generated": 0})
+
+
+class ProofPool:
+    def __init__(self, size):
+        self.context = multiprocessing.get_context("spawn")
+        self.idle = queue.Queue()
+        for _ in range(size):
+            self.idle.put(self._spawn())
+
+    def _spawn(self):
+        parent_conn, child_conn = self.context.Pipe()
+        counter = self.context.Value("i", -1, lock=False)
+        process = self.context.Process(target=_worker_main, args=(child_conn, counter), daemon=True)
+        process.start()
+        child_conn.close()
+        return process, parent_conn, counter
+
+    def _replace(self, worker):
+        process, conn, _ = worker
+        process.kill()
+        process.join()
+        conn.close()
+        self.idle.put(self._spawn())
+
+    # Waits for a worker that is still importing its provers, so the boot of
+    # a new or replacement worker is not charged to the proof it runs.
+    def _wait_until_booted(self, worker):
+        process, _, counter = worker
+        limit = time.perf_counter() + BOOT_TIMEOUT_S
+        while counter.value < 0 and process.is_alive() and time.perf_counter() < limit:
+            time.sleep(0.005)
+
+    def prove(self, premises, goal, time_limit_ms, max_clauses, engine="nltk"):
+        began = time.perf_counter()
+        try:
+            worker = self.idle.get(timeout=time_limit_ms / 1000)
+        except queue.Empty:
+            return {"status": "timeout", "clauses_generated": 0, "elapsed_ms": round(time_limit_ms, 3)}
+        queued = time.perf_counter() - began
+        self._wait_until_booted(worker)
+        started = time.perf_counter()
+        remaining = time_limit_ms / 1000 - queued
+        process, conn, counter = worker
+        try:
+            conn.send((premises, goal, max_clauses, engine))
+            if conn.poll(max(remaining, 0)):
+                result = conn.recv()
+                self.idle.put(worker)
+            else:
+                generated = max(counter.value, 0)
+                self._replace(worker)
+                result = {"status": "timeout", "clauses_generated": generated}
+        except (EOFError, OSError):
+            generated = max(counter.value, 0)
+            self._replace(worker)
+            result = {"status": "error", "error": "Proof worker exited unexpectedly", "clauses_generated": generated}
+        result["elapsed_ms"] = round((queued + time.perf_counter() - started) * 1000, 3)
+        return result
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(size=2):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProofPool(size)
+    return _pool
@@ -0,0 +1,269 @@
+import heapq
+import time
+from itertools import count
+from algorithms.search_core import PROGRESS_CHECK, SearchProblem, finish, search_events
+
+# Shared state engine for the sliding-puzzle solvers. A board is packed into a
+# single int with `bits` bits per cell, so states hash and compare as ints and
+# a move is two XORs. Goal positions, Manhattan distances and blank moves are
+# precomputed once per goal, and nodes only keep a parent pointer; the path is
+# rebuilt when the goal is reached.
+class PuzzleSpace:
+    __slots__ = ("n", "size", "bits", "mask", "goal", "goal_state", "distance", "moves")
+
+    def __init__(self, goal):
+        self.n = len(goal)
+        self.size = self.n * self.n
+        self.bits = max(1, (self.size - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        self.goal = goal
+        tiles = [tile for row in goal for tile in row]
+        if sorted(tiles) != list(range(self.size)) or any(len(row) != self.n for row in goal):
+            raise ValueError(f"Goal must be a {self.n}x{self.n} board holding 0..{self.size - 1}")
+        goal_pos = {tile: cell for cell, tile in enumerate(tiles)}
+        self.distance = [[0] * self.size for _ in range(self.size)]
+        for tile in range(1, self.size):
+            gx, gy = divmod(goal_pos[tile], self.n)
+            for cell in range(self.size):
+                x, y = divmod(cell, self.n)
+                self.distance[tile][cell] = abs(x - gx) + abs(y - gy)
+        self.moves = []
+        for cell in range(self.size):
+            x, y = divmod(cell, self.n)
+            adjacent = []
+            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < self.n and 0 <= ny < self.n:
+                    adjacent.append(nx * self.n + ny)
+            self.moves.append(tuple(adjacent))
+        self.goal_state, _ = self.pack(goal)
+
+    def pack(self, board):
+        tiles = [tile for row in board for tile in row]
+        if len(board) != self.n or sorted(tiles) != list(range(self.size)):
+            raise ValueError(f"Board must be a {self.n}x{self.n} board holding 0..{self.size - 1}")
+        state = 0
+        for cell, tile in enumerate(tiles):
+            state |= tile << (cell * self.bits)
+        return state, tiles.index(0)
+
+    # A board can reach the goal iff the parity of the tile permutation
+    # (blank included) matches the parity of the blank's Manhattan distance,
+    # since every move is one transposition that moves the blank one step.
+    def is_solvable(self, board):
+        self.pack(board)
+        tiles = [tile for row in board for tile in row]
+        goal_pos = {tile: cell for cell, tile in enumerate(tile for row in self.goal for tile in row)}
+        perm = [goal_pos[tile] for tile in tiles]
+        inversions = 0
+        for i in range(self.size):
+            for j in range(i + 1, self.size):
+                if perm[i] > perm[j]:
+                    inversions += 1
+        blank, goal_blank = tiles.index(0), goal_pos[0]
+        blank_distance = abs(blank // self.n - goal_blank // self.n) + abs(blank % self.n - goal_blank % self.n)
+        return inversions % 2 == blank_distance % 2
+
+    def unpack(self, state):
+        tiles = [(state >> (cell * self.bits)) & self.mask for cell in range(self.size)]
+        return [tiles[i:i + self.n] for i in range(0, self.size, self.n)]
+
+    def manhattan(self, state):
+        dist = 0
+        for cell in range(self.size):
+            dist += self.distance[(state >> (cell * self.bits)) & self.mask][cell]
+        return dist
+
+    def root(self, board):
+        state, blank = self.pack(board)
+        return Node(state, blank, 0, self.manhattan(state), None)
+
+    def expand(self, node):
+        bits, mask, distance = self.bits, self.mask, self.distance
+        state, blank = node.state, node.blank
+        blank_shift = blank * bits
+        for cell in self.moves[blank]:
+            shift = cell * bits
+            tile = (state >> shift) & mask
+            child = state ^ (tile << shift) ^ (tile << blank_shift)
+            h = node.h - distance[tile][cell] + distance[tile][blank]
+            yield Node(child, cell, node.g + 1, h, node)
+
+    def path(self, node):
+        states = []
+        while node is not None:
+            states.append(node.state)
+            node = node.parent
+        states.reverse()
+        return [self.unpack(state) for state in states]
+
+
+class Node:
+    __slots__ = ("state", "blank", "g", "h", "parent")
+
+    def __init__(self, state, blank, g, h, parent):
+        self.state = state
+        self.blank = blank
+        self.g = g
+        self.h = h
+        self.parent = parent
+
+
+# Search problem over a PuzzleSpace for the shared core. A state is the packed
+# board with the blank's cell stored above it, so states stay plain ints, and
+# the Manhattan distance is updated per move.
+class PuzzleProblem(SearchProblem):
+    def __init__(self, space, board):
+        self.space = space
+        self.board = board
+        self.blank_shift = space.size * space.bits
+        self.board_mask = (1 << self.blank_shift) - 1
+        self.goal_state = space.goal_state
+
+    def start_state(self):
+        packed, blank = self.space.pack(self.board)
+        return packed | blank << self.blank_shift
+
+    def is_goal(self, state):
+        return state & self.board_mask == self.goal_state
+
+    def heuristic(self, state):
+        return self.space.manhattan(state & self.board_mask)
+
+    def unpack(self, state):
+        return self.space.unpack(state & self.board_mask)
+
+    def successors(self, state, h):
+        space = self.space
+        bits, mask, distance, top = space.bits, space.mask, space.distance, self.blank_shift
+        blank = state >> top
+        packed = state ^ (blank << top)
+        blank_shift = blank * bits
+        for cell in space.moves[blank]:
+            shift = cell * bits
+            tile = (packed >> shift) & mask
+            yield ((packed ^ (tile << shift) ^ (tile << blank_shift)) | cell << top, 1,
+                   h - distance[tile][cell] + distance[tile][blank])
+
+
+# Best-first search over a PuzzleSpace. With greedy=False nodes are ordered by
+# f = g + h (A*), otherwise by h alone; `mode` picks any other search_core
+# mode ("weighted", "ara", "beam") and `options` are passed through to it.
+def best_first_search(start, goal, greedy=False, stats=None, mode=None, **options):
+    return finish(best_first_events(start, goal, greedy, stats=stats, mode=mode, **options))
+
+
+# Generator form of best_first_search. Every `progress_ms` it yields a progress
+# event, plus a final one with the totals; the result dict is the generator's
+# return value. With progress_ms=None it never yields.
+def best_first_events(start, goal, greedy=False, progress_ms=None, stats=None, mode=None, **options):
+    mode = mode or ("greedy" if greedy else "astar")
+    space = PuzzleSpace(goal)
+    if not space.is_solvable(start):
+        return unsolvable()
+    problem = PuzzleProblem(space, start)
+    found = yield from search_events(problem, mode, progress_ms=progress_ms, stats=stats, **options)
+    result = {"success": found["success"], "path": [problem.unpack(state) for state in found["path"]]}
+    if mode not in ("astar", "greedy"):
+        result["cost"] = found["cost"]
+        result["bound"] = found["bound"]
+    for field in ("reason", "limited"):
+        if field in found:
+            result[field] = found[field]
+    return result
+
+
+def unsolvable():
+    return {
+        "success": False,
+        "path": [],
+        "reason": "Start and goal have different permutation parity, so the goal cannot be reached",
+    }
+
+
+# Bidirectional A*: a forward search towards the goal and a backward search
+# towards the start (moves are reversible, so the backward search is an
+# ordinary search from the goal). The smaller frontier is expanded first, and
+# the best meeting cost mu is optimal once it is no larger than the best f on
+# either frontier. Like search_core it gives up with a "reason", marked
+# "limited", once `time_limit_ms` passes or more than `max_nodes` states are
+# stored, and fills in `stats` for both directions together.
+def bidirectional_search(start, goal, time_limit_ms=None, max_nodes=None, stats=None):
+    began = time.perf_counter()
+    deadline = began + time_limit_ms / 1000 if time_limit_ms is not None else float('inf')
+    max_nodes = max_nodes if max_nodes is not None else float('inf')
+    forward = PuzzleSpace(goal)
+    if not forward.is_solvable(start):
+        return unsolvable()
+    backward = PuzzleSpace(start)
+    tie = count()
+    sides = []
+    for space, board in ((forward, start), (backward, goal)):
+        root = space.root(board)
+        sides.append({
+            "space": space,
+            "open": [(root.h, next(tie), root)],
+            "nodes": {root.state: root},
+        })
+
+    mu, meet = float('inf'), None
+    if start == goal:
+        mu, meet = 0, forward.pack(start)[0]
+
+    expanded = generated = steps = peak_open = 0
+    searching = time.perf_counter()
+
+    def finish(result, reconstructing):
+        if stats is not None:
+            stats.algorithm = "bidirectional-astar"
+            stats.nodes_expanded += expanded
+            stats.nodes_generated += generated
+            pushes = next(tie)
+            stats.heap_pushes += pushes
+            stats.heap_pops += pushes - len(sides[0]["open"]) - len(sides[1]["open"])
+            stats.peak_open = max(stats.peak_open, peak_open)
+            stats.peak_closed = max(stats.peak_closed, len(sides[0]["nodes"]) + len(sides[1]["nodes"]))
+            stats.add_phase("setup", searching - began)
+            stats.add_phase("search", reconstructing - searching)
+            stats.add_phase("path", time.perf_counter() - reconstructing)
+        return result
+
+    while sides[0]["open"] and sides[1]["open"]:
+        if mu <= max(sides[0]["open"][0][0], sides[1]["open"][0][0]):
+            break
+        steps += 1
+        if steps % PROGRESS_CHECK == 0:
+            now = time.perf_counter()
+            if now >= deadline:
+                return finish({"success": False, "path": [], "reason": "Time limit reached", "limited": True}, now)
+            if len(sides[0]["nodes"]) + len(sides[1]["nodes"]) > max_nodes:
+                return finish({"success": False, "path": [], "reason": f"Node limit of {max_nodes} reached",
+                               "limited": True}, now)
+        i = 0 if len(sides[0]["open"]) <= len(sides[1]["open"]) else 1
+        side, other = sides[i], sides[1 - i]
+        _, _, current = heapq.heappop(side["open"])
+        if side["nodes"][current.state] is not current:
+            continue
+        expanded += 1
+
+        for child in side["space"].expand(current):
+            generated += 1
+            known = side["nodes"].get(child.state)
+            if known is not None and known.g <= child.g:
+                continue
+            side["nodes"][child.state] = child
+            heapq.heappush(side["open"], (child.g + child.h, next(tie), child))
+            match = other["nodes"].get(child.state)
+            if match is not None and child.g + match.g < mu:
+                mu, meet = child.g + match.g, child.state
+        peak_open = max(peak_open, len(sides[0]["open"]) + len(sides[1]["open"]))
+
+    reconstructing = time.perf_counter()
+    if meet is None:
+        return finish({"success": False, "path": []}, reconstructing)
+    path = forward.path(sides[0]["nodes"][meet])
+    node = sides[1]["nodes"][meet].parent
+    while node is not None:
+        path.append(forward.unpack(node.state))
+        node = node.parent
+    return finish({"success": True, "path": path}, reconstructing)
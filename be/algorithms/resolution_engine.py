@@ -0,0 +1,486 @@
+import heapq
+from collections import defaultdict
+from itertools import chain
+from nltk.inference.resolution import clausify
+from nltk.sem import logic
+
+# Given-clause resolution prover used by /api/custom-logic with
+# "engine": "indexed". Formulas are parsed and turned into clauses by nltk, so
+# both engines read the input the same way, but the search is our own:
+#
+# - Clauses are tuples of literals (positive, predicate, args). Terms are ints
+#   for variables (numbered 0, 1, ... per clause), strings for constants and
+#   tuples (function, *args) for Skolem and other function terms.
+# - Set of support: the premises are only ever resolved against clauses that
+#   descend from the negated goal (or from a premise with no positive
+#   literal), which sit in a queue picked lightest first (every FIFO_RATIO-th
+#   pick takes the oldest instead, so none starve).
+# - Partners for a literal are looked up by (polarity, predicate) instead of
+#   trying every pair of clauses.
+# - Tautologies and clauses subsumed by a kept clause are dropped as they are
+#   made (forward subsumption), and a new clause deletes the kept clauses it
+#   subsumes (backward subsumption).
+#
+# Every kept clause remembers its parents, so a proof comes back as the list
+# of steps that derive the empty clause.
+
+FIFO_RATIO = 5
+SUBSUMPTION_BUDGET = 100
+VARIABLE_NAMES = "xyzuvw"
+
+
+class ClauseLimitExceeded(Exception):
+    pass
+
+
+class Clause:
+    __slots__ = ("id", "literals", "keys", "rule", "parents", "weight", "usable", "selected", "deleted")
+
+    def __init__(self, id, literals, rule, parents=()):
+        self.id = id
+        self.literals = literals
+        self.keys = {literal[:2] for literal in literals}
+        self.rule = rule
+        self.parents = parents
+        self.weight = sum(1 + sum(term_size(arg) for arg in args) for _, _, args in literals)
+        self.usable = False
+        self.selected = False
+        self.deleted = False
+
+    def __str__(self):
+        return clause_str(self.literals)
+
+
+def term_size(term):
+    if isinstance(term, tuple):
+        return 1 + sum(term_size(arg) for arg in term[1:])
+    return 1
+
+
+def term_str(term, names):
+    if isinstance(term, int):
+        if term not in names:
+            i = len(names)
+            names[term] = VARIABLE_NAMES[i % len(VARIABLE_NAMES)] + (str(i // len(VARIABLE_NAMES)) if i >= len(VARIABLE_NAMES) else "")
+        return names[term]
+    if isinstance(term, tuple):
+        return f"{term[0]}({','.join(term_str(arg, names) for arg in term[1:])})"
+    return term
+
+
+def clause_str(literals):
+    names = {}
+    parts = []
+    for positive, predicate, args in literals:
+        if predicate == "=":
+            atom = f"{term_str(args[0], names)} = {term_str(args[1], names)}"
+            parts.append(atom if positive else f"-({atom})")
+        else:
+            atom = f"{predicate}({','.join(term_str(arg, names) for arg in args)})" if args else predicate
+            parts.append(atom if positive else f"-{atom}")
+    return "{" + ", ".join(parts) + "}"
+
+
+# nltk expressions -> our terms. `variables` maps nltk variable names to ints.
+
+def convert_term(expression, variables):
+    if isinstance(expression, logic.IndividualVariableExpression):
+        return variables.setdefault(expression.variable.name, len(variables))
+    if isinstance(expression, logic.ApplicationExpression):
+        function, args = expression.uncurry()
+        return (str(function),) + tuple(convert_term(arg, variables) for arg in args)
+    return str(expression)
+
+
+def convert_literal(expression, variables):
+    positive = not isinstance(expression, logic.NegatedExpression)
+    atom = expression if positive else expression.term
+    if isinstance(atom, logic.EqualityExpression):
+        return positive, "=", (convert_term(atom.first, variables), convert_term(atom.second, variables))
+    predicate, args = atom.uncurry()
+    return positive, str(predicate), tuple(convert_term(arg, variables) for arg in args)
+
+
+def to_clauses(expression):
+    clauses = []
+    for clause in clausify(expression):
+        variables = {}
+        clauses.append(normalize(convert_literal(literal, variables) for literal in clause))
+    return clauses
+
+
+# Sorts and dedups the literals and renumbers the variables 0, 1, ... in order
+# of appearance, so equal clauses compare equal.
+def normalize(literals):
+    literals = sorted(set(literals), key=repr)
+    mapping = {}
+
+    def rename(term):
+        if isinstance(term, int):
+            return mapping.setdefault(term, len(mapping))
+        if isinstance(term, tuple):
+            return (term[0],) + tuple(rename(arg) for arg in term[1:])
+        return term
+
+    return tuple((positive, predicate, tuple(rename(arg) for arg in args)) for positive, predicate, args in literals)
+
+
+def variable_count(literals):
+    top = -1
+
+    def walk(term):
+        nonlocal top
+        if isinstance(term, int):
+            top = max(top, term)
+        elif isinstance(term, tuple):
+            for arg in term[1:]:
+                walk(arg)
+
+    for _, _, args in literals:
+        for arg in args:
+            walk(arg)
+    return top + 1
+
+
+def shift(term, offset):
+    if isinstance(term, int):
+        return term + offset
+    if isinstance(term, tuple):
+        return (term[0],) + tuple(shift(arg, offset) for arg in term[1:])
+    return term
+
+
+def walk(term, subst):
+    while isinstance(term, int) and term in subst:
+        term = subst[term]
+    return term
+
+
+def substitute(term, subst):
+    term = walk(term, subst)
+    if isinstance(term, tuple):
+        return (term[0],) + tuple(substitute(arg, subst) for arg in term[1:])
+    return term
+
+
+def occurs(var, term, subst):
+    term = walk(term, subst)
+    if term == var:
+        return True
+    return isinstance(term, tuple) and any(occurs(var, arg, subst) for arg in term[1:])
+
+
+# Most general unifier of two argument tuples, extending `subst`, or None.
+def unify(left, right, subst):
+    subst = dict(subst)
+    pending = list(zip(left, right))
+    while pending:
+        a, b = pending.pop()
+        a, b = walk(a, subst), walk(b, subst)
+        if a == b:
+            continue
+        if isinstance(a, int):
+            if occurs(a, b, subst):
+                return None
+            subst[a] = b
+        elif isinstance(b, int):
+            if occurs(b, a, subst):
+                return None
+            subst[b] = a
+        elif isinstance(a, tuple) and isinstance(b, tuple) and a[0] == b[0] and len(a) == len(b):
+            pending.extend(zip(a[1:], b[1:]))
+        else:
+            return None
+    return subst
+
+
+# One-way matching: binds only the variables of `pattern`; the variables of
+# `target` are treated as constants.
+def match(pattern, target, subst):
+    if isinstance(pattern, int):
+        bound = subst.get(pattern)
+        if bound is None:
+            subst[pattern] = target
+            return True
+        return bound == target
+    if isinstance(pattern, tuple):
+        return (isinstance(target, tuple) and pattern[0] == target[0] and len(pattern) == len(target)
+                and all(match(p, t, subst) for p, t in zip(pattern[1:], target[1:])))
+    return pattern == target
+
+
+# True if some substitution maps every literal of `general` onto a literal of
+# `specific`. The search backtracks over candidate literals, which can blow up
+# on long clauses full of variables, so it gives up (answering False, which
+# only costs a missed deletion) after SUBSUMPTION_BUDGET match attempts.
+def subsumes(general, specific):
+    if len(general) > len(specific):
+        return False
+    options = []
+    for positive, predicate, args in general:
+        candidates = [other[2] for other in specific if other[0] == positive and other[1] == predicate]
+        if not candidates:
+            return False
+        options.append((args, candidates))
+    options.sort(key=lambda option: len(option[1]))
+    budget = SUBSUMPTION_BUDGET
+
+    def extend(i, subst):
+        nonlocal budget
+        if i == len(options):
+            return True
+        args, candidates = options[i]
+        for other in candidates:
+            budget -= 1
+            if budget < 0:
+                return False
+            trial = dict(subst)
+            if all(match(p, t, trial) for p, t in zip(args, other)) and extend(i + 1, trial):
+                return True
+        return False
+
+    return extend(0, {})
+
+
+def is_tautology(literals):
+    positives = {(predicate, args) for positive, predicate, args in literals if positive}
+    return any(not positive and (predicate, args) in positives for positive, predicate, args in literals) or \
+        any(positive and predicate == "=" and args[0] == args[1] for positive, predicate, args in literals)
+
+
+def apply(literals, subst):
+    return normalize((positive, predicate, tuple(substitute(arg, subst) for arg in args))
+                     for positive, predicate, args in literals)
+
+
+# The axioms that make "=" behave as equality: reflexivity, symmetry,
+# transitivity, and substitution into every argument of each predicate and
+# function that appears. Only added when a formula uses "=".
+def equality_axioms(clauses):
+    predicates, functions = set(), set()
+
+    def collect(term):
+        if isinstance(term, tuple):
+            functions.add((term[0], len(term) - 1))
+            for arg in term[1:]:
+                collect(arg)
+
+    for literals in clauses:
+        for _, predicate, args in literals:
+            if predicate != "=":
+                predicates.add((predicate, len(args)))
+            for arg in args:
+                collect(arg)
+
+    axioms = [
+        ((True, "=", (0, 0)),),
+        ((False, "=", (0, 1)), (True, "=", (1, 0))),
+        ((False, "=", (0, 1)), (False, "=", (1, 2)), (True, "=", (0, 2))),
+    ]
+    for name, arity in sorted(predicates):
+        for i in range(arity):
+            before = tuple(range(2, arity + 1))
+            left, right = before[:i] + (0,) + before[i:], before[:i] + (1,) + before[i:]
+            axioms.append(((False, "=", (0, 1)), (False, name, left), (True, name, right)))
+    for name, arity in sorted(functions):
+        for i in range(arity):
+            before = tuple(range(2, arity + 1))
+            left, right = before[:i] + (0,) + before[i:], before[:i] + (1,) + before[i:]
+            axioms.append(((False, "=", (0, 1)), (True, "=", ((name,) + left, (name,) + right))))
+    return [normalize(axiom) for axiom in axioms]
+
+
+class Prover:
+    def __init__(self, max_clauses, counter=None):
+        self.max_clauses = max_clauses
+        self.counter = counter
+        self.clauses = []
+        self.generated = 0
+        self.subsumed = 0
+        self.tautologies = 0
+        # (positive, predicate) -> [(clause, literal index)] over the usable
+        # clauses, which is where resolution partners come from.
+        self.partners = defaultdict(list)
+        # (positive, predicate) -> kept clauses containing such a literal, and
+        # kept clauses keyed by their first literal only, for subsumption.
+        self.containing = defaultdict(list)
+        self.leading = defaultdict(list)
+        self.by_weight = []
+        self.by_age = []
+        self.picks = 0
+
+    def new_clause(self, literals, rule, parents=()):
+        clause = Clause(len(self.clauses), literals, rule, parents)
+        self.clauses.append(clause)
+        return clause
+
+    def forward_subsumed(self, literals):
+        keys = {literal[:2] for literal in literals}
+        for key in keys:
+            for kept in self.leading[key]:
+                if not kept.deleted and kept.keys <= keys and subsumes(kept.literals, literals):
+                    return True
+        return False
+
+    def backward_subsume(self, clause):
+        for kept in self.containing[clause.literals[0][:2]]:
+            if (not kept.deleted and kept is not clause and clause.keys <= kept.keys
+                    and subsumes(clause.literals, kept.literals)):
+                kept.deleted = True
+                self.subsumed += 1
+
+    def keep(self, clause):
+        self.backward_subsume(clause)
+        self.leading[clause.literals[0][:2]].append(clause)
+        for key in clause.keys:
+            self.containing[key].append(clause)
+
+    def make_usable(self, clause):
+        if clause.usable:
+            return
+        clause.usable = True
+        for i, (positive, predicate, _) in enumerate(clause.literals):
+            self.partners[(positive, predicate)].append((clause, i))
+
+    def enqueue(self, clause):
+        heapq.heappush(self.by_weight, (clause.weight, clause.id, clause))
+        heapq.heappush(self.by_age, (clause.id, clause))
+
+    def pick(self):
+        self.picks += 1
+        queue = self.by_age if self.picks % FIFO_RATIO == 0 else self.by_weight
+        while queue:
+            clause = heapq.heappop(queue)[-1]
+            if not clause.deleted and not clause.selected:
+                clause.selected = True
+                return clause
+        return None
+
+    # Simplifies a freshly derived clause and keeps it. Returns the clause,
+    # or None when it was discarded.
+    def derive(self, literals, rule, parents):
+        self.generated += 1
+        if self.counter is not None:
+            self.counter.value += 1
+        if self.generated > self.max_clauses:
+            raise ClauseLimitExceeded()
+        if is_tautology(literals):
+            self.tautologies += 1
+            return None
+        if self.forward_subsumed(literals):
+            self.subsumed += 1
+            return None
+        clause = self.new_clause(literals, rule, parents)
+        if literals:
+            self.keep(clause)
+            self.enqueue(clause)
+        return clause
+
+    def resolvents(self, given):
+        offset = variable_count(given.literals)
+        for i, (positive, predicate, args) in enumerate(given.literals):
+            for partner, j in list(self.partners[(not positive, predicate)]):
+                if partner.deleted:
+                    continue
+                other = partner.literals[j]
+                other_args = tuple(shift(arg, offset) for arg in other[2])
+                subst = unify(args, other_args, {})
+                if subst is None:
+                    continue
+                rest = given.literals[:i] + given.literals[i + 1:] + tuple(
+                    (p, q, tuple(shift(arg, offset) for arg in a))
+                    for k, (p, q, a) in enumerate(partner.literals) if k != j)
+                yield apply(rest, subst), (given.id, partner.id)
+
+    def factors(self, given):
+        literals = given.literals
+        for i in range(len(literals)):
+            for j in range(i + 1, len(literals)):
+                if literals[i][:2] == literals[j][:2]:
+                    subst = unify(literals[i][2], literals[j][2], {})
+                    if subst is not None:
+                        yield apply(literals, subst)
+
+    # `usable` and `support` are lists of (literals, rule). Returns the empty
+    # clause, or None once the set of support runs out.
+    def run(self, usable, support):
+        for literals, rule in usable:
+            if is_tautology(literals) or self.forward_subsumed(literals):
+                continue
+            clause = self.new_clause(literals, rule)
+            if not literals:
+                return clause
+            self.keep(clause)
+        for clause in self.clauses:
+            if not clause.deleted:
+                self.make_usable(clause)
+        for literals, rule in support:
+            if is_tautology(literals):
+                continue
+            clause = self.new_clause(literals, rule)
+            if not literals:
+                return clause
+            self.keep(clause)
+            self.enqueue(clause)
+
+        while True:
+            given = self.pick()
+            if given is None:
+                return None
+            self.make_usable(given)
+            derived = chain(((literals, "factor", (given.id,)) for literals in self.factors(given)),
+                            ((literals, "resolve", parents) for literals, parents in self.resolvents(given)))
+            for literals, rule, parents in derived:
+                clause = self.derive(literals, rule, parents)
+                if clause is not None and not clause.literals:
+                    return clause
+
+    # The clauses the empty clause was derived from, in derivation order.
+    def derivation(self, empty):
+        needed = set()
+        stack = [empty.id]
+        while stack:
+            i = stack.pop()
+            if i not in needed:
+                needed.add(i)
+                stack.extend(self.clauses[i].parents)
+        numbers = {}
+        steps = []
+        for i in sorted(needed):
+            clause = self.clauses[i]
+            numbers[i] = len(steps) + 1
+            if clause.rule == "premise":
+                source = "premise"
+            elif clause.rule == "goal":
+                source = "negated goal"
+            elif clause.rule == "axiom":
+                source = "equality axiom"
+            else:
+                source = f"{clause.rule} " + ", ".join(str(numbers[p]) for p in clause.parents)
+            steps.append(f"{numbers[i]}. {clause}  [{source}]")
+        return steps
+
+
+def prove(premises, goal, max_clauses=1000, counter=None):
+    parser = logic.LogicParser()
+    premise_clauses = [literals for premise in premises for literals in to_clauses(parser.parse(premise))]
+    goal_clauses = to_clauses(logic.NegatedExpression(parser.parse(goal)))
+    # Set of support is only complete when the clauses outside it are
+    # consistent. Clauses with a positive literal always are (make every atom
+    # true), so premises without one start in the set of support as well.
+    usable = [(literals, "premise") for literals in premise_clauses if any(literal[0] for literal in literals)]
+    support = [(literals, "premise") for literals in premise_clauses if not any(literal[0] for literal in literals)]
+    support += [(literals, "goal") for literals in goal_clauses]
+    if any(predicate == "=" for literals in premise_clauses + goal_clauses for _, predicate, _ in literals):
+        usable += [(literals, "axiom") for literals in equality_axioms(premise_clauses + goal_clauses)]
+    prover = Prover(max_clauses, counter)
+    result = {"status": "not_proved", "steps": []}
+    try:
+        empty = prover.run(usable, support)
+        if empty is not None:
+            result = {"status": "proved", "steps": prover.derivation(empty)}
+    except ClauseLimitExceeded:
+        result = {"status": "limit", "steps": []}
+    result["clauses_generated"] = prover.generated
+    result["clauses_subsumed"] = prover.subsumed
+    return result
@@ -0,0 +1,372 @@
+import heapq
+import time
+from itertools import count
+
+# Shared search core for the state-space solvers. A problem describes itself
+# through SearchProblem, and the core does the rest: A*, weighted A*, greedy
+# best-first, anytime repairing A* (ARA*) and beam search share one node
+# type, duplicate detection and path reconstruction.
+#
+# Weighted A* orders nodes by g + w*h and returns a path at most w times the
+# optimal cost. ARA* starts at weight w, hands back that path, then lowers the
+# weight and reuses the work done so far to improve it until the path is
+# provably optimal or the time or node budget runs out; the result carries the
+# proven suboptimality bound. Beam search keeps only the best `beam_width`
+# nodes of each depth, so it uses memory proportional to width x depth and is
+# neither complete nor optimal.
+
+# Progress, the time limit and the node cap are checked every PROGRESS_CHECK
+# expansions, which keeps the clock out of the inner loop.
+PROGRESS_CHECK = 1024
+MODES = ("astar", "weighted", "greedy", "ara", "beam")
+ARA_STEP = 0.5
+
+
+# The problem interface. `successors` gets the parent's heuristic so that
+# problems with an incrementally updated heuristic (the sliding puzzles) do
+# not have to recompute it; others can ignore it and call heuristic(child).
+# `key`, if set, maps a state to the hashable value duplicates are detected
+# on; by default the state itself is used.
+class SearchProblem:
+    key = None
+
+    def start_state(self):
+        raise NotImplementedError
+
+    def is_goal(self, state):
+        raise NotImplementedError
+
+    # Yields (child, step_cost, child_h) for every move out of `state`.
+    def successors(self, state, h):
+        raise NotImplementedError
+
+    def heuristic(self, state):
+        return 0
+
+
+class Node:
+    __slots__ = ("state", "g", "h", "parent")
+
+    def __init__(self, state, g, h, parent):
+        self.state = state
+        self.g = g
+        self.h = h
+        self.parent = parent
+
+
+def path_to(node):
+    states = []
+    while node is not None:
+        states.append(node.state)
+        node = node.parent
+    states.reverse()
+    return states
+
+
+def identity(state):
+    return state
+
+
+def search(problem, mode="astar", **options):
+    return finish(search_events(problem, mode, **options))
+
+
+# Generator form of search(). Every `progress_ms` it yields a progress event,
+# plus a final one with the totals; the result dict is the generator's return
+# value. With progress_ms=None it never yields.
+#
+# The result has "success", "path" (a list of states), "cost" and "bound", the
+# factor by which the cost may exceed the optimum (None for greedy and beam,
+# which give no guarantee). "reason" says why a search stopped early; a search
+# cut short by `time_limit_ms` or `max_nodes` is marked "limited" and still
+# returns the best path it found, if any.
+def search_events(problem, mode="astar", weight=1.0, beam_width=100, max_nodes=None, time_limit_ms=None,
+                  progress_ms=None, stats=None):
+    if mode not in MODES:
+        raise ValueError(f"Unknown search mode '{mode}'. Choose one of {', '.join(MODES)}.")
+    if mode in ("weighted", "ara") and weight < 1:
+        raise ValueError("'weight' must be at least 1")
+    if mode == "beam" and beam_width < 1:
+        raise ValueError("'beam_width' must be at least 1")
+    if mode == "astar":
+        weight = 1
+    if stats is not None:
+        stats.algorithm = {"weighted": "weighted-astar", "ara": "ara-star"}.get(mode, mode)
+    run = beam_events if mode == "beam" else best_first_events
+    return (yield from run(problem, mode, weight, beam_width, max_nodes, time_limit_ms, progress_ms, stats))
+
+
+def best_first_events(problem, mode, weight, beam_width, max_nodes, time_limit_ms, progress_ms, stats):
+    began = time.perf_counter()
+    # The hot loop skips the call when states are their own key.
+    key = problem.key
+    key_of = key or identity
+    successors = problem.successors
+    is_goal = problem.is_goal
+    greedy = mode == "greedy"
+    deadline = began + time_limit_ms / 1000 if time_limit_ms else float('inf')
+    next_report = began + progress_ms / 1000 if progress_ms else float('inf')
+    max_nodes = max_nodes or float('inf')
+
+    start = problem.start_state()
+    root = Node(start, 0, problem.heuristic(start), None)
+    tie = count()
+    eps = weight
+    open_list = [(root.h if greedy else root.g + eps * root.h, next(tie), root)]
+    best = {key_of(start): root}
+    closed = set()
+    incons = {}
+    incumbent = None
+    bound = None
+    reason = None
+    limited = False
+    expanded = generated = peak_open = 0
+    searching = time.perf_counter()
+
+    def progress():
+        event = {
+            "event": "progress",
+            "nodes_expanded": expanded,
+            "frontier": len(open_list),
+            "best_f": open_list[0][0] if open_list else None,
+            "elapsed_ms": round((time.perf_counter() - began) * 1000, 3),
+        }
+        if mode == "ara":
+            event["weight"] = eps
+            event["best_cost"] = incumbent.g if incumbent else None
+            event["bound"] = bound
+        return event
+
+    # One pass of (weighted) A* at the current eps. It stops once no open
+    # node could lead to a path cheaper than the incumbent; states improved
+    # after they were closed wait in `incons` for the next pass.
+    def improve():
+        nonlocal incumbent, reason, limited, expanded, generated, peak_open, next_report
+        while open_list:
+            f, _, node = open_list[0]
+            state_key = node.state if key is None else key(node.state)
+            if state_key in closed or best[state_key] is not node:
+                heapq.heappop(open_list)
+                continue
+            if incumbent is not None and incumbent.g <= f:
+                return
+            heapq.heappop(open_list)
+            closed.add(state_key)
+            if is_goal(node.state):
+                if incumbent is None or node.g < incumbent.g:
+                    incumbent = node
+                if greedy:
+                    return
+                continue
+            expanded += 1
+            if expanded % PROGRESS_CHECK == 0:
+                now = time.perf_counter()
+                if now >= deadline:
+                    reason, limited = "Time limit reached", True
+                    return
+                if len(best) > max_nodes:
+                    reason, limited = f"Node limit of {max_nodes} reached", True
+                    return
+                if now >= next_report:
+                    next_report = now + progress_ms / 1000
+                    yield progress()
+
+            g = node.g
+            for child, cost, h in successors(node.state, node.h):
+                generated += 1
+                child_key = child if key is None else key(child)
+                child_g = g + cost
+                known = best.get(child_key)
+                if known is not None and known.g <= child_g:
+                    continue
+                child_node = Node(child, child_g, h, node)
+                best[child_key] = child_node
+                if child_key in closed:
+                    incons[child_key] = child_node
+                else:
+                    heapq.heappush(open_list, (h if greedy else child_g + eps * h, next(tie), child_node))
+            if len(open_list) > peak_open:
+                peak_open = len(open_list)
+
+    # Proven factor between the incumbent's cost and the optimum: no path can
+    # be cheaper than the smallest g + h still waiting to be expanded.
+    def proven_bound():
+        if incumbent is None or greedy:
+            return None
+        if eps == 1 and reason is None:
+            return 1.0
+        waiting = [node for _, _, node in open_list
+                   if best[key_of(node.state)] is node and key_of(node.state) not in closed]
+        lowest = min((node.g + node.h for node in (*waiting, *incons.values())), default=None)
+        if lowest is None or lowest >= incumbent.g:
+            return 1.0
+        return min(eps, incumbent.g / lowest) if lowest > 0 else eps
+
+    yield from improve()
+    bound = proven_bound()
+    while mode == "ara" and reason is None and bound is not None and bound > 1 and eps > 1:
+        if progress_ms:
+            yield progress()
+        eps = max(1.0, eps - ARA_STEP)
+        live = {key_of(node.state): node for _, _, node in open_list
+                if best[key_of(node.state)] is node and key_of(node.state) not in closed}
+        live.update(incons)
+        open_list[:] = [(node.g + eps * node.h, next(tie), node) for node in live.values()]
+        heapq.heapify(open_list)
+        closed.clear()
+        incons.clear()
+        yield from improve()
+        bound = proven_bound()
+
+    reconstructing = time.perf_counter()
+    if incumbent is None:
+        result = {"success": False, "path": [], "cost": None, "bound": None}
+        if reason is None:
+            reason = "Goal is not reachable from start"
+    else:
+        result = {"success": True, "path": path_to(incumbent), "cost": incumbent.g, "bound": bound}
+    if reason is not None:
+        result["reason"] = reason
+    if limited:
+        result["limited"] = True
+    if stats is not None:
+        pushes = next(tie)
+        stats.nodes_expanded += expanded
+        stats.nodes_generated += generated
+        stats.heap_pushes += pushes
+        stats.heap_pops += pushes - len(open_list)
+        stats.peak_open = max(stats.peak_open, peak_open)
+        stats.peak_closed = max(stats.peak_closed, len(closed))
+        stats.add_phase("setup", searching - began)
+        stats.add_phase("search", reconstructing - searching)
+        stats.add_phase("path", time.perf_counter() - reconstructing)
+    if progress_ms:
+        yield progress()
+    return result
+
+
+# Breadth-wise beam search: each depth keeps the `beam_width` children with
+# the lowest g + w*h. Only the kept nodes are remembered, so duplicates are
+# detected against earlier beams and memory stays at width x depth nodes.
+def beam_events(problem, mode, weight, beam_width, max_nodes, time_limit_ms, progress_ms, stats):
+    began = time.perf_counter()
+    key = problem.key or identity
+    successors = problem.successors
+    is_goal = problem.is_goal
+    deadline = began + time_limit_ms / 1000 if time_limit_ms else float('inf')
+    next_report = began + progress_ms / 1000 if progress_ms else float('inf')
+    max_nodes = max_nodes or float('inf')
+
+    start = problem.start_state()
+    root = Node(start, 0, problem.heuristic(start), None)
+    seen = {key(start): 0}
+    beam = [root]
+    goal = None
+    reason = None
+    limited = False
+    expanded = generated = peak_open = 0
+    searching = time.perf_counter()
+
+    def progress():
+        return {
+            "event": "progress",
+            "nodes_expanded": expanded,
+            "frontier": len(beam),
+            "best_f": min((node.g + weight * node.h for node in beam), default=None),
+            "elapsed_ms": round((time.perf_counter() - began) * 1000, 3),
+        }
+
+    while beam:
+        goals = [node for node in beam if is_goal(node.state)]
+        if goals:
+            goal = min(goals, key=lambda node: node.g)
+            break
+        candidates = {}
+        for node in beam:
+            expanded += 1
+            g = node.g
+            for child, cost, h in successors(node.state, node.h):
+                generated += 1
+                child_key = key(child)
+                child_g = g + cost
+                known = seen.get(child_key)
+                if known is not None and known <= child_g:
+                    continue
+                other = candidates.get(child_key)
+                if other is None or child_g < other.g:
+                    candidates[child_key] = Node(child, child_g, h, node)
+        if len(candidates) > peak_open:
+            peak_open = len(candidates)
+        beam = heapq.nsmallest(beam_width, candidates.values(), key=lambda node: node.g + weight * node.h)
+        for node in beam:
+            seen[key(node.state)] = node.g
+        now = time.perf_counter()
+        if now >= deadline:
+            reason, limited = "Time limit reached", True
+            break
+        if len(seen) > max_nodes:
+            reason, limited = f"Node limit of {max_nodes} reached", True
+            break
+        if now >= next_report:
+            next_report = now + progress_ms / 1000
+            yield progress()
+
+    reconstructing = time.perf_counter()
+    if goal is None:
+        result = {"success": False, "path": [], "cost": None, "bound": None,
+                  "reason": reason or "Beam ran out of nodes before reaching the goal"}
+    else:
+        result = {"success": True, "path": path_to(goal), "cost": goal.g, "bound": None}
+    if limited:
+        result["limited"] = True
+    if stats is not None:
+        stats.nodes_expanded += expanded
+        stats.nodes_generated += generated
+        stats.peak_open = max(stats.peak_open, peak_open)
+        stats.peak_closed = max(stats.peak_closed, len(seen))
+        stats.add_phase("setup", searching - began)
+        stats.add_phase("search", reconstructing - searching)
+        stats.add_phase("path", time.perf_counter() - reconstructing)
+    if progress_ms:
+        yield progress()
+    return result
+
+
+# Steepest-ascent hill climbing: moves to the unvisited successor with the
+# lowest heuristic while that improves on the current state, and stops at the
+# goal or a local optimum. The path walked is returned either way. `state`
+# overrides the problem's start state.
+def hill_climb(problem, state=None, stats=None):
+    began = time.perf_counter()
+    key = problem.key or identity
+    state = problem.start_state() if state is None else state
+    node = Node(state, 0, problem.heuristic(state), None)
+    visited = {key(state)}
+    expanded = generated = 0
+    while not problem.is_goal(node.state):
+        expanded += 1
+        best = None
+        for child, cost, h in problem.successors(node.state, node.h):
+            generated += 1
+            if key(child) not in visited and (best is None or h < best.h):
+                best = Node(child, node.g + cost, h, node)
+        if best is None or best.h >= node.h:
+            break
+        visited.add(key(best.state))
+        node = best
+    if stats is not None:
+        stats.algorithm = "hill-climbing"
+        stats.nodes_expanded += expanded
+        stats.nodes_generated += generated
+        stats.peak_closed = max(stats.peak_closed, len(visited))
+        stats.add_phase("search", time.perf_counter() - began)
+    return {"success": problem.is_goal(node.state), "path": path_to(node), "cost": node.g}
+
+
+# Runs an event generator to the end and returns its result.
+def finish(events):
+    while True:
+        try:
+            next(events)
+        except StopIteration as stop:
+            return stop.value
@@ -0,0 +1,44 @@
+import time
+from contextlib import contextmanager
+
+# Counters a search fills in when the caller passes one in as `stats`. The
+# searches keep their counts in locals and copy them over once at the end, so
+# passing stats=None costs nothing inside the loops.
+class SearchStats:
+    __slots__ = ("algorithm", "nodes_expanded", "nodes_generated", "heap_pushes", "heap_pops",
+                 "peak_open", "peak_closed", "cache_hit", "phases")
+
+    def __init__(self):
+        self.algorithm = None
+        self.nodes_expanded = 0
+        self.nodes_generated = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.peak_open = 0
+        self.peak_closed = 0
+        self.cache_hit = False
+        self.phases = {}
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - began)
+
+    def to_json(self):
+        return {
+            "algorithm": self.algorithm,
+            "nodes_expanded": self.nodes_expanded,
+            "nodes_generated": self.nodes_generated,
+            "heap_pushes": self.heap_pushes,
+            "heap_pops": self.heap_pops,
+            "peak_open": self.peak_open,
+            "peak_closed": self.peak_closed,
+            "cache_hit": self.cache_hit,
+            "phases_ms": {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+        }
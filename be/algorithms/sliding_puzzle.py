@@ -0,0 +1,227 @@
+import mmap
+import os
+import time
+import numpy as np
+from algorithms.puzzle_engine import PuzzleSpace
+
+# Disjoint tile groups for the additive pattern databases, relative to the
+# canonical goal (tiles 1..N-1 in reading order, blank in the last cell).
+PATTERNS = {
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(1, 2, 5, 6, 9), (3, 4, 7, 8, 12), (10, 11, 13, 14, 15)],
+    5: [(1, 2, 6, 7), (3, 4, 8, 9), (5, 10, 15, 20), (11, 12, 16, 17), (13, 14, 18, 19), (21, 22, 23, 24)],
+}
+UNSEEN = 255
+
+_loaded = {}
+
+
+def pdb_path(folder, n, group):
+    return os.path.join(folder, f"{n}x{n}-{group}.pdb")
+
+
+# A pattern database entry is indexed by sum(cell(tile_i) * N^i) over the
+# group's tiles and stores the fewest moves of those tiles needed to reach
+# their goal cells. The blank is not tracked: a pattern tile may step onto
+# any neighbouring cell not held by another tile of the same group, and moves
+# of other tiles are free. Each real move moves one tile, so the groups' values
+# can be added and stay admissible.
+def build_pattern_database(n, tiles):
+    cells = n * n
+    k = len(tiles)
+    weights = np.array([cells ** i for i in range(k)], dtype=np.int64)
+    dist = np.full(cells ** k, UNSEEN, dtype=np.uint8)
+    start = sum((tile - 1) * cells ** i for i, tile in enumerate(tiles))
+    dist[start] = 0
+    frontier = np.array([start], dtype=np.int64)
+    depth = 0
+    while len(frontier):
+        positions = [(frontier // weights[i]) % cells for i in range(k)]
+        successors = []
+        for i in range(k):
+            pos = positions[i]
+            row, col = pos // n, pos % n
+            for step, valid in ((-n, row > 0), (n, row < n - 1), (-1, col > 0), (1, col < n - 1)):
+                target = pos + step
+                for j in range(k):
+                    if j != i:
+                        valid = valid & (positions[j] != target)
+                successors.append(frontier[valid] + step * weights[i])
+        candidates = np.unique(np.concatenate(successors))
+        frontier = candidates[dist[candidates] == UNSEEN]
+        depth += 1
+        dist[frontier] = depth
+    return dist
+
+
+def build_pattern_databases(n, folder):
+    os.makedirs(folder, exist_ok=True)
+    written = []
+    for group, tiles in enumerate(PATTERNS[n]):
+        path = pdb_path(folder, n, group)
+        tmp = path + ".tmp"
+        build_pattern_database(n, tiles).tofile(tmp)
+        os.replace(tmp, path)
+        written.append(path)
+    return written
+
+
+# Databases are mapped read-only, so every gunicorn worker shares the same
+# page-cache pages instead of holding its own copy.
+def load_pattern_databases(n, folder):
+    key = (n, folder)
+    if key not in _loaded:
+        tables = []
+        for group in range(len(PATTERNS[n])):
+            path = pdb_path(folder, n, group)
+            if not os.path.exists(path):
+                return None
+            with open(path, "rb") as f:
+                tables.append(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        _loaded[key] = tables
+    return _loaded[key]
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class IDAStar:
+    def __init__(self, space, board, tables, deadline):
+        self.n = space.n
+        self.cells = space.size
+        self.moves = space.moves
+        self.deadline = deadline
+        self.board = [tile for row in board for tile in row]
+        self.blank = self.board.index(0)
+        self.nodes = 0
+        goal_tiles = [tile for row in space.goal for tile in row]
+        canonical = goal_tiles.index(0) == self.cells - 1 and tables is not None
+        if canonical:
+            # Relabel tiles so the requested goal becomes the canonical one the
+            # databases were built for: the tile whose goal cell is c becomes c + 1.
+            label = {tile: cell + 1 for cell, tile in enumerate(goal_tiles) if tile}
+            self.tables = tables
+            groups = PATTERNS[self.n]
+        else:
+            label = {tile: tile for tile in goal_tiles if tile}
+            self.tables = None
+            groups = [(tile,) for tile in range(1, self.cells)]
+            self.distance = space.distance
+        self.heuristic = "pdb" if canonical else "manhattan"
+        self.group_of = [0] * self.cells
+        self.weight = [0] * self.cells
+        for g, tiles in enumerate(groups):
+            for i, tile in enumerate(tiles):
+                self.group_of[tile] = g
+                self.weight[tile] = self.cells ** i
+        self.label = [0] * self.cells
+        for tile, relabelled in label.items():
+            self.label[tile] = relabelled
+        self.index = [0] * len(groups)
+        for cell, tile in enumerate(self.board):
+            if tile:
+                t = self.label[tile]
+                self.index[self.group_of[t]] += cell * self.weight[t]
+
+    def group_cost(self, g):
+        if self.tables is not None:
+            return self.tables[g][self.index[g]]
+        # Manhattan fallback: every "group" is a single tile and its index is its cell.
+        return self.distance[g + 1][self.index[g]]
+
+    def estimate(self):
+        return sum(self.group_cost(g) for g in range(len(self.index)))
+
+    def search(self, g, bound, h, previous, path):
+        f = g + h
+        if f > bound:
+            return f
+        if h == 0:
+            return True
+        self.nodes += 1
+        if self.nodes & 4095 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+        smallest = float('inf')
+        blank = self.blank
+        for cell in self.moves[blank]:
+            if cell == previous:
+                continue
+            tile = self.board[cell]
+            t = self.label[tile]
+            grp = self.group_of[t]
+            before = self.group_cost(grp)
+            self.index[grp] += (blank - cell) * self.weight[t]
+            child_h = h - before + self.group_cost(grp)
+            self.board[blank], self.board[cell] = tile, 0
+            self.blank = cell
+            path.append(cell)
+            result = self.search(g + 1, bound, child_h, blank, path)
+            if result is True:
+                return True
+            path.pop()
+            self.blank = blank
+            self.board[blank], self.board[cell] = 0, tile
+            self.index[grp] -= (blank - cell) * self.weight[t]
+            if result < smallest:
+                smallest = result
+        return smallest
+
+    def run(self):
+        h = self.estimate()
+        bound = h
+        path = []
+        iterations = 0
+        while True:
+            iterations += 1
+            result = self.search(0, bound, h, -1, path)
+            if result is True:
+                return path, iterations
+            if result == float('inf'):
+                return None, iterations
+            bound = result
+
+
+def ida_star(start, goal, folder, time_limit_ms=10000):
+    space = PuzzleSpace(goal)
+    if not space.is_solvable(start):
+        return {
+            "success": False,
+            "status": "unsolvable",
+            "path": [],
+            "reason": "Start and goal have different permutation parity, so the goal cannot be reached",
+        }
+    began = time.perf_counter()
+    tables = load_pattern_databases(space.n, folder) if space.n in PATTERNS else None
+    solver = IDAStar(space, start, tables, began + time_limit_ms / 1000)
+    try:
+        moves, iterations = solver.run()
+        status = "solved" if moves is not None else "unsolvable"
+    except SearchTimeout:
+        moves, iterations, status = None, None, "timeout"
+
+    path = []
+    if moves is not None:
+        board = [row[:] for row in start]
+        blank = [tile for row in start for tile in row].index(0)
+        path.append([row[:] for row in board])
+        for cell in moves:
+            bx, by = divmod(blank, space.n)
+            cx, cy = divmod(cell, space.n)
+            board[bx][by], board[cx][cy] = board[cx][cy], 0
+            blank = cell
+            path.append([row[:] for row in board])
+    result = {
+        "success": moves is not None,
+        "status": status,
+        "path": path,
+        "stats": {
+            "heuristic": solver.heuristic,
+            "nodes_expanded": solver.nodes,
+            "iterations": iterations,
+            "elapsed_ms": round((time.perf_counter() - began) * 1000, 3),
+        },
+    }
+    if status == "timeout":
+        result["limited"] = True
+    return result
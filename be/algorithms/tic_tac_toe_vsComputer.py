@@ -1,4 +1,5 @@
 import copy
+import time
 
 def check_winner(board):
     for row in board:
@@ -22,7 +23,9 @@ def make_move(board, x, y, player):
         return True
     return False
 
-def minimax(board, is_maximizing, ai_player, human_player):
+def minimax(board, is_maximizing, ai_player, human_player, stats=None):
+    if stats is not None:
+        stats.nodes_expanded += 1
     winner = check_winner(board)
     if winner == ai_player:
         return 1, None
@@ -38,7 +41,7 @@ def minimax(board, is_maximizing, ai_player, human_player):
         for j in range(3):
             if board[i][j] == '':
                 board[i][j] = ai_player if is_maximizing else human_player
-                score, _ = minimax(board, not is_maximizing, ai_player, human_player)
+                score, _ = minimax(board, not is_maximizing, ai_player, human_player, stats)
                 board[i][j] = ''
 
                 if is_maximizing:
@@ -52,6 +55,87 @@ def minimax(board, is_maximizing, ai_player, human_player):
 
     return best_score, best_move
 
-def get_computer_move(board, ai_player='O', human_player='X'):
-    _, move = minimax(copy.deepcopy(board), True, ai_player, human_player)
-    return move  # returns (x, y)
\ No newline at end of file
+# Perfect-play table for every legal 3x3 position. Cells are encoded in
+# base 3 from the point of view of the player to move (0 empty, 1 mover,
+# 2 opponent), and the entry is the cell minimax would pick, or NO_MOVE for
+# finished and unreachable positions. 3^9 bytes, built once at import.
+NO_MOVE = 255
+POWERS = [3 ** i for i in range(9)]
+LINES = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+
+
+def encode(board, mover, opponent):
+    index = 0
+    for cell in range(9):
+        value = board[cell // 3][cell % 3]
+        if value == mover:
+            index += POWERS[cell]
+        elif value == opponent:
+            index += 2 * POWERS[cell]
+    return index
+
+
+def build_move_table():
+    table = bytearray([NO_MOVE]) * 3 ** 9
+    values = {}
+
+    # Negamax from the mover's side; ties go to the first cell in row-major
+    # order, which is the same move minimax() returns.
+    def solve(cells):
+        index = sum(v * p for v, p in zip(cells, POWERS))
+        if index in values:
+            return values[index]
+        for a, b, c in LINES:
+            if cells[a] == cells[b] == cells[c] != 0:
+                values[index] = 1 if cells[a] == 1 else -1
+                return values[index]
+        if 0 not in cells:
+            values[index] = 0
+            return 0
+        best, best_cell = -2, None
+        for cell in range(9):
+            if cells[cell] == 0:
+                child = [(0, 2, 1)[v] for v in cells]
+                child[cell] = 2
+                score = -solve(child)
+                if score > best:
+                    best, best_cell = score, cell
+        values[index] = best
+        table[index] = best_cell
+        return best
+
+    solve([0] * 9)
+    return bytes(table), len(values)
+
+
+MOVE_TABLE, LEGAL_POSITIONS = build_move_table()
+
+
+def get_computer_move(board, ai_player='O', human_player='X', stats=None):
+    began = time.perf_counter()
+    cell = MOVE_TABLE[encode(board, ai_player, human_player)]
+    if cell != NO_MOVE:
+        if stats is not None:
+            stats.algorithm = "move-table"
+            stats.add_phase("lookup", time.perf_counter() - began)
+        return divmod(cell, 3)
+    # Finished or unreachable boards are left to the full search.
+    _, move = minimax(copy.deepcopy(board), True, ai_player, human_player, stats)
+    if stats is not None:
+        stats.algorithm = "minimax"
+        stats.add_phase("search", time.perf_counter() - began)
+    return move  # returns (x, y)
+
+
+# Checks every table entry against minimax(); returns the mismatching indices.
+def verify_move_table():
+    mismatches = []
+    for index in range(3 ** 9):
+        if MOVE_TABLE[index] == NO_MOVE:
+            continue
+        cells = [(index // POWERS[i]) % 3 for i in range(9)]
+        board = [[('', 'O', 'X')[cells[r * 3 + c]] for c in range(3)] for r in range(3)]
+        _, move = minimax(board, True, 'O', 'X')
+        if move != divmod(MOVE_TABLE[index], 3):
+            mismatches.append(index)
+    return mismatches
\ No newline at end of file
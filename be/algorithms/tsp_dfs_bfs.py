@@ -1,36 +1,90 @@
+import time
 from itertools import permutations
+from algorithms.puzzle_engine import PROGRESS_CHECK, finish
 
-def dfs_tsp(graph, start):
+def dfs_tsp(graph, start, stats=None):
+    return finish(dfs_tsp_events(graph, start, stats=stats))
+
+
+# Depth-first enumeration of tours with an explicit stack; children are pushed
+# in reverse so they are visited in the same order as the recursive version.
+# Every `progress_ms` it yields a progress event with the best tour so far, plus
+# a final one with the totals, and returns (path, cost).
+def dfs_tsp_events(graph, start, progress_ms=None, stats=None):
+    # Matrix input (tsp_matrix.DistanceMatrix) is only ever a few cities here.
+    if hasattr(graph, "to_graph"):
+        graph = graph.to_graph()
     min_cost = float('inf')
     best_path = []
+    began = time.perf_counter()
+    next_report = began + progress_ms / 1000 if progress_ms else float('inf')
+    expanded = generated = peak_open = 0
+
+    def progress():
+        return {
+            "event": "progress",
+            "nodes_expanded": expanded,
+            "frontier": len(stack),
+            "best_cost": min_cost if best_path else None,
+            "elapsed_ms": round((time.perf_counter() - began) * 1000, 3),
+        }
+
+    stack = [(start, {start}, [start], 0)]
+    while stack:
+        current, visited, path, cost = stack.pop()
+        expanded += 1
+        if expanded % PROGRESS_CHECK == 0 and time.perf_counter() >= next_report:
+            next_report = time.perf_counter() + progress_ms / 1000
+            yield progress()
 
-    def dfs(current, visited, path, cost):
-        nonlocal min_cost, best_path
         if len(visited) == len(graph):
-            total_cost = cost + graph[current][start]
+            # Missing edges (inf in a matrix) are simply never taken.
+            total_cost = cost + graph[current].get(start, float('inf'))
             if total_cost < min_cost:
                 min_cost = total_cost
                 best_path = path + [start]
-            return
+            continue
 
-        for neighbor in graph[current]:
-            if neighbor not in visited:
-                dfs(neighbor, visited | {neighbor}, path + [neighbor], cost + graph[current][neighbor])
+        children = [(neighbor, visited | {neighbor}, path + [neighbor], cost + graph[current][neighbor])
+                    for neighbor in graph[current] if neighbor in graph and neighbor not in visited]
+        stack.extend(reversed(children))
+        generated += len(children)
+        if len(stack) > peak_open:
+            peak_open = len(stack)
 
-    dfs(start, {start}, [start], 0)
+    if stats is not None:
+        stats.algorithm = "dfs"
+        stats.nodes_expanded += expanded
+        stats.nodes_generated += generated
+        stats.peak_open = max(stats.peak_open, peak_open)
+        stats.peak_closed = max(stats.peak_closed, len(graph))
+        stats.add_phase("search", time.perf_counter() - began)
+    if progress_ms:
+        yield progress()
     return best_path, min_cost
 
 
-def bfs_tsp(graph, start):
+def bfs_tsp(graph, start, stats=None):
+    if hasattr(graph, "to_graph"):
+        graph = graph.to_graph()
+    began = time.perf_counter()
     min_path = []
     min_cost = float('inf')
+    examined = generated = 0
     for perm in permutations(graph.keys()):
+        generated += 1
         if perm[0] == start:
+            examined += 1
             cost = 0
             for i in range(len(perm) - 1):
-                cost += graph[perm[i]][perm[i + 1]]
-            cost += graph[perm[-1]][start]
+                cost += graph[perm[i]].get(perm[i + 1], float('inf'))
+            cost += graph[perm[-1]].get(start, float('inf'))
             if cost < min_cost:
                 min_cost = cost
                 min_path = list(perm) + [start]
-    return min_path, min_cost
\ No newline at end of file
+    if stats is not None:
+        stats.algorithm = "bfs"
+        stats.nodes_expanded += examined
+        stats.nodes_generated += generated
+        stats.add_phase("search", time.perf_counter() - began)
+    return min_path, min_cost
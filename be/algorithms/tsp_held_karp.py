@@ -0,0 +1,69 @@
+import time
+import numpy as np
+from algorithms.tsp_matrix import graph_to_matrix, path_cost
+
+# Held-Karp bitmask DP over the cities other than the start. dp[mask, j] is
+# the cheapest path that leaves the start, visits exactly the cities in mask
+# and ends at j. Subsets are processed one popcount layer at a time so each
+# layer is a handful of vectorized NumPy operations instead of a Python loop
+# per subset. Memory is 2^(n-1) * (n-1) * 9 bytes regardless of the weights.
+def held_karp_matrix(dist, start):
+    n = len(dist)
+    others = [i for i in range(n) if i != start]
+    m = len(others)
+    if m == 0:
+        return [start, start], dist[start, start]
+
+    size = 1 << m
+    sub = dist[np.ix_(others, others)]
+    dp = np.full((size, m), np.inf)
+    parent = np.full((size, m), -1, dtype=np.int8)
+    for j in range(m):
+        dp[1 << j, j] = dist[start, others[j]]
+
+    masks = np.arange(size, dtype=np.int64)
+    popcount = np.zeros(size, dtype=np.int8)
+    for bit in range(m):
+        popcount += ((masks >> bit) & 1).astype(np.int8)
+
+    for k in range(2, m + 1):
+        layer = masks[popcount == k]
+        for j in range(m):
+            sel = layer[(layer >> j) & 1 == 1]
+            prev = sel ^ (1 << j)
+            cand = dp[prev] + sub[:, j]
+            best = np.argmin(cand, axis=1)
+            dp[sel, j] = cand[np.arange(len(sel)), best]
+            parent[sel, j] = best
+
+    full = size - 1
+    closing = dp[full] + dist[others, start]
+    last = int(np.argmin(closing))
+    cost = closing[last]
+    if not np.isfinite(cost):
+        return [], float('inf')
+
+    order = []
+    mask = full
+    while last != -1:
+        order.append(others[last])
+        prev_last = int(parent[mask, last])
+        mask ^= 1 << last
+        last = prev_last
+    order.reverse()
+    return [start] + order + [start], float(cost)
+
+
+def held_karp_tsp(graph, start, stats=None):
+    began = time.perf_counter()
+    cities, dist, start_idx = graph_to_matrix(graph, start)
+    searching = time.perf_counter()
+    path, cost = held_karp_matrix(dist, start_idx)
+    if stats is not None:
+        stats.algorithm = "held-karp"
+        stats.add_phase("matrix", searching - began)
+        stats.add_phase("search", time.perf_counter() - searching)
+    if not path:
+        return [], cost
+    path = [cities[i] for i in path]
+    return path, path_cost(graph, path)
@@ -0,0 +1,177 @@
+import time
+import numpy as np
+from algorithms.tsp_matrix import graph_to_matrix, path_cost
+
+NEIGHBOURS = 10
+MAX_SEGMENT = 3
+EPS = 1e-9
+
+
+# Setup works on the NumPy matrix: O(n) vector steps each, where pure Python
+# loops took seconds on a couple of thousand cities.
+def nearest_neighbour_tour(dist, start):
+    n = len(dist)
+    tour = [start]
+    free = np.ones(n, dtype=bool)
+    free[start] = False
+    current = start
+    for _ in range(n - 1):
+        nxt = int(np.where(free, dist[current], np.inf).argmin())
+        # Only unreachable cities are left; take the first of them.
+        if not free[nxt]:
+            nxt = int(free.argmax())
+        free[nxt] = False
+        tour.append(nxt)
+        current = nxt
+    return tour
+
+
+# The k nearest other cities of each city, nearest first.
+def neighbour_lists(dist, k):
+    n = len(dist)
+    if k <= 0:
+        return [[] for _ in range(n)]
+    others = dist.copy()
+    np.fill_diagonal(others, np.inf)
+    near = np.argpartition(others, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(others, near, axis=1).argsort(axis=1, kind="stable")
+    return np.take_along_axis(near, order, axis=1).tolist()
+
+
+def tour_length(dist, tour):
+    return sum(dist[tour[i - 1]][tour[i]] for i in range(len(tour)))
+
+
+# `matrix` is the NumPy distance matrix; the search itself reads it as nested
+# lists, which are faster for single lookups. `deadline` is a perf_counter
+# time, so setup counts against the budget.
+class LocalSearch:
+    def __init__(self, matrix, start, deadline):
+        self.dist = matrix.tolist()
+        self.n = len(matrix)
+        self.deadline = deadline
+        self.tour = nearest_neighbour_tour(matrix, start)
+        self.pos = [0] * self.n
+        self.reindex()
+        self.neighbours = neighbour_lists(matrix, min(NEIGHBOURS, self.n - 1))
+        # 2-opt reverses a segment, which only has an O(1) delta when the
+        # graph is symmetric. Or-opt keeps segment orientation and is always safe.
+        self.symmetric = bool(np.array_equal(matrix, matrix.T))
+        self.iterations = 0
+        self.two_opt_moves = 0
+        self.or_opt_moves = 0
+        self.timed_out = False
+
+    def reindex(self, lo=0, hi=None):
+        hi = self.n if hi is None else hi
+        for i in range(lo, hi):
+            self.pos[self.tour[i]] = i
+
+    def succ(self, city):
+        return self.tour[(self.pos[city] + 1) % self.n]
+
+    def pred(self, city):
+        return self.tour[self.pos[city] - 1]
+
+    def out_of_time(self):
+        if time.perf_counter() >= self.deadline:
+            self.timed_out = True
+        return self.timed_out
+
+    def two_opt_pass(self):
+        d = self.dist
+        improved = False
+        for a in list(self.tour):
+            if self.out_of_time():
+                break
+            b = self.succ(a)
+            d_ab = d[a][b]
+            for c in self.neighbours[a]:
+                d_ac = d[a][c]
+                if d_ac >= d_ab:
+                    break
+                e = self.succ(c)
+                if c == b or e == a:
+                    continue
+                delta = d_ac + d[b][e] - d_ab - d[c][e]
+                if delta < -EPS:
+                    i, j = self.pos[a], self.pos[c]
+                    lo, hi = (i + 1, j) if i < j else (j + 1, i)
+                    self.tour[lo:hi + 1] = self.tour[lo:hi + 1][::-1]
+                    self.reindex(lo, hi + 1)
+                    self.two_opt_moves += 1
+                    improved = True
+                    b = self.succ(a)
+                    d_ab = d[a][b]
+        return improved
+
+    def or_opt_pass(self):
+        d = self.dist
+        improved = False
+        for length in range(1, MAX_SEGMENT + 1):
+            if self.n < length + 3:
+                break
+            for first in list(self.tour):
+                if self.out_of_time():
+                    return improved
+                i = self.pos[first]
+                segment = [self.tour[(i + k) % self.n] for k in range(length)]
+                last = segment[-1]
+                p, nx = self.pred(first), self.succ(last)
+                removal = d[p][first] + d[last][nx] - d[p][nx]
+                if removal <= EPS:
+                    continue
+                inside = set(segment)
+                candidates = set(self.neighbours[first])
+                candidates.update(self.pred(c) for c in self.neighbours[last])
+                best, best_delta = None, -EPS
+                for c in candidates:
+                    e = self.succ(c)
+                    if c in inside or e in inside or c == p:
+                        continue
+                    delta = d[c][first] + d[last][e] - d[c][e] - removal
+                    if delta < best_delta:
+                        best, best_delta = c, delta
+                if best is None:
+                    continue
+                rest = [city for city in self.tour if city not in inside]
+                at = rest.index(best) + 1
+                self.tour = rest[:at] + segment + rest[at:]
+                self.reindex()
+                self.or_opt_moves += 1
+                improved = True
+        return improved
+
+    def run(self):
+        initial = tour_length(self.dist, self.tour)
+        improved = self.n > 3
+        while improved and not self.out_of_time():
+            self.iterations += 1
+            improved = self.two_opt_pass() if self.symmetric else False
+            improved = self.or_opt_pass() or improved
+        return initial
+
+
+def local_search_tsp(graph, start, time_budget_ms=1000):
+    began = time.perf_counter()
+    cities, matrix, start_idx = graph_to_matrix(graph, start)
+    search = LocalSearch(matrix, start_idx, began + time_budget_ms / 1000)
+    initial_cost = search.run()
+
+    k = search.pos[start_idx]
+    tour = search.tour[k:] + search.tour[:k]
+    path = [cities[i] for i in tour] + [start]
+    cost = path_cost(graph, path)
+    if cost == float('inf'):
+        # No tour avoids the missing edges, or none that this search found.
+        path = []
+    stats = {
+        "initial_cost": initial_cost,
+        "iterations": search.iterations,
+        "two_opt_moves": search.two_opt_moves,
+        "or_opt_moves": search.or_opt_moves,
+        "improvement": round(initial_cost - cost, 6) if cost != float('inf') else 0,
+        "elapsed_ms": round((time.perf_counter() - began) * 1000, 3),
+        "timed_out": search.timed_out,
+    }
+    return path, cost, stats
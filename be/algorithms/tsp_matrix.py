@@ -0,0 +1,88 @@
+import base64
+from typing import NamedTuple
+import numpy as np
+
+
+# A graph sent to /api/tsp as a dense matrix ("matrix", or little-endian
+# float32 "matrix_b64") plus its city labels. The solvers that work on arrays
+# use `dist` as it is; the brute-force ones, which only take a few cities,
+# turn it into the dict-of-dicts form with to_graph().
+class DistanceMatrix(NamedTuple):
+    cities: list
+    dist: np.ndarray
+
+    def __len__(self):
+        return len(self.cities)
+
+    def __contains__(self, city):
+        return city in self.cities
+
+    def to_graph(self):
+        rows = self.dist.tolist()
+        return {a: {b: cost for b, cost in zip(self.cities, row) if b != a and cost != float('inf')}
+                for a, row in zip(self.cities, rows)}
+
+
+# Builds a DistanceMatrix from the request body. Missing edges can be given as
+# null (or any non-finite number) and become inf; the diagonal is ignored.
+def parse_matrix(data):
+    if data.get("matrix_b64") is not None:
+        try:
+            raw = base64.b64decode(data["matrix_b64"], validate=True)
+        except (TypeError, ValueError):
+            raise ValueError("'matrix_b64' is not valid base64")
+        if len(raw) % 4:
+            raise ValueError("'matrix_b64' must hold float32 values")
+        dist = np.frombuffer(raw, dtype="<f4").astype(np.float64)
+        n = int(round(len(dist) ** 0.5))
+        if n * n != len(dist):
+            raise ValueError(f"'matrix_b64' holds {len(dist)} values, which is not a square matrix")
+        dist = dist.reshape(n, n)
+    else:
+        try:
+            dist = np.array(data["matrix"], dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError("'matrix' must be a list of rows of numbers")
+        if dist.ndim != 2 or dist.shape[0] != dist.shape[1]:
+            raise ValueError("'matrix' must be square")
+    n = len(dist)
+    cities = data.get("cities")
+    if cities is None:
+        cities = [str(i) for i in range(n)]
+    elif not isinstance(cities, list) or len(cities) != n or len(set(map(str, cities))) != n:
+        raise ValueError(f"'cities' must list {n} distinct labels, one per matrix row")
+    dist[~np.isfinite(dist)] = np.inf
+    np.fill_diagonal(dist, np.inf)
+    return DistanceMatrix([str(city) for city in cities], dist)
+
+
+# Converts the dict-of-dicts graph used by /api/tsp into a dense distance
+# matrix. Missing edges become inf so the solvers simply never pick them.
+def graph_to_matrix(graph, start):
+    if isinstance(graph, DistanceMatrix):
+        if start not in graph:
+            raise ValueError(f"Start city '{start}' is not in the graph")
+        return graph.cities, graph.dist, graph.cities.index(start)
+    cities = list(graph.keys())
+    if start not in graph:
+        raise ValueError(f"Start city '{start}' is not in the graph")
+    index = {city: i for i, city in enumerate(cities)}
+    dist = np.full((len(cities), len(cities)), np.inf)
+    for city, edges in graph.items():
+        for neighbor, cost in edges.items():
+            if neighbor in index:
+                dist[index[city], index[neighbor]] = cost
+    return cities, dist, index[start]
+
+
+def path_cost(graph, path):
+    if isinstance(graph, DistanceMatrix):
+        index = {city: i for i, city in enumerate(graph.cities)}
+        path = [index[city] for city in path]
+        return float(graph.dist[path[:-1], path[1:]].sum())
+    cost = 0
+    for a, b in zip(path, path[1:]):
+        if b not in graph[a]:
+            return float('inf')
+        cost += graph[a][b]
+    return cost
@@ -1,9 +1,35 @@
-class WaterJugHillClimbing:
+import time
+import numpy as np
+from algorithms.search_core import SearchProblem, hill_climb
+
+METHODS = ("steepest", "random-restart", "annealing")
+# Upper bound on runs x steps in the walks solve_restarts records.
+HISTORY_CELLS = 5_000_000
+# Default annealing steps per unit of capacity.
+ANNEALING_STEPS = 50
+
+
+# Removes the loops from a walk, leaving a path that visits no state twice.
+def without_cycles(walk):
+    path = []
+    seen = {}
+    for state in walk:
+        if state in seen:
+            for removed in path[seen[state] + 1:]:
+                del seen[removed]
+            del path[seen[state] + 1:]
+        else:
+            seen[state] = len(path)
+            path.append(state)
+    return path
+
+
+class WaterJugHillClimbing(SearchProblem):
     def __init__(self, start, capacity_x, capacity_y, goal):
         self.capacity_x = capacity_x
         self.capacity_y = capacity_y
         self.goal = goal
-        self.path = [start]
+        self.start = start
 
     def get_next_states(self, state):
         x, y = state
@@ -18,26 +44,144 @@ class WaterJugHillClimbing:
         possible_states.add((x + pour_y_to_x, y - pour_y_to_x))
         return list(possible_states)
 
+    # Distance from the goal amounts; each step must lower it.
     def heuristic(self, state):
-        return -abs(self.goal[0] - state[0]) - abs(self.goal[1] - state[1])
+        return abs(self.goal[0] - state[0]) + abs(self.goal[1] - state[1])
+
+    def start_state(self):
+        return self.start
+
+    def is_goal(self, state):
+        return state == self.goal
+
+    def successors(self, state, h):
+        for next_state in self.get_next_states(state):
+            yield next_state, 1, self.heuristic(next_state)
+
+    def solve(self, start, stats=None):
+        return hill_climb(self, start, stats)["path"]
 
-    def solve(self, start):
-        current_state = start
-        visited = set([current_state])
+    # Successors of many states at once, in get_next_states' move order:
+    # fill X, fill Y, empty X, empty Y, pour X->Y, pour Y->X. Returns two
+    # (runs, 6) arrays.
+    def next_state_arrays(self, x, y):
+        cx, cy = self.capacity_x, self.capacity_y
+        x_to_y = np.minimum(x, cy - y)
+        y_to_x = np.minimum(y, cx - x)
+        full_x, full_y, empty = np.full_like(x, cx), np.full_like(y, cy), np.zeros_like(x)
+        nx = np.stack([full_x, x, empty, x, x - x_to_y, x + y_to_x], axis=1)
+        ny = np.stack([y, full_y, y, empty, y + x_to_y, y - y_to_x], axis=1)
+        return nx, ny
 
-        while True:
-            next_states = [s for s in self.get_next_states(current_state) if s not in visited]
-            if not next_states:
-                return self.path
-            next_states.sort(key=self.heuristic, reverse=True)
-            best_next = next_states[0]
 
-            if self.heuristic(best_next) <= self.heuristic(current_state):
-                return self.path
+    # Runs `restarts` randomized local searches from `start` side by side as
+    # NumPy arrays, so a step costs about the same for one run or a thousand.
+    # Runs are capped so their recorded walks stay under HISTORY_CELLS states.
+    #
+    # "random-restart": each run restarts the climb from a random state,
+    # reached by a random number of random moves from `start` (run 0 makes
+    # none), then climbs steepest-ascent: it moves to the neighbour nearest the
+    # goal (ties broken at random) while that is strictly nearer than where it
+    # stands, and stops at the first local maximum, goal or not.
+    # "annealing": every step each run proposes a random move and takes it if
+    # it gets no further from the goal, or otherwise with probability
+    # exp(-increase / T) (the Metropolis rule). T starts at `temperature` (by
+    # default the larger capacity) and is multiplied by `cooling` every
+    # step (by default down to a tenth of that after max_steps).
+    #
+    # success_rate is the share of runs that reach the goal. Returns the
+    # shortest successful walk with its loops removed, or run 0's walk if none
+    # succeeded.
+    def solve_restarts(self, start, method="random-restart", restarts=100, seed=None, time_budget_ms=1000,
+                       max_steps=None, temperature=None, cooling=None, stats=None):
+        if method not in ("random-restart", "annealing"):
+            raise ValueError(f"Unknown method '{method}'. Choose one of {', '.join(METHODS)}.")
+        began = time.perf_counter()
+        deadline = began + time_budget_ms / 1000
+        cx, cy = self.capacity_x, self.capacity_y
+        gx, gy = self.goal
+        # About as many moves as there are reachable states, then a climb
+        # that can lower the distance to the goal at most cx + cy times.
+        kick_limit = 2 * (cx + cy)
+        if max_steps is None:
+            max_steps = kick_limit + cx + cy if method == "random-restart" else ANNEALING_STEPS * (cx + cy)
+        max_steps = max(max_steps, 1)
+        restarts = max(1, min(restarts, HISTORY_CELLS // (max_steps + 1)))
+        temperature = temperature or max(cx, cy)
+        cooling = cooling or 0.1 ** (1 / max_steps)
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % 2 ** 32)
+        rng = np.random.default_rng(seed)
+        x = np.full(restarts, start[0], dtype=np.int32)
+        y = np.full(restarts, start[1], dtype=np.int32)
+        h = np.abs(gx - x) + np.abs(gy - y)
+        runs = np.arange(restarts)
+        active = h > 0
+        kicks = rng.integers(0, kick_limit + 1, size=restarts)
+        kicks[0] = 0
+        history = [(x, y)]
+        finished_at = np.where(active, -1, 0)
+        steps = expanded = 0
+        timed_out = False
 
-            visited.add(best_next)
-            current_state = best_next
-            self.path.append(current_state)
+        while active.any() and steps < max_steps:
+            if time.perf_counter() >= deadline:
+                timed_out = True
+                break
+            steps += 1
+            expanded += int(active.sum())
+            nx, ny = self.next_state_arrays(x, y)
+            nh = np.abs(gx - nx) + np.abs(gy - ny)
+            # A uniformly random move among those that change the state.
+            moves = (nx != x[:, None]) | (ny != y[:, None])
+            random_move = np.where(moves, rng.random(nh.shape), -1).argmax(axis=1)
+            if method == "random-restart":
+                kicking = steps <= kicks
+                nearest = np.where(moves, nh + rng.random(nh.shape) / 2, np.inf).argmin(axis=1)
+                # A climber with no neighbour nearer the goal is at a local
+                # maximum and stops there.
+                active &= kicking | (nh[runs, nearest] < h)
+                choice = np.where(kicking, random_move, nearest)
+                move = active
+            else:
+                choice = random_move
+                increase = nh[runs, choice] - h
+                t = max(temperature * cooling ** steps, 1e-9)
+                move = active & ((increase <= 0) | (rng.random(restarts) < np.exp(-np.maximum(increase, 0) / t)))
+            x = np.where(move, nx[runs, choice], x)
+            y = np.where(move, ny[runs, choice], y)
+            h = np.abs(gx - x) + np.abs(gy - y)
+            history.append((x, y))
+            reached = active & (h == 0)
+            finished_at[reached] = steps
+            active &= ~reached
 
-            if current_state == self.goal:
-                return self.path
\ No newline at end of file
+        successes = np.flatnonzero(finished_at >= 0)
+        # The earliest finishers are the likeliest to hold the shortest path.
+        candidates = successes[np.argsort(finished_at[successes], kind="stable")[:20]] if len(successes) else [0]
+        best = None
+        for run in candidates:
+            end = finished_at[run] if finished_at[run] >= 0 else len(history) - 1
+            walk = [(int(hx[run]), int(hy[run])) for hx, hy in history[:end + 1]]
+            path = without_cycles(walk)
+            if best is None or len(path) < len(best):
+                best = path
+        if stats is not None:
+            stats.algorithm = method
+            stats.nodes_expanded += expanded
+            stats.nodes_generated += 6 * expanded
+            stats.add_phase("search", time.perf_counter() - began)
+        result = {
+            "path": best,
+            "success": len(successes) > 0,
+            "method": method,
+            "seed": seed,
+            "restarts": restarts,
+            "successes": len(successes),
+            "success_rate": round(len(successes) / restarts, 4),
+            "steps": steps,
+            "timed_out": timed_out,
+        }
+        if timed_out:
+            result["limited"] = True
+        return result
@@ -0,0 +1,140 @@
+import threading
+from collections import OrderedDict, deque
+from functools import reduce
+from math import gcd
+
+MAX_STATES = 1_000_000
+# Explored states kept across all cached graphs, see reachability_graph.
+MAX_CACHED_STATES = 2_000_000
+
+
+# Returns why goal can never be reached from start, or None if it might be.
+def infeasibility(capacities, start, goal):
+    if not capacities:
+        return "At least one jug is required"
+    if len(start) != len(capacities) or len(goal) != len(capacities):
+        return "'start' and 'goal' must have one amount per jug"
+    if not all(isinstance(v, int) and v >= 0 for v in capacities + start + goal):
+        return "Capacities and amounts must be non-negative integers"
+    for name, state in (("start", start), ("goal", goal)):
+        for amount, capacity in zip(state, capacities):
+            if amount > capacity:
+                return f"'{name}' amount {amount} does not fit a jug of capacity {capacity}"
+    if goal == start:
+        return None
+    # Every fill/empty/pour leaves some jug empty or full.
+    if not any(amount in (0, capacity) for amount, capacity in zip(goal, capacities)):
+        return "Every reachable state has at least one jug empty or full"
+    # Starting from multiples of the gcd, every amount stays a multiple of it.
+    g = reduce(gcd, capacities)
+    if g and all(amount % g == 0 for amount in start):
+        bad = [amount for amount in goal if amount % g]
+        if bad:
+            return f"Goal amount {bad[0]} is not a multiple of gcd(capacities) = {g}"
+    return None
+
+
+# Breadth-first reachability graph from one start state, explored lazily:
+# a query only expands the frontier until its goal shows up, and later
+# queries with the same capacities and start pick up where the last stopped.
+# States are mixed-radix ints, amount_i * prod(capacity_j + 1 for j < i).
+class ReachabilityGraph:
+    def __init__(self, capacities, start):
+        self.capacities = capacities
+        self.strides = []
+        stride = 1
+        for capacity in capacities:
+            self.strides.append(stride)
+            stride *= capacity + 1
+        root = self.encode(start)
+        self.parents = {root: None}
+        self.frontier = deque([root])
+        self.lock = threading.Lock()
+
+    def encode(self, state):
+        return sum(amount * stride for amount, stride in zip(state, self.strides))
+
+    def decode(self, index):
+        return tuple((index // stride) % (capacity + 1) for stride, capacity in zip(self.strides, self.capacities))
+
+    def successors(self, index):
+        amounts = self.decode(index)
+        jugs = range(len(amounts))
+        for i in jugs:
+            x, cap, stride = amounts[i], self.capacities[i], self.strides[i]
+            if x < cap:
+                yield index + (cap - x) * stride
+            if x > 0:
+                yield index - x * stride
+                for j in jugs:
+                    if j != i:
+                        pour = min(x, self.capacities[j] - amounts[j])
+                        if pour:
+                            yield index - pour * stride + pour * self.strides[j]
+
+    def explore_until(self, target):
+        while target not in self.parents and self.frontier:
+            if len(self.parents) > MAX_STATES:
+                raise ValueError(f"State space exceeds {MAX_STATES} states")
+            current = self.frontier.popleft()
+            for nxt in self.successors(current):
+                if nxt not in self.parents:
+                    self.parents[nxt] = current
+                    self.frontier.append(nxt)
+        return target in self.parents
+
+    def path_to(self, goal):
+        target = self.encode(goal)
+        with self.lock:
+            if not self.explore_until(target):
+                return None
+        path = []
+        while target is not None:
+            path.append(self.decode(target))
+            target = self.parents[target]
+        path.reverse()
+        return path
+
+
+graphs = OrderedDict()
+graphs_lock = threading.Lock()
+
+
+# Graphs are reused least recently used first, bounded by the states they
+# hold between them rather than by their number, since one graph can grow to
+# MAX_STATES. Call release() once a query is done with the graph.
+def reachability_graph(capacities, start):
+    with graphs_lock:
+        graph = graphs.get((capacities, start))
+        if graph is None:
+            graph = graphs[(capacities, start)] = ReachabilityGraph(capacities, start)
+        graphs.move_to_end((capacities, start))
+        return graph
+
+
+# Evicts the graph outright if it overflowed MAX_STATES (it can never answer
+# a new goal), then the least recently used graphs until the total fits.
+def release(capacities, start, overflowed=False):
+    with graphs_lock:
+        if overflowed:
+            graphs.pop((capacities, start), None)
+        total = sum(len(graph.parents) for graph in graphs.values())
+        while total > MAX_CACHED_STATES and graphs:
+            _, graph = graphs.popitem(last=False)
+            total -= len(graph.parents)
+
+
+def solve_water_jug(capacities, start, goal):
+    capacities, start, goal = tuple(capacities), tuple(start), tuple(goal)
+    reason = infeasibility(capacities, start, goal)
+    if reason:
+        return {"success": False, "path": [], "reason": reason}
+    try:
+        path = reachability_graph(capacities, start).path_to(goal)
+    except ValueError:
+        release(capacities, start, overflowed=True)
+        raise
+    release(capacities, start)
+    if path is None:
+        return {"success": False, "path": [], "reason": "Goal is not reachable from start"}
+    return {"success": True, "path": path}
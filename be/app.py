@@ -1,29 +1,142 @@
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 import os
+import sqlite3
+import json_provider
+import static_assets
 app = Flask(__name__)
+# JSON bodies are parsed and serialized with orjson when it is installed.
+json_provider.install(app)
 # CORS(app)
 app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///users.db"
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Applied to every new SQLite connection. WAL lets readers carry on during bulk
+# writes; synchronous=NORMAL is safe under WAL and saves an fsync per commit.
+app.config["SQLITE_PRAGMAS"] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -20000,
+    "temp_store": "MEMORY",
+}
+# Largest graph each TSP method will accept before answering 400 instead of
+# tying up a worker. Override per deployment if the hardware allows more.
+app.config["TSP_MAX_CITIES"] = {"dfs": 10, "bfs": 9, "held-karp": 20, "local": 2000}
+app.config["TSP_MAX_TIME_BUDGET_MS"] = 10000
+# Pattern databases for /api/sliding-puzzle, built with `flask build-pdb`.
+app.config["PDB_FOLDER"] = os.path.join(os.getcwd(), "pdb")
+app.config["SLIDING_PUZZLE_MAX_TIME_MS"] = 10000
+app.config["TICTACTOE_MAX_TIME_MS"] = 3000
+# Resolution proofs run in a separate process pool and are cut off at these limits.
+app.config["LOGIC_TIME_LIMIT_MS"] = 5000
+app.config["LOGIC_MAX_CLAUSES"] = 1000
+app.config["LOGIC_POOL_SIZE"] = 2
+# /api/custom-logic prover when the request does not pick one: "nltk", or
+# "indexed" for the native engine (see algorithms/resolution_engine.py).
+app.config["LOGIC_ENGINE"] = "nltk"
+# Worker processes for /api/batch and async jobs; None sizes the pool to the
+# machine's CPU count, at most batch.MAX_WORKERS.
+app.config["BATCH_WORKERS"] = None
+app.config["BATCH_MAX_JOBS"] = 100
+# A batch job still running after BATCH_JOB_TIMEOUT_MS, or when the whole
+# batch has run BATCH_TIMEOUT_MS, is answered with a 504 and its worker
+# process is replaced.
+app.config["BATCH_JOB_TIMEOUT_MS"] = 30000
+app.config["BATCH_TIMEOUT_MS"] = 60000
+# GET /api/user page size when no `limit` is given, and the largest allowed.
+app.config["USER_PAGE_SIZE"] = 50
+app.config["USER_MAX_PAGE_SIZE"] = 500
+# /api/user/bulk rows per transaction, and how many row errors it reports.
+app.config["USER_BULK_CHUNK"] = 500
+app.config["USER_BULK_MAX_ERRORS"] = 100
+# Solver result cache: per-route TTL (seconds) and entry cap. Routes not listed
+# use solver_cache.DEFAULT_POLICY. The SQLite tier is shared by all workers.
+app.config["SOLVER_CACHE"] = {
+    "tsp": {"ttl": 24 * 3600, "max_size": 512},
+    "eight-puzzle-astar": {"ttl": 24 * 3600, "max_size": 1024},
+    "eight-puzzle-gbfs": {"ttl": 24 * 3600, "max_size": 1024},
+    "tictactoe-vs-computer": {"ttl": 24 * 3600, "max_size": 2048},
+}
+app.config["SOLVER_CACHE_PERSISTENT"] = False
+# Streaming search routes: how often to report progress, and how many path
+# steps go in each "path" event.
+app.config["STREAM_PROGRESS_MS"] = 250
+app.config["STREAM_PATH_CHUNK"] = 50
+# Best-first searches on the puzzle routes stop after storing this many nodes
+# or after this long; in "ara" mode they still return the best path found so
+# far. Requested beam widths are capped too.
+app.config["SEARCH_MAX_NODES"] = 2_000_000
+app.config["SEARCH_MAX_TIME_MS"] = 10000
+app.config["SEARCH_MAX_BEAM_WIDTH"] = 10000
+# /api/water-jug-hill "random-restart" and "annealing" runs: most runs per
+# request and longest time budget.
+app.config["WATER_JUG_HILL_MAX_RESTARTS"] = 10000
+app.config["WATER_JUG_HILL_MAX_TIME_MS"] = 5000
+# Collect search stats and per-route latency for /api/metrics. Requests can
+# still ask for their own stats with "stats": true when this is off.
+app.config["METRICS_ENABLED"] = True
+# Where `flask bench` reads and writes its regression baseline
+app.config["BENCHMARK_BASELINE"] = os.path.join(os.getcwd(), "benchmarks", "baseline.json")
+# Async jobs ("async": true, see jobs.py): solves each web process runs at
+# once, how many may wait before new ones get 503, and the priority of each
+# route (lower runs first, so quick solves are not stuck behind long ones).
+app.config["JOB_WORKERS"] = 2
+app.config["JOB_MAX_QUEUED"] = 200
+app.config["JOB_PRIORITY"] = {
+    "tictactoe-vs-computer": 0,
+    "water-jug-hill": 0,
+    "water-jug-astar": 1,
+    "eight-puzzle-gbfs": 1,
+    "eight-puzzle-astar": 2,
+    "tsp": 5,
+    "custom-logic": 5,
+    "sliding-puzzle": 8,
+}
+# How often a running job saves its progress, how long without a heartbeat
+# before it is requeued, how many times it is tried, and how long finished
+# jobs are kept.
+app.config["JOB_PROGRESS_MS"] = 1000
+app.config["JOB_STALE_SECONDS"] = 30
+app.config["JOB_MAX_ATTEMPTS"] = 2
+app.config["JOB_RETENTION_SECONDS"] = 24 * 3600
+# Algorithm modules gunicorn.conf.py imports in the master before forking, as
+# module names or "all". Everything else is imported on first use. The
+# PRELOAD_PLUGINS environment variable takes precedence.
+app.config["PRELOAD_PLUGINS"] = []
+
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        for name, value in app.config["SQLITE_PRAGMAS"].items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
 
 db = SQLAlchemy(app)
 
 frontend_folder = os.path.join(os.getcwd(), "..", "fe")
 dist_folder = os.path.join(frontend_folder, "dist")
 
-# Server static files from the "dist" folder under the "frontend" directory
+# Server static files from the "dist" folder under the "frontend" directory,
+# precompressed and with long-lived caching for fingerprinted assets (see
+# static_assets.py). Client-side routes get index.html.
 @app.route("/", defaults={"filename":""})
 @app.route("/<path:filename>")
 def index(filename):
-    if not filename:
-        filename = "index.html"
-    return send_from_directory(dist_folder, filename)
+    return static_assets.serve(dist_folder, filename)
 
-import routes
+from models import init_db
 
-with app.app_context():
-    db.create_all()
+# The database is set up on the first request instead of at import (see
+# models.init_db), so CLI commands and worker boots that never query it skip it.
+@app.before_request
+def ensure_database():
+    init_db()
+
+import routes
 
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,154 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from solver_cache import CACHE
+from solvers import INLINE, job_error, run_job
+
+# Cap on the pool size when BATCH_WORKERS leaves it to the CPU count; every
+# web worker process runs its own pool.
+MAX_WORKERS = 4
+
+
+class WorkerLost(Exception):
+    pass
+
+
+class WorkerTimeout(Exception):
+    pass
+
+
+def job_result(payload, status):
+    return {"status": "ok" if status < 400 else "error", "http_status": status, "result": payload}
+
+
+def _worker_main(conn):
+    while True:
+        try:
+            function, args = conn.recv()
+        except EOFError:
+            return
+        try:
+            conn.send(function(*args))
+        except Exception as e:
+            conn.send(job_result({"error": str(e)}, 500))
+
+
+# Spawned worker processes shared by /api/batch and the async job queue, each
+# running one call at a time, in the manner of algorithms/proof_pool.py: the
+# parent waits up to the call's deadline, then kills the worker and starts a
+# fresh one, so a runaway job costs only its own result.
+class WorkerPool:
+    def __init__(self, size):
+        self.size = size
+        self.context = multiprocessing.get_context("spawn")
+        self.idle = queue.Queue()
+        for _ in range(size):
+            self.idle.put(self._spawn())
+
+    def _spawn(self):
+        parent_conn, child_conn = self.context.Pipe()
+        process = self.context.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        return process, parent_conn
+
+    def _replace(self, worker):
+        process, conn = worker
+        process.kill()
+        process.join()
+        conn.close()
+        self.idle.put(self._spawn())
+
+    # Runs function(*args) in a worker and returns its result, giving the call
+    # at most `timeout_ms`. With a `deadline` (a perf_counter time) it waits no
+    # later than that for a free worker (raising queue.Empty) and cuts the
+    # call off there too. Raises WorkerTimeout when the call is cut off and
+    # WorkerLost if the worker dies under it.
+    def call(self, function, args, timeout_ms=None, deadline=None):
+        limit = float('inf') if deadline is None else deadline
+        worker = self.idle.get(timeout=None if deadline is None else max(limit - time.perf_counter(), 0))
+        if timeout_ms is not None:
+            limit = min(limit, time.perf_counter() + timeout_ms / 1000)
+        process, conn = worker
+        try:
+            conn.send((function, args))
+            if conn.poll(None if limit == float('inf') else max(limit - time.perf_counter(), 0)):
+                result = conn.recv()
+                self.idle.put(worker)
+                return result
+        except (EOFError, OSError):
+            self._replace(worker)
+            raise WorkerLost()
+        self._replace(worker)
+        raise WorkerTimeout()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers=None):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool(workers or min(os.cpu_count() or 1, MAX_WORKERS))
+    return _pool
+
+
+# Runs one non-inline batch job in the pool, within `timeout_ms` and the
+# batch's deadline.
+def run_pooled(pool, algorithm, params, config, timeout_ms, deadline):
+    try:
+        return pool.call(run_job, (algorithm, params, config), timeout_ms, deadline)
+    except queue.Empty:
+        return job_result({"error": "Batch time limit reached before the job could start"}, 504)
+    except WorkerTimeout:
+        return job_result({"error": "Job hit the batch time limit"}, 504)
+    except WorkerLost:
+        return job_result({"error": "Batch worker crashed"}, 500)
+
+
+# Fans the jobs out to the worker pool and yields (index, result) pairs in
+# completion order. Jobs are validated first, cache hits are answered here
+# without a round trip to a worker, and jobs listed in solvers.INLINE run in
+# this process. A job gets at most `job_timeout_ms` and the whole batch
+# `batch_timeout_ms`; a job cut off by either comes back as a 504.
+def run_batch(jobs, config, workers=None, job_timeout_ms=30000, batch_timeout_ms=60000):
+    pool = get_pool(workers)
+    deadline = time.perf_counter() + batch_timeout_ms / 1000
+    threads = ThreadPoolExecutor(max_workers=pool.size)
+    futures = {}
+    inline = []
+    try:
+        for index, job in enumerate(jobs):
+            algorithm, params = job.get("algorithm"), job.get("params", {})
+            error = job_error(algorithm, params)
+            if error:
+                yield index, job_result({"error": error}, 400)
+                continue
+            key, hit = CACHE.lookup(algorithm, params) if CACHE.cacheable(algorithm, params) else (None, None)
+            if hit is not None:
+                yield index, job_result(*hit)
+            elif algorithm in INLINE:
+                inline.append((index, algorithm, params))
+            else:
+                future = threads.submit(run_pooled, pool, algorithm, params, config, job_timeout_ms, deadline)
+                futures[future] = (index, algorithm, key)
+
+        for index, algorithm, params in inline:
+            if time.perf_counter() >= deadline:
+                yield index, job_result({"error": "Batch time limit reached before the job could start"}, 504)
+            else:
+                yield index, run_job(algorithm, params, config)
+
+        for future in as_completed(futures):
+            result = future.result()
+            index, algorithm, key = futures[future]
+            if key is not None:
+                CACHE.store(algorithm, key, result["result"], result["http_status"])
+            yield index, result
+    finally:
+        threads.shutdown(wait=False, cancel_futures=True)
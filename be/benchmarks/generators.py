@@ -0,0 +1,82 @@
+import random
+from collections import deque
+from algorithms.puzzle_engine import PuzzleSpace
+from algorithms.tic_tac_toe_vsComputer import check_winner
+from algorithms.water_jug_n import ReachabilityGraph
+
+# Seeded instance generators for the benchmark suites. Every generator takes a
+# random.Random, so the same seed always yields the same instances.
+
+EIGHT_PUZZLE_GOAL = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+
+
+def tsp_graph(rng, n, max_weight=100):
+    cities = [f"C{i}" for i in range(n)]
+    graph = {city: {} for city in cities}
+    for i, a in enumerate(cities):
+        for b in cities[i + 1:]:
+            weight = rng.randint(1, max_weight)
+            graph[a][b] = graph[b][a] = weight
+    return graph, cities[0]
+
+
+_depths = None
+
+
+# Optimal depth of every 8-puzzle state, from one BFS out of the goal.
+def eight_puzzle_depths():
+    global _depths
+    if _depths is None:
+        space = PuzzleSpace(EIGHT_PUZZLE_GOAL)
+        root = space.root(EIGHT_PUZZLE_GOAL)
+        _depths = {root.state: 0}
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for child in space.expand(node):
+                if child.state not in _depths:
+                    _depths[child.state] = node.g + 1
+                    queue.append(child)
+    return _depths
+
+
+# `count` boards whose optimal solution is exactly `depth` moves.
+def eight_puzzle_boards(rng, depth, count):
+    space = PuzzleSpace(EIGHT_PUZZLE_GOAL)
+    states = sorted(state for state, d in eight_puzzle_depths().items() if d == depth)
+    return [space.unpack(state) for state in rng.sample(states, min(count, len(states)))]
+
+
+# Random capacities and a goal drawn uniformly from the states reachable from
+# all-empty jugs, so every instance is solvable.
+def water_jug_instance(rng, jugs, max_capacity=20):
+    capacities = tuple(rng.randint(2, max_capacity) for _ in range(jugs))
+    start = (0,) * jugs
+    graph = ReachabilityGraph(capacities, start)
+    graph.explore_until(None)
+    goal = graph.decode(rng.choice(sorted(graph.parents)))
+    return list(capacities), list(start), list(goal)
+
+
+# A 3x3 position after `ply` random moves (X first) with no winner yet, and the
+# side to move.
+def tictactoe_position(rng, ply):
+    while True:
+        board = [['' for _ in range(3)] for _ in range(3)]
+        cells = rng.sample([(r, c) for r in range(3) for c in range(3)], ply)
+        for turn, (r, c) in enumerate(cells):
+            board[r][c] = 'X' if turn % 2 == 0 else 'O'
+        if not check_winner(board):
+            return board, 'X' if ply % 2 == 0 else 'O'
+
+
+# Resolution problems of growing size: a chain of `length` implications, and
+# the same chain with the last link missing, which cannot be proved.
+def resolution_chain(length, provable=True):
+    premises = ["level0(socrates)"]
+    premises += [f"all x.(level{i}(x) -> level{i + 1}(x))" for i in range(length - (0 if provable else 1))]
+    return premises, f"level{length}(socrates)"
+
+
+def new_rng(seed, *labels):
+    return random.Random(f"{seed}:" + ":".join(str(label) for label in labels))
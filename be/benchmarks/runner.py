@@ -0,0 +1,92 @@
+import json
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from benchmarks.suites import SUITES
+
+# Differences smaller than these are treated as noise, whatever the ratio.
+TIME_FLOOR_MS = 1.0
+MEMORY_FLOOR_KB = 64
+
+
+# Wall time is the best of `repeat` passes over the instances, as mean ms per
+# instance. Peak memory comes from a separate run of the first instance under
+# tracemalloc, which slows everything it traces down several times over.
+def measure(case, repeat):
+    times = []
+    nodes = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        nodes = [case.run(instance) for instance in case.instances]
+        times.append((time.perf_counter() - began) * 1000 / len(case.instances))
+
+    tracemalloc.start()
+    try:
+        case.run(case.instances[0])
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    counted = [n for n in nodes if n is not None]
+    return {
+        "suite": case.suite,
+        "algorithm": case.algorithm,
+        "size": case.size,
+        "instances": len(case.instances),
+        "time_ms": round(min(times), 4),
+        "time_ms_median": round(statistics.median(times), 4),
+        "peak_kb": round(peak / 1024, 1),
+        "nodes": round(statistics.mean(counted), 1) if counted else None,
+    }
+
+
+def run_suites(names, seed=0, quick=False, repeat=3, report=None):
+    results = {}
+    for name in names:
+        for case in SUITES[name](seed, quick):
+            results[case.key] = measure(case, repeat)
+            if report:
+                report(case.key, results[case.key])
+    return {
+        "meta": {
+            "seed": seed,
+            "quick": quick,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+
+# Lists every case that got slower, used more memory or expanded more nodes
+# than the baseline by more than `threshold` (0.25 = 25%).
+def compare(run, baseline, threshold):
+    regressions = []
+    for key, result in run["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            continue
+        for metric, floor in (("time_ms", TIME_FLOOR_MS), ("peak_kb", MEMORY_FLOOR_KB), ("nodes", 0)):
+            before, after = old.get(metric), result.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + threshold) and after - before > floor:
+                regressions.append(f"{key}: {metric} {before} -> {after}")
+    return regressions
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(run, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(run, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
@@ -0,0 +1,168 @@
+from algorithms.tsp_dfs_bfs import dfs_tsp_events, bfs_tsp
+from algorithms.tsp_held_karp import held_karp_tsp
+from algorithms.tsp_local_search import local_search_tsp
+from algorithms.puzzle_engine import best_first_events, bidirectional_search
+from algorithms.water_jug_n import ReachabilityGraph
+from algorithms.water_jug_hill import WaterJugHillClimbing
+from algorithms.tic_tac_toe_vsComputer import get_computer_move, minimax
+from algorithms import k_in_a_row
+from algorithms.proof_pool import run_proof
+from benchmarks import generators
+
+# A suite is a function (seed, quick) -> list of Case. Each case runs one
+# algorithm over a fixed set of instances of one size; `run` solves a single
+# instance and returns the nodes it expanded, or None when the algorithm does
+# not count them.
+
+class Case:
+    def __init__(self, suite, algorithm, size, instances, run):
+        self.suite = suite
+        self.algorithm = algorithm
+        self.size = size
+        self.instances = instances
+        self.run = run
+
+    @property
+    def key(self):
+        return f"{self.suite}/{self.algorithm}/{self.size}"
+
+
+def uncounted(solve):
+    def run(*args):
+        solve(*args)
+        return None
+    return run
+
+
+# Drains a search generator and returns nodes_expanded from its final progress
+# event.
+def expanded(events):
+    nodes = None
+    for event in events:
+        nodes = event["nodes_expanded"]
+    return nodes
+
+
+def tsp_suite(seed, quick):
+    sizes = {
+        "dfs": range(4, 9) if quick else range(4, 11),
+        "bfs": range(4, 8) if quick else range(4, 10),
+        "held-karp": range(4, 13) if quick else range(4, 17),
+        "local": (50, 100) if quick else (50, 100, 200, 500),
+    }
+    runs = {
+        "dfs": lambda graph, start: expanded(dfs_tsp_events(graph, start, progress_ms=float('inf'))),
+        "bfs": uncounted(bfs_tsp),
+        "held-karp": uncounted(held_karp_tsp),
+        "local": lambda graph, start: local_search_tsp(graph, start, time_budget_ms=10000)[2]["iterations"],
+    }
+    count = 1 if quick else 3
+    cases = []
+    for method, method_sizes in sizes.items():
+        for n in method_sizes:
+            rng = generators.new_rng(seed, "tsp", n)
+            instances = [generators.tsp_graph(rng, n) for _ in range(count)]
+            cases.append(Case("tsp", method, n, instances, lambda instance, run=runs[method]: run(*instance)))
+    return cases
+
+
+def eight_puzzle_suite(seed, quick):
+    goal = generators.EIGHT_PUZZLE_GOAL
+    runs = {
+        "astar": lambda start: expanded(best_first_events(start, goal, progress_ms=float('inf'))),
+        "greedy": lambda start: expanded(best_first_events(start, goal, greedy=True, progress_ms=float('inf'))),
+        "weighted": lambda start: expanded(best_first_events(start, goal, progress_ms=float('inf'), mode="weighted",
+                                                             weight=2)),
+        "ara": lambda start: expanded(best_first_events(start, goal, progress_ms=float('inf'), mode="ara", weight=3)),
+        "beam": lambda start: expanded(best_first_events(start, goal, progress_ms=float('inf'), mode="beam",
+                                                         beam_width=100)),
+        "bidirectional": uncounted(lambda start: bidirectional_search(start, goal)),
+    }
+    count = 2 if quick else 5
+    cases = []
+    for depth in range(4, 32, 8 if quick else 4):
+        instances = generators.eight_puzzle_boards(generators.new_rng(seed, "eight-puzzle", depth), depth, count)
+        for algorithm, run in runs.items():
+            cases.append(Case("eight-puzzle", algorithm, depth, instances, run))
+    return cases
+
+
+def water_jug_suite(seed, quick):
+    def bfs(instance):
+        capacities, start, goal = instance
+        graph = ReachabilityGraph(tuple(capacities), tuple(start))
+        graph.path_to(tuple(goal))
+        return len(graph.parents)
+
+    @uncounted
+    def hill(instance):
+        capacities, start, goal = instance
+        WaterJugHillClimbing(tuple(start), capacities[0], capacities[1], tuple(goal)).solve(tuple(start))
+
+    def restarts(method):
+        @uncounted
+        def run(instance):
+            capacities, start, goal = instance
+            solver = WaterJugHillClimbing(tuple(start), capacities[0], capacities[1], tuple(goal))
+            solver.solve_restarts(tuple(start), method, restarts=1000, seed=0, time_budget_ms=60000)
+        return run
+
+    count = 3 if quick else 10
+    cases = []
+    for jugs in (2, 3) if quick else (2, 3, 4):
+        rng = generators.new_rng(seed, "water-jug", jugs)
+        instances = [generators.water_jug_instance(rng, jugs) for _ in range(count)]
+        cases.append(Case("water-jug", "bfs", jugs, instances, bfs))
+        if jugs == 2:
+            cases.append(Case("water-jug", "hill", jugs, instances, hill))
+            cases.append(Case("water-jug", "random-restart", jugs, instances, restarts("random-restart")))
+            cases.append(Case("water-jug", "annealing", jugs, instances, restarts("annealing")))
+    return cases
+
+
+def tictactoe_suite(seed, quick):
+    def opponent(player):
+        return 'X' if player == 'O' else 'O'
+
+    runs = {
+        "table": uncounted(lambda board, player: get_computer_move(board, player, opponent(player))),
+        "minimax": uncounted(lambda board, player: minimax(board, True, player, opponent(player))),
+        "k-in-a-row": uncounted(lambda board, player: k_in_a_row.best_move(board, 3, player, opponent(player), 10000)),
+    }
+    count = 2 if quick else 5
+    cases = []
+    for ply in range(2 if quick else 0, 9):
+        rng = generators.new_rng(seed, "tictactoe", ply)
+        instances = [generators.tictactoe_position(rng, ply) for _ in range(count)]
+        for algorithm, run in runs.items():
+            cases.append(Case("tictactoe", algorithm, ply, instances,
+                              lambda instance, run=run: run([row[:] for row in instance[0]], instance[1])))
+    return cases
+
+
+def resolution_suite(seed, quick):
+    def prover(engine):
+        def prove(instance):
+            premises, goal = instance
+            return run_proof(premises, goal, 1000, engine)["clauses_generated"]
+        return prove
+
+    cases = []
+    for length in range(1, 5 if quick else 7):
+        for algorithm, provable in (("proved", True), ("not-proved", False)):
+            instances = [generators.resolution_chain(length, provable)]
+            cases.append(Case("resolution", algorithm, length, instances, prover("nltk")))
+    for length in (5, 20, 50) if quick else (5, 20, 50, 200):
+        for algorithm, provable in (("indexed-proved", True), ("indexed-not-proved", False)):
+            instances = [generators.resolution_chain(length, provable)]
+            cases.append(Case("resolution", algorithm, length, instances, prover("indexed")))
+    return cases
+
+
+SUITES = {
+    "tsp": tsp_suite,
+    "eight-puzzle": eight_puzzle_suite,
+    "water-jug": water_jug_suite,
+    "tictactoe": tictactoe_suite,
+    "resolution": resolution_suite,
+}
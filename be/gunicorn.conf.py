@@ -0,0 +1,35 @@
+import os
+
+# Gunicorn reads this file from the working directory: `gunicorn wsgi:app`.
+# The app is loaded once in the master, which sets up the database and imports
+# the algorithm modules listed in PRELOAD_PLUGINS before forking, so workers
+# start with them already in (shared) memory instead of importing on first use.
+
+preload_app = True
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+
+
+def when_ready(server):
+    from app import app
+    from models import init_db
+    import plugins
+
+    names = os.environ.get("PRELOAD_PLUGINS", app.config["PRELOAD_PLUGINS"])
+    with app.app_context():
+        init_db()
+    for name, ms in plugins.preload(names).items():
+        server.log.info("preloaded %s in %.1f ms", name, ms)
+
+
+# Connections opened in the master must not be shared with the workers; each
+# worker opens its own from a fresh pool. Each worker also starts its proof
+# processes now, so the first resolution request does not wait for them to
+# spawn and import nltk.
+def post_fork(server, worker):
+    from app import app, db
+    from algorithms import proof_pool
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+    proof_pool.get_pool(app.config["LOGIC_POOL_SIZE"])
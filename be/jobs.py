@@ -0,0 +1,267 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert
+from batch import WorkerLost, get_pool
+from solver_cache import CACHE
+import solvers
+
+# Async solver jobs. POSTing with "async": true stores a job row and returns
+# its id at once; a dispatcher thread in every web process claims queued jobs
+# (lowest priority number first, then oldest) and runs them on the batch
+# process pool, and GET /api/jobs/<id> reads the row back. Because the queue
+# lives in SQLite, any process can pick up a job, and jobs whose process died
+# are put back in the queue once their heartbeat goes stale.
+
+ACTIVE = ("queued", "running")
+POLL_SECONDS = 1.0
+HEARTBEAT_SECONDS = 5.0
+
+log = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobLost(Exception):
+    pass
+
+
+def job_json(row, position=None):
+    job = {
+        "id": row.id,
+        "algorithm": row.algorithm,
+        "status": row.status,
+        "priority": row.priority,
+        "attempts": row.attempts,
+        "created_at": row.created_at,
+        "started_at": row.started_at,
+        "finished_at": row.finished_at,
+        "progress": json.loads(row.progress) if row.progress else None,
+    }
+    if position is not None:
+        job["position"] = position
+    if row.result is not None:
+        job["http_status"] = row.http_status
+        job["result"] = json.loads(row.result)
+    return job
+
+
+# Runs in a pool worker. Solvers with a streaming variant write their progress
+# events straight to the job row, which doubles as the job's heartbeat; if the
+# row has meanwhile been handed to another process the search is abandoned.
+def run_tracked(job_id, owner, algorithm, params, config, database):
+    events = solvers.EVENT_SOLVERS.get(algorithm)
+    if events is None:
+        return solvers.run_job(algorithm, params, config)
+    conn = sqlite3.connect(database, timeout=5)
+
+    def progress(event):
+        with conn:
+            cursor = conn.execute(
+                "UPDATE job SET progress = ?, heartbeat_at = ? WHERE id = ? AND owner = ? AND status = 'running'",
+                (json.dumps(event), time.time(), job_id, owner))
+        if cursor.rowcount == 0:
+            raise JobLost(job_id)
+
+    try:
+        payload, status = solvers.collect(events(params, config), progress)
+    except JobLost:
+        payload, status = {"error": "Job was taken over by another worker"}, 500
+    except Exception as e:
+        payload, status = {"error": str(e)}, 500
+    finally:
+        conn.close()
+    return {"status": "ok" if status < 400 else "error", "http_status": status, "result": payload}
+
+
+class JobQueue:
+    def __init__(self):
+        self.engine = None
+        self.table = None
+        self.config = {}
+        self.owner = None
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.thread = None
+        self.threads = None
+        self.running = {}
+        self.maintained = 0.0
+
+    def configure(self, engine, table, config):
+        self.engine = engine
+        self.table = table
+        self.config = config
+
+    def priority(self, algorithm):
+        priorities = self.config["JOB_PRIORITY"]
+        return priorities.get(algorithm, max(priorities.values(), default=0))
+
+    def position(self, conn, row):
+        t = self.table
+        ahead = or_(t.c.priority < row.priority, and_(t.c.priority == row.priority, t.c.created_at < row.created_at))
+        return conn.execute(select(func.count()).select_from(t).where(t.c.status == "queued", ahead)).scalar()
+
+    def get(self, job_id):
+        with self.engine.connect() as conn:
+            row = conn.execute(select(self.table).where(self.table.c.id == job_id)).first()
+            if row is None:
+                return None
+            return job_json(row, self.position(conn, row) if row.status == "queued" else None)
+
+    # Returns (job, created). An identical queued or running job is returned
+    # instead of adding a new one, and a solver cache hit is stored as an
+    # already finished job. Raises QueueFull when JOB_MAX_QUEUED jobs are
+    # waiting or running.
+    def submit(self, algorithm, params):
+        t = self.table
+        now = time.time()
+        key, hit = CACHE.lookup(algorithm, params) if CACHE.cacheable(algorithm, params) else (CACHE.key(algorithm, params), None)
+        values = {
+            "id": uuid.uuid4().hex,
+            "key": key,
+            "algorithm": algorithm,
+            "params": json.dumps(params),
+            "priority": self.priority(algorithm),
+            "status": "queued",
+            "attempts": 0,
+            "created_at": now,
+        }
+        if hit is not None:
+            payload, status = hit
+            values.update(status="done" if status < 400 else "failed", result=json.dumps(payload),
+                          http_status=status, started_at=now, finished_at=now)
+        with self.engine.begin() as conn:
+            # Writing first takes SQLite's write lock, so the dedup check and
+            # the queue length below cannot race with another process.
+            if conn.execute(insert(t).values(**values).on_conflict_do_nothing()).rowcount == 0:
+                existing = conn.execute(select(t).where(t.c.key == key, t.c.status.in_(ACTIVE))).first()
+                return job_json(existing), False
+            if hit is None:
+                active = conn.execute(select(func.count()).select_from(t).where(t.c.status.in_(ACTIVE))).scalar()
+                if active > self.config["JOB_MAX_QUEUED"]:
+                    raise QueueFull(f"{active - 1} jobs are already queued or running")
+            row = conn.execute(select(t).where(t.c.id == values["id"])).first()
+            job = job_json(row, self.position(conn, row) if hit is None else None)
+        self.wakeup.set()
+        return job, True
+
+    # Starts this process's dispatcher thread. Called on every request, so it
+    # also starts in each forked worker and after a restart picks up the jobs
+    # that were left in the queue.
+    def start(self):
+        if self.config.get("JOB_WORKERS", 0) <= 0 or (self.thread is not None and self.thread.is_alive()):
+            return
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.owner = f"{socket.gethostname()}:{os.getpid()}"
+                self.threads = ThreadPoolExecutor(max_workers=self.config["JOB_WORKERS"])
+                self.thread = threading.Thread(target=self.dispatch, name="job-dispatcher", daemon=True)
+                self.thread.start()
+
+    def dispatch(self):
+        while True:
+            self.wakeup.clear()
+            try:
+                if time.monotonic() - self.maintained >= HEARTBEAT_SECONDS:
+                    self.maintain()
+                    self.maintained = time.monotonic()
+                if len(self.running) < self.config["JOB_WORKERS"]:
+                    job = self.claim()
+                    if job is not None:
+                        self.launch(job)
+                        continue
+            except Exception:
+                # Most likely a locked database; try again on the next poll.
+                log.exception("job dispatcher")
+            self.wakeup.wait(POLL_SECONDS)
+
+    def claim(self):
+        t = self.table
+        now = time.time()
+        next_job = (select(t.c.id).where(t.c.status == "queued")
+                    .order_by(t.c.priority, t.c.created_at).limit(1).scalar_subquery())
+        with self.engine.begin() as conn:
+            return conn.execute(
+                update(t).where(t.c.id == next_job, t.c.status == "queued")
+                .values(status="running", owner=self.owner, started_at=now, heartbeat_at=now,
+                        attempts=t.c.attempts + 1)
+                .returning(t.c.id, t.c.key, t.c.algorithm, t.c.params, t.c.attempts)
+            ).first()
+
+    def launch(self, job):
+        params = json.loads(job.params)
+        config = {key: self.config[key] for key in solvers.CONFIG_KEYS}
+        config["STREAM_PROGRESS_MS"] = self.config["JOB_PROGRESS_MS"]
+        if job.algorithm in solvers.INLINE:
+            future = self.threads.submit(solvers.run_job, job.algorithm, params, config)
+        else:
+            future = self.threads.submit(
+                get_pool(self.config["BATCH_WORKERS"]).call, run_tracked,
+                (job.id, self.owner, job.algorithm, params, config, self.engine.url.database))
+        with self.lock:
+            self.running[job.id] = future
+        future.add_done_callback(partial(self.finish, job))
+
+    def finish(self, job, future):
+        t = self.table
+        try:
+            result = future.result()
+        except WorkerLost:
+            result = None
+        except Exception as e:
+            result = {"status": "error", "http_status": 500, "result": {"error": str(e)}}
+        try:
+            with self.engine.begin() as conn:
+                mine = and_(t.c.id == job.id, t.c.owner == self.owner, t.c.status == "running")
+                if result is None:
+                    # The worker died under the job; give it another go.
+                    conn.execute(update(t).where(mine).values(**self.retry(job.attempts, "Job worker crashed")))
+                else:
+                    conn.execute(update(t).where(mine).values(
+                        status="done" if result["http_status"] < 400 else "failed", result=json.dumps(result["result"]),
+                        http_status=result["http_status"], finished_at=time.time()))
+            if result is not None and CACHE.cacheable(job.algorithm, json.loads(job.params)):
+                CACHE.store(job.algorithm, job.key, result["result"], result["http_status"])
+        finally:
+            with self.lock:
+                self.running.pop(job.id, None)
+            self.wakeup.set()
+
+    def retry(self, attempts, reason):
+        if attempts < self.config["JOB_MAX_ATTEMPTS"]:
+            return {"status": "queued", "owner": None, "started_at": None, "heartbeat_at": None}
+        return {"status": "failed", "http_status": 500, "result": json.dumps({"error": reason}),
+                "finished_at": time.time()}
+
+    # Heartbeats this process's running jobs, requeues (or fails) jobs whose
+    # process stopped heartbeating, and drops finished jobs past retention.
+    def maintain(self):
+        t = self.table
+        now = time.time()
+        with self.lock:
+            mine = list(self.running)
+        with self.engine.begin() as conn:
+            if mine:
+                conn.execute(update(t).where(t.c.id.in_(mine), t.c.owner == self.owner).values(heartbeat_at=now))
+            stale = conn.execute(select(t.c.id, t.c.attempts).where(
+                t.c.status == "running", t.c.heartbeat_at < now - self.config["JOB_STALE_SECONDS"])).all()
+            for job_id, attempts in stale:
+                conn.execute(update(t).where(t.c.id == job_id, t.c.status == "running")
+                             .values(**self.retry(attempts, "Job worker stopped responding")))
+            conn.execute(delete(t).where(t.c.status.not_in(ACTIVE),
+                                         t.c.finished_at < now - self.config["JOB_RETENTION_SECONDS"]))
+        if stale:
+            self.wakeup.set()
+
+
+JOBS = JobQueue()
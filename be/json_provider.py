@@ -0,0 +1,47 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Flask's JSON provider backed by orjson when it is installed, which parses
+# and serializes large bodies (TSP matrices, long solution paths) several
+# times faster than the json module. Output stays compact with sorted keys;
+# the debug server's indented responses and anything orjson cannot handle
+# (ints past 64 bits, or NaN/Infinity literals in a request) go through the
+# default provider. orjson writes non-finite floats as null.
+
+OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if orjson else 0
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    def encode(self, obj):
+        try:
+            return orjson.dumps(obj, default=self.default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, separators=(",", ":")).encode()
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            return super().loads(s)
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.encode(obj) + b"\n", mimetype=self.mimetype)
+
+
+def install(app):
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
@@ -0,0 +1,130 @@
+import threading
+from collections import Counter
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SEARCH_COUNTERS = ("nodes_expanded", "nodes_generated", "heap_pushes", "heap_pops")
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            i = len(self.buckets)
+        self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+def labels(**values):
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(values, escaped)) + "}"
+
+
+# In-process registry behind /api/metrics: request latency per route, and the
+# SearchStats of every instrumented solve, summed per route and algorithm.
+# Each worker process keeps its own registry, so scrape every worker (or run
+# a single one) to see the full picture.
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}
+        self.requests = Counter()
+        self.searches = Counter()
+        self.search_counters = Counter()
+        self.search_peaks = {}
+        self.phase_seconds = Counter()
+        self.cache_hits = Counter()
+
+    def observe_request(self, route, method, status, seconds):
+        with self.lock:
+            histogram = self.latency.get((route, method))
+            if histogram is None:
+                histogram = self.latency[(route, method)] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+            self.requests[(route, method, status)] += 1
+
+    def observe_search(self, route, stats):
+        with self.lock:
+            if stats.cache_hit:
+                self.cache_hits[route] += 1
+                return
+            if stats.algorithm is None:
+                return
+            key = (route, stats.algorithm)
+            self.searches[key] += 1
+            for name in SEARCH_COUNTERS:
+                self.search_counters[key + (name,)] += getattr(stats, name)
+            for name in ("peak_open", "peak_closed"):
+                self.search_peaks[key + (name,)] = max(self.search_peaks.get(key + (name,), 0), getattr(stats, name))
+            for phase, seconds in stats.phases.items():
+                self.phase_seconds[key + (phase,)] += seconds
+
+    # Prometheus text exposition format, version 0.0.4. `plugin_loads` maps each
+    # lazily loaded algorithm module to its first-use import time in ms.
+    def render(self, plugin_loads=None):
+        lines = []
+
+        def header(name, kind, text):
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self.lock:
+            name = "aimlabx_http_request_duration_seconds"
+            header(name, "histogram", "Request latency by route.")
+            for (route, method), histogram in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ("+Inf",), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{labels(route=route, method=method, le=bound)} {cumulative}")
+                lines.append(f"{name}_sum{labels(route=route, method=method)} {histogram.sum}")
+                lines.append(f"{name}_count{labels(route=route, method=method)} {histogram.count}")
+
+            header("aimlabx_http_requests_total", "counter", "Requests by route and status.")
+            for (route, method, status), count in sorted(self.requests.items()):
+                lines.append(f"aimlabx_http_requests_total{labels(route=route, method=method, status=status)} {count}")
+
+            header("aimlabx_search_total", "counter", "Instrumented searches run.")
+            for (route, algorithm), count in sorted(self.searches.items()):
+                lines.append(f"aimlabx_search_total{labels(route=route, algorithm=algorithm)} {count}")
+
+            for counter in SEARCH_COUNTERS:
+                name = f"aimlabx_search_{counter}_total"
+                header(name, "counter", f"Sum of {counter.replace('_', ' ')} over all searches.")
+                for (route, algorithm, which), value in sorted(self.search_counters.items()):
+                    if which == counter:
+                        lines.append(f"{name}{labels(route=route, algorithm=algorithm)} {value}")
+
+            for peak in ("peak_open", "peak_closed"):
+                name = f"aimlabx_search_{peak}"
+                header(name, "gauge", f"Largest {peak.split('_')[1]} set seen in one search.")
+                for (route, algorithm, which), value in sorted(self.search_peaks.items()):
+                    if which == peak:
+                        lines.append(f"{name}{labels(route=route, algorithm=algorithm)} {value}")
+
+            name = "aimlabx_search_phase_seconds_total"
+            header(name, "counter", "Time spent in each search phase.")
+            for (route, algorithm, phase), seconds in sorted(self.phase_seconds.items()):
+                lines.append(f"{name}{labels(route=route, algorithm=algorithm, phase=phase)} {seconds}")
+
+            name = "aimlabx_solver_cache_hits_total"
+            header(name, "counter", "Requests answered from the solver cache.")
+            for route, count in sorted(self.cache_hits.items()):
+                lines.append(f"{name}{labels(route=route)} {count}")
+
+        name = "aimlabx_plugin_load_seconds"
+        header(name, "gauge", "Time the first use of each algorithm module spent importing it.")
+        for module, ms in sorted((plugin_loads or {}).items()):
+            lines.append(f"{name}{labels(module=module)} {ms / 1000}")
+
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
@@ -1,6 +1,14 @@
 from app import db
+from sqlalchemy import text
+import threading
 
 class User(db.Model):
+    # Keyset pagination walks id within a role or gender filter.
+    __table_args__ = (
+        db.Index("ix_user_role_id", "role", "id"),
+        db.Index("ix_user_gender_id", "gender", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     role = db.Column(db.String(50), nullable=False)
@@ -16,4 +24,120 @@ class User(db.Model):
             "description": self.description,
             "gender": self.gender,
             "imageUrl": self.image_url
-        }
\ No newline at end of file
+        }
+
+# Write counter per table, bumped by triggers so that every writer (the app,
+# other workers, the sqlite3 shell) is seen. GET /api/user builds its ETag from
+# it without touching the user table.
+class TableVersion(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+VERSION_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS user_version_{event.lower()} AFTER {event} ON user
+        BEGIN UPDATE table_version SET version = version + 1 WHERE name = 'user'; END"""
+    for event in ("INSERT", "UPDATE", "DELETE")
+]
+
+
+# Full-text index over the searchable user columns. It is an external-content
+# FTS5 table (the text lives only in `user`), kept in sync by triggers.
+USER_FTS = """CREATE VIRTUAL TABLE user_fts USING fts5(
+    name, role, description,
+    content='user', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+)"""
+
+USER_FTS_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS user_fts_insert AFTER INSERT ON user BEGIN
+        INSERT INTO user_fts (rowid, name, role, description) VALUES (new.id, new.name, new.role, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_fts_delete AFTER DELETE ON user BEGIN
+        INSERT INTO user_fts (user_fts, rowid, name, role, description)
+        VALUES ('delete', old.id, old.name, old.role, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS user_fts_update AFTER UPDATE OF name, role, description ON user BEGIN
+        INSERT INTO user_fts (user_fts, rowid, name, role, description)
+        VALUES ('delete', old.id, old.name, old.role, old.description);
+        INSERT INTO user_fts (rowid, name, role, description) VALUES (new.id, new.name, new.role, new.description);
+    END""",
+]
+
+# Column weights for bm25(): a hit in the name counts most, the description least.
+USER_FTS_WEIGHTS = (10.0, 5.0, 1.0)
+
+
+def rebuild_user_search(conn):
+    conn.execute(text("INSERT INTO user_fts (user_fts) VALUES ('rebuild')"))
+    conn.execute(text("INSERT INTO user_fts (user_fts) VALUES ('optimize')"))
+
+
+# create_all() skips tables that already exist, so indexes, triggers and the
+# search index added since a database was created are installed here. A new
+# search index is filled from the existing rows.
+def install_schema_extras():
+    with db.engine.begin() as conn:
+        for index in User.__table__.indexes:
+            index.create(conn, checkfirst=True)
+        conn.execute(text("INSERT OR IGNORE INTO table_version (name, version) VALUES ('user', 0)"))
+        for trigger in VERSION_TRIGGERS:
+            conn.execute(text(trigger))
+        if not conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'user_fts'")).first():
+            conn.execute(text(USER_FTS))
+            rebuild_user_search(conn)
+        for trigger in USER_FTS_TRIGGERS:
+            conn.execute(text(trigger))
+
+
+# Persistent tier of the solver result cache (see solver_cache.py).
+class SolverResult(db.Model):
+    key = db.Column(db.String(64), primary_key=True)
+    route = db.Column(db.String(50), nullable=False, index=True)
+    payload = db.Column(db.Text, nullable=False)
+    status = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.Float, nullable=False)
+    expires_at = db.Column(db.Float, nullable=False)
+
+
+# Async solver jobs (see jobs.py). The partial unique index allows one queued
+# or running job per cache key, which is what deduplicates identical requests.
+class Job(db.Model):
+    __table_args__ = (
+        db.Index("ix_job_active_key", "key", unique=True, sqlite_where=text("status IN ('queued', 'running')")),
+        db.Index("ix_job_queue", "status", "priority", "created_at"),
+    )
+
+    id = db.Column(db.String(32), primary_key=True)
+    key = db.Column(db.String(64), nullable=False)
+    algorithm = db.Column(db.String(50), nullable=False)
+    params = db.Column(db.Text, nullable=False)
+    priority = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(10), nullable=False)
+    progress = db.Column(db.Text)
+    result = db.Column(db.Text)
+    http_status = db.Column(db.Integer)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    owner = db.Column(db.String(100))
+    created_at = db.Column(db.Float, nullable=False)
+    started_at = db.Column(db.Float)
+    heartbeat_at = db.Column(db.Float)
+    finished_at = db.Column(db.Float)
+
+
+_initialised = False
+_init_lock = threading.Lock()
+
+
+# Creates the tables and schema extras once per process. Called on the first
+# request, by `flask init-db` and in the gunicorn master rather than on import,
+# so importing the app never touches the database. Needs an app context.
+def init_db():
+    global _initialised
+    if _initialised:
+        return
+    with _init_lock:
+        if not _initialised:
+            db.create_all()
+            install_schema_extras()
+            _initialised = True
@@ -0,0 +1,117 @@
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Algorithm modules are imported on first use rather than when the app starts,
+# so a worker that only ever serves tic-tac-toe never pays for nltk or NumPy.
+# `lazy(name)` returns a stand-in that imports the module the first time one
+# of its attributes is read. `preload` imports a list of them up front, which
+# gunicorn.conf.py does in the master so forked workers share the pages.
+
+PLUGINS = [
+    "algorithms.tsp_dfs_bfs",
+    "algorithms.tsp_held_karp",
+    "algorithms.tsp_local_search",
+    "algorithms.tsp_matrix",
+    "algorithms.tic_tac_toe_vsComputer",
+    "algorithms.k_in_a_row",
+    "algorithms.water_jug_hill",
+    "algorithms.water_jug_n",
+    "algorithms.eight_puzzle_greedy",
+    "algorithms.astar_eight_puzzle",
+    "algorithms.puzzle_engine",
+    "algorithms.sliding_puzzle",
+    "algorithms.predicate_resolution",
+]
+
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._load_ms = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    began = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    self._load_ms = (time.perf_counter() - began) * 1000
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def lazy(name):
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = LazyModule(name)
+        return _registry[name]
+
+
+# Accepts module names, "all" for every entry in PLUGINS, or a comma separated
+# string of either (as read from the PRELOAD_PLUGINS environment variable).
+def preload(names):
+    if isinstance(names, str):
+        names = [name.strip() for name in names.split(",") if name.strip()]
+    if "all" in names:
+        names = PLUGINS
+    for name in names:
+        if not name.startswith("algorithms."):
+            name = f"algorithms.{name}"
+        lazy(name)._load()
+    return loaded()
+
+
+# First-use import time in ms of every plugin loaded so far. A module that was
+# already imported by something else reports close to zero.
+def loaded():
+    return {name: round(module._load_ms, 3) for name, module in sorted(_registry.items())
+            if module._module is not None}
+
+
+# Cold import cost of `name` in ms, measured in a fresh interpreter with
+# `python -X importtime` so nothing is already cached. Returns the cumulative
+# time of the module and of its heaviest direct dependencies.
+def import_time(name, cwd=None, top=5):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {name}"],
+                            cwd=cwd or os.path.dirname(os.path.abspath(__file__)),
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    total, direct, children = 0.0, [], []
+    # Children are printed before their parent, one level deeper; a top-level
+    # line closes the group of children collected since the previous one.
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        depth = len(module) - len(module.lstrip())
+        ms = int(cumulative) / 1000
+        if depth == 1:
+            if module.strip() == name:
+                total, direct = ms, children
+            children = []
+        elif depth == 3:
+            children.append((module.strip(), ms))
+    return {
+        "ms": round(total, 1),
+        "heaviest": {module: round(ms, 1) for module, ms in sorted(direct, key=lambda row: -row[1])[:top]},
+    }
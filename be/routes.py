@@ -1,12 +1,138 @@
 from app import app, db
-from flask import request, jsonify
-from models import User
-
+from flask import request, jsonify, Response, stream_with_context, g, url_for
+from sqlalchemy import insert, select, text, update
+from urllib.parse import urlencode
+import click
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from models import User, Job, SolverResult, TableVersion, USER_FTS_WEIGHTS, init_db, rebuild_user_search
+from solver_cache import CACHE
+from metrics import METRICS
+import plugins
+from algorithms.search_stats import SearchStats
+
+# JSON name -> column, in to_json() order.
+USER_FIELDS = {
+    "id": User.id,
+    "name": User.name,
+    "role": User.role,
+    "description": User.description,
+    "gender": User.gender,
+    "imageUrl": User.image_url,
+}
+
+# Keyset pagination on id: ?limit=N&cursor=<last id seen>. The body is the
+# page as a list; X-Next-Cursor and a Link rel="next" header point to the next
+# page when there is one. ?fields=name,role selects columns (id is always
+# included) and ?role= / ?gender= filter. The ETag comes from the user table's
+# write counter plus the query string, so an unchanged poll is a 304 without
+# reading the table.
 @app.route("/api/user", methods=["GET"])
 def get_user():
-    user = User.query.all()
-    result = [i.to_json() for i in user]
-    return jsonify(result)
+    args = request.args
+    try:
+        limit = int(args.get("limit", app.config["USER_PAGE_SIZE"]))
+        cursor = int(args["cursor"]) if "cursor" in args else None
+    except ValueError:
+        return jsonify({"error": "'limit' and 'cursor' must be integers"}), 400
+    if not 1 <= limit <= app.config["USER_MAX_PAGE_SIZE"]:
+        return jsonify({"error": f"'limit' must be between 1 and {app.config['USER_MAX_PAGE_SIZE']}"}), 400
+    fields = ["id"] + [f for f in args.get("fields", ",".join(USER_FIELDS)).split(",") if f and f != "id"]
+    unknown = [f for f in fields if f not in USER_FIELDS]
+    if unknown:
+        return jsonify({"error": f"Unknown field '{unknown[0]}'. Choose from {', '.join(USER_FIELDS)}"}), 400
+
+    version = db.session.get(TableVersion, "user")
+    query_key = hashlib.sha1(urlencode(sorted(args.items(multi=True))).encode()).hexdigest()[:16]
+    etag = f"user-{version.version if version else 0}-{query_key}"
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    query = select(*(USER_FIELDS[f] for f in fields)).order_by(User.id).limit(limit + 1)
+    if cursor is not None:
+        query = query.where(User.id > cursor)
+    for name in ("role", "gender"):
+        if name in args:
+            query = query.where(USER_FIELDS[name] == args[name])
+    rows = db.session.execute(query).all()
+
+    response = jsonify([dict(zip(fields, row)) for row in rows[:limit]])
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    if len(rows) > limit:
+        next_cursor = rows[limit - 1][0]
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+        next_url = url_for("get_user", **{**args.to_dict(), "cursor": next_cursor})
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response
+
+def avatar_url(name, gender):
+    if gender == "male":
+        return f"https://avatar.iran.liara.run/public/boy?username={name}"
+    elif gender == "female":
+        return f"https://avatar.iran.liara.run/public/girl?username={name}"
+    return None
+
+# Ranked full-text search over name, role and description. Every word in q
+# must match, as a word or a word prefix. Results are BM25-ordered and paged
+# with ?limit= and ?cursor= like GET /api/user; ?role= and ?gender= filter.
+@app.route("/api/user/search", methods=["GET"])
+def search_users():
+    args = request.args
+    terms = re.findall(r"\w+", args.get("q", ""))
+    if not terms:
+        return jsonify({"error": "Missing search query 'q'"}), 400
+    try:
+        limit = int(args.get("limit", app.config["USER_PAGE_SIZE"]))
+        offset = int(args.get("cursor", 0))
+    except ValueError:
+        return jsonify({"error": "'limit' and 'cursor' must be integers"}), 400
+    if not 1 <= limit <= app.config["USER_MAX_PAGE_SIZE"] or offset < 0:
+        return jsonify({"error": f"'limit' must be between 1 and {app.config['USER_MAX_PAGE_SIZE']}"}), 400
+
+    weights = ", ".join(str(w) for w in USER_FTS_WEIGHTS)
+    where = ["user_fts MATCH :match"]
+    params = {"match": " ".join(f'"{term}"*' for term in terms), "limit": limit + 1, "offset": offset}
+    for name in ("role", "gender"):
+        if name in args:
+            where.append(f"user.{name} = :{name}")
+            params[name] = args[name]
+    rows = db.session.execute(text(
+        "SELECT user.id, user.name, user.role, user.description, user.gender, user.image_url, "
+        f"bm25(user_fts, {weights}) AS rank "
+        "FROM user_fts JOIN user ON user.id = user_fts.rowid "
+        f"WHERE {' AND '.join(where)} ORDER BY rank, user.id LIMIT :limit OFFSET :offset"
+    ), params).all()
+
+    results = [{**dict(zip(USER_FIELDS, row[:-1])), "score": -row.rank} for row in rows[:limit]]
+    response = jsonify(results)
+    if len(rows) > limit:
+        response.headers["X-Next-Cursor"] = str(offset + limit)
+        next_url = url_for("search_users", **{**args.to_dict(), "cursor": offset + limit})
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response
+
+@app.cli.command("init-db")
+def init_db_command():
+    """Create the database tables, indexes, triggers and search index."""
+    init_db()
+    click.echo("Database ready.")
+
+@app.cli.command("rebuild-user-search")
+def rebuild_user_search_command():
+    """Rebuild the full-text search index from the user table."""
+    init_db()
+    with db.engine.begin() as conn:
+        rebuild_user_search(conn)
+    click.echo("User search index rebuilt.")
 
 @app.route("/api/user", methods=["POST"])
 def create_user():
@@ -22,12 +148,7 @@ def create_user():
         description = data.get("description")
         gender = data.get("gender")
 
-        if gender == "male":
-            image_url = f"https://avatar.iran.liara.run/public/boy?username={name}"
-        elif gender == "female":
-            image_url = f"https://avatar.iran.liara.run/public/girl?username={name}"
-        else:
-            image_url = None
+        image_url = avatar_url(name, gender)
         
         new_user = User(name=name, role=role, description=description, gender=gender, image_url=image_url)
         db.session.add(new_user)
@@ -67,31 +188,303 @@ def update_friend(id):
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+# ========== BULK IMPORT / EXPORT ==========
+
+USER_COLUMNS = ["name", "role", "description", "gender"]
+
+def bulk_rows(stream, fmt):
+    text = io.TextIOWrapper(stream, encoding="utf-8", newline="" if fmt == "csv" else None)
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_num, line in enumerate(text, start=1):
+        if line.strip():
+            try:
+                yield line_num, json.loads(line)
+            except ValueError as e:
+                yield line_num, e
+
+def bulk_values(row):
+    if isinstance(row, Exception):
+        raise ValueError(f"Invalid JSON: {row}")
+    if not isinstance(row, dict):
+        raise ValueError("Each row must be an object")
+    values = {}
+    if row.get("id") not in (None, ""):
+        try:
+            values["id"] = int(row["id"])
+        except (TypeError, ValueError):
+            raise ValueError("'id' must be an integer")
+        fields = [f for f in USER_COLUMNS if row.get(f) not in (None, "")]
+    else:
+        fields = USER_COLUMNS
+        missing = [f for f in fields if row.get(f) in (None, "")]
+        if missing:
+            raise ValueError(f"Missing required field: {missing[0]}")
+    for field in fields:
+        if not isinstance(row[field], str):
+            raise ValueError(f"'{field}' must be a string")
+        values[field] = row[field]
+    if "id" not in values:
+        values["image_url"] = avatar_url(values["name"], values["gender"])
+    return values
+
+# Writes one chunk in its own transaction: new rows in a single executemany
+# INSERT, rows with an id as a bulk UPDATE by primary key. If the chunk fails
+# it is replayed row by row so the error lands on the offending line. Returns
+# (created, updated, errors).
+def write_chunk(chunk):
+    ids = [values["id"] for _, values in chunk if "id" in values]
+    existing = set(db.session.scalars(select(User.id).where(User.id.in_(ids)))) if ids else set()
+    inserts, updates, errors = [], [], []
+    for line, values in chunk:
+        if "id" not in values:
+            inserts.append((line, values))
+        elif values["id"] in existing:
+            updates.append((line, values))
+        else:
+            errors.append({"line": line, "error": f"User {values['id']} not found"})
+    try:
+        if inserts:
+            db.session.execute(insert(User), [values for _, values in inserts])
+        if updates:
+            db.session.execute(update(User), [values for _, values in updates])
+        db.session.commit()
+        return len(inserts), len(updates), errors
+    except Exception as e:
+        db.session.rollback()
+        if len(chunk) == 1:
+            return 0, 0, [{"line": chunk[0][0], "error": str(e.__cause__ or e)}]
+    created = updated = 0
+    for row in inserts + updates:
+        c, u, row_errors = write_chunk([row])
+        created, updated = created + c, updated + u
+        errors.extend(row_errors)
+    errors.sort(key=lambda error: error["line"])
+    return created, updated, errors
+
+# Streams JSON lines (default) or CSV (Content-Type text/csv or ?format=csv)
+# and commits every USER_BULK_CHUNK rows. Rows with an id update that user;
+# the rest are created. Bad rows are reported by line and skipped; a partial
+# import answers 207.
+@app.route("/api/user/bulk", methods=["POST"])
+def import_users():
+    fmt = request.args.get("format") or ("csv" if request.mimetype == "text/csv" else "ndjson")
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"error": "'format' must be 'csv' or 'ndjson'"}), 400
+    max_errors = app.config["USER_BULK_MAX_ERRORS"]
+    errors = []
+    created = updated = failed = 0
+    chunk = []
+
+    def report(row_errors):
+        nonlocal failed
+        failed += len(row_errors)
+        errors.extend(row_errors[:max_errors - len(errors)])
+
+    for line, row in bulk_rows(request.stream, fmt):
+        try:
+            chunk.append((line, bulk_values(row)))
+        except ValueError as e:
+            report([{"line": line, "error": str(e)}])
+            continue
+        if len(chunk) >= app.config["USER_BULK_CHUNK"]:
+            c, u, row_errors = write_chunk(chunk)
+            created, updated = created + c, updated + u
+            report(row_errors)
+            chunk = []
+    if chunk:
+        c, u, row_errors = write_chunk(chunk)
+        created, updated = created + c, updated + u
+        report(row_errors)
+
+    status = 207 if failed else 200
+    return jsonify({"created": created, "updated": updated, "failed": failed, "errors": errors}), status
+
+# Streams every user (optionally filtered by role/gender) as JSON lines or CSV,
+# reading the table in batches through a streaming cursor.
+@app.route("/api/user/bulk", methods=["GET"])
+def export_users():
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in ("csv", "ndjson"):
+        return jsonify({"error": "'format' must be 'csv' or 'ndjson'"}), 400
+    query = select(*USER_FIELDS.values()).order_by(User.id)
+    for name in ("role", "gender"):
+        if name in request.args:
+            query = query.where(USER_FIELDS[name] == request.args[name])
+    fields = list(USER_FIELDS)
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if fmt == "csv":
+            writer.writerow(fields)
+        with db.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=app.config["USER_BULK_CHUNK"]).execute(query)
+            for rows in result.partitions():
+                if fmt == "csv":
+                    writer.writerows(rows)
+                else:
+                    buffer.writelines(json.dumps(dict(zip(fields, row))) + "\n" for row in rows)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if fmt == "csv" and buffer.tell():
+            yield buffer.getvalue()
+
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={"Content-Disposition": f"attachment; filename=users.{'csv' if fmt == 'csv' else 'jsonl'}"})
+
+# ========== STATIC ASSETS ==========
+
+from app import dist_folder
+from static_assets import compress_folder
+
+@app.cli.command("compress-assets")
+def compress_assets_command():
+    """Write .gz/.br copies of the frontend build next to the originals."""
+    if not os.path.isdir(dist_folder):
+        raise click.ClickException(f"No frontend build at {dist_folder}; run `npm run build` in fe/ first.")
+    written = compress_folder(dist_folder)
+    click.echo(f"wrote {len(written)} compressed files under {dist_folder}")
+
+# ========== METRICS ==========
+
+@app.before_request
+def start_request_timer():
+    if app.config["METRICS_ENABLED"]:
+        g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    started = g.pop("request_started", None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        METRICS.observe_request(route, request.method, response.status_code, time.perf_counter() - started)
+    return response
+
+@app.route("/api/metrics", methods=["GET"])
+def prometheus_metrics():
+    return Response(METRICS.render(plugins.loaded()), mimetype="text/plain; version=0.0.4")
+
 # ========== ALGORITHM ROUTES ==========
 
-# DFS/BFS for TSP
-from algorithms.tsp_dfs_bfs import dfs_tsp, bfs_tsp
-@app.route("/api/tsp", methods=["POST"])
-def tsp_route():
-    try:
-        data = request.json
-        graph = data.get("graph")
-        start = data.get("start")
-        method = data.get("method", "dfs")
-        if not graph or not start:
-            return jsonify({"error": "Missing 'graph' or 'start' parameter"}), 400
-
-        if method == "dfs":
-            path, cost = dfs_tsp(graph, start)
-        elif method == "bfs":
-            path, cost = bfs_tsp(graph, start)
-        else:
-            return jsonify({"error": "Invalid method. Choose 'dfs' or 'bfs'."}), 400
+import solvers
 
-        return jsonify({"path": path, "cost": cost}), 200
+with app.app_context():
+    CACHE.configure(app.config["SOLVER_CACHE"],
+                    engine=db.engine if app.config["SOLVER_CACHE_PERSISTENT"] else None,
+                    table=SolverResult.__table__)
 
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+@app.route("/api/cache/stats", methods=["GET"])
+def solver_cache_stats():
+    return jsonify(CACHE.stats())
+
+@app.route("/api/cache", methods=["DELETE"])
+def clear_solver_cache():
+    CACHE.clear()
+    return jsonify({"msg": "Solver cache cleared"}), 200
+
+# Async jobs: a solve route called with "async": true, or POST /api/jobs,
+# answers 202 with the job at once and GET /api/jobs/<id> reports on it.
+from jobs import JOBS, QueueFull
+
+with app.app_context():
+    JOBS.configure(db.engine, Job.__table__, app.config)
+
+@app.before_request
+def start_job_dispatcher():
+    JOBS.start()
+
+def submit_job(algorithm, params):
+    try:
+        job, created = JOBS.submit(algorithm, params)
+    except QueueFull as e:
+        response = jsonify({"error": f"Job queue is full: {e}. Try again later."})
+        response.headers["Retry-After"] = "10"
+        return response, 503
+    job["deduplicated"] = not created
+    response = jsonify(job)
+    response.headers["Location"] = url_for("get_job", job_id=job["id"])
+    return response, 202 if job["status"] in ("queued", "running") else 200
+
+@app.route("/api/jobs", methods=["POST"])
+def create_job():
+    data = request.get_json()
+    algorithm = data.get("algorithm") if isinstance(data, dict) else None
+    if not isinstance(algorithm, str) or algorithm not in solvers.SOLVERS:
+        return jsonify({"error": f"'algorithm' must be one of {', '.join(solvers.SOLVERS)}"}), 400
+    params = data.get("params", {})
+    if not isinstance(params, dict):
+        return jsonify({"error": "'params' must be an object"}), 400
+    return submit_job(algorithm, params)
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+# Runs a solver for the current request. Search stats are collected when
+# metrics are on or the body has "stats": true, and only returned in the
+# latter case, merged into any stats the solver already reports.
+def solve(route, solver, data):
+    if isinstance(data, dict) and data.get("async"):
+        return submit_job(route, {key: value for key, value in data.items() if key not in ("async", "stream")})
+    wants_stats = isinstance(data, dict) and bool(data.get("stats"))
+    stats = SearchStats() if wants_stats or app.config["METRICS_ENABLED"] else None
+    payload, status = solver(data, app.config, stats)
+    if stats is not None:
+        if app.config["METRICS_ENABLED"]:
+            METRICS.observe_search(route, stats)
+        if wants_stats and isinstance(payload, dict):
+            payload = {**payload, "stats": {**payload.get("stats", {}), **stats.to_json()}}
+    return jsonify(payload), status
+
+# Search routes stream when the body has "stream": "ndjson" (or true) or
+# "stream": "sse", or the client accepts text/event-stream. Async requests
+# never stream.
+def stream_format(data):
+    if not isinstance(data, dict) or data.get("async"):
+        return None
+    if data.get("stream") == "sse" or request.accept_mimetypes.best == "text/event-stream":
+        return "sse"
+    if data.get("stream"):
+        return "ndjson"
+    return None
+
+def stream_events(events, fmt):
+    first = next(events)
+    if first["event"] == "error":
+        error = dict(first)
+        del error["event"]
+        status = error.pop("http_status")
+        return jsonify(error), status
+
+    def generate():
+        event = first
+        while event is not None:
+            if fmt == "sse":
+                yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
+            else:
+                yield json.dumps(event) + "\n"
+            event = next(events, None)
+
+    mimetype = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# DFS/BFS/Held-Karp/local search for TSP
+@app.route("/api/tsp", methods=["POST"])
+def tsp_route():
+    fmt = stream_format(request.json)
+    if fmt:
+        return stream_events(solvers.tsp_events(request.json, app.config), fmt)
+    return solve("tsp", solvers.tsp, request.json)
 
 # Tic Tac Toe
 from algorithms.tic_tac_toe import check_winner, is_draw, make_move
@@ -120,109 +513,159 @@ def make_tic_tac_toe_move():
     })
 
 
-from algorithms.tic_tac_toe_vsComputer import check_winner, is_draw, make_move, get_computer_move
 @app.route('/api/tictactoe/vs-computer', methods=['POST'])
 def play_vs_computer():
-    data = request.get_json()
-    board = data.get('board')
-    x = data.get('x')
-    y = data.get('y')
+    return solve("tictactoe-vs-computer", solvers.tictactoe_vs_computer, request.get_json())
 
-    # Human always plays 'X', computer is 'O'
-    if not make_move(board, x, y, 'X'):
-        return jsonify({'error': 'Invalid move'}), 400
-
-    winner = check_winner(board)
-    draw = is_draw(board) if not winner else False
-
-    if winner or draw:
-        return jsonify({
-            'board': board,
-            'winner': winner,
-            'is_draw': draw
-        })
-    comp_move = get_computer_move(board, ai_player='O', human_player='X')
-    if comp_move:
-        make_move(board, comp_move[0], comp_move[1], 'O')
-    winner = check_winner(board)
-    draw = is_draw(board) if not winner else False
-    return jsonify({
-        'board': board,
-        'winner': winner,
-        'is_draw': draw
-    })
+@app.cli.command("verify-tictactoe-table")
+def verify_tictactoe_table_command():
+    """Check the precomputed 3x3 move table against minimax."""
+    mismatches = solvers.tic_tac_toe_vsComputer.verify_move_table()
+    if mismatches:
+        raise click.ClickException(f"{len(mismatches)} table entries disagree with minimax: {mismatches[:10]}")
+    click.echo("Move table matches minimax for every legal position.")
 
 # Water Jug with Hill Climbing
-from algorithms.water_jug_hill import WaterJugHillClimbing
 @app.route("/api/water-jug-hill", methods=["POST"])
 def solve_water_jug_hill():
-    data = request.get_json()
-    start = tuple(data.get("start", (0, 0)))
-    goal = tuple(data.get("goal", (2, 0)))
-    capacities = data.get("capacities", [4, 3])
-    solver = WaterJugHillClimbing(start, capacities[0], capacities[1], goal)
-    path = solver.solve(start)
-    return jsonify({
-        "path": path,
-        "success": path[-1] == goal
-    })
+    return solve("water-jug-hill", solvers.water_jug_hill, request.get_json())
 
 # 8 Puzzle problem using Greedy Best First Search
-from algorithms.eight_puzzle_greedy import greedy_best_first_search
 @app.route("/api/eight-puzzle-gbfs", methods=["POST"])
 def solve_eight_puzzle_gbfs():
-    data = request.get_json()
-    start = data.get("start")
-    goal = data.get("goal")
-    if not start or not goal:
-        return jsonify({"error": "Start and goal states are required"}), 400
-    result = greedy_best_first_search(start, goal)
-    return jsonify({
-        "path": result["path"],
-        "success": result["success"]
-    })
+    fmt = stream_format(request.get_json())
+    if fmt:
+        return stream_events(solvers.eight_puzzle_events(request.get_json(), app.config, greedy=True), fmt)
+    return solve("eight-puzzle-gbfs", solvers.eight_puzzle_gbfs, request.get_json())
 
-from algorithms.astar_eight_puzzle import WaterJug, a_star_puzzle
 @app.route("/api/water-jug-astar", methods=["POST"])
 def astar_water_jug_api():
-    data = request.get_json()
-
-    try:
-        start = tuple(data["start"])
-        goal = tuple(data["goal"])
-        capacity = tuple(data["capacity"])
-        solver = WaterJug(capacity[0], capacity[1], start, goal)
-        result = solver.a_star_search()
-
-        return jsonify(result), 200
-
-    except Exception as e:
-        return jsonify({"error": str(e)}), 400
+    return solve("water-jug-astar", solvers.water_jug_astar, request.get_json())
 
 
 @app.route('/api/eight-puzzle-astar', methods=['POST'])
 def solve_eight_puzzle_astar():
-    try:
-        data = request.json
-        start = data.get('start')
-        goal = data.get('goal')
-
-        if not start or not goal:
-            raise ValueError("Missing 'start' or 'goal' board.")
-
-        result = a_star_puzzle(start, goal)
-        return jsonify(result)
-    except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 400
-
+    fmt = stream_format(request.json)
+    if fmt:
+        return stream_events(solvers.eight_puzzle_events(request.json, app.config), fmt)
+    return solve("eight-puzzle-astar", solvers.eight_puzzle_astar, request.json)
+
+
+# N x N sliding puzzle using IDA* with additive pattern databases
+@app.route('/api/sliding-puzzle', methods=['POST'])
+def solve_sliding_puzzle():
+    return solve("sliding-puzzle", solvers.sliding_puzzle, request.get_json())
+
+@app.cli.command("build-pdb")
+@click.option("--size", type=int, multiple=True,
+              help="Board size to build (repeatable). Defaults to all sizes.")
+def build_pdb_command(size):
+    """Generate the sliding-puzzle pattern databases into PDB_FOLDER."""
+    patterns = solvers.sliding.PATTERNS
+    unknown = sorted(set(size) - set(patterns))
+    if unknown:
+        raise click.BadParameter(f"no patterns for size {unknown[0]}; choose from {sorted(patterns)}",
+                                 param_hint="--size")
+    for n in sorted(size) or sorted(patterns):
+        for path in solvers.sliding.build_pattern_databases(n, app.config["PDB_FOLDER"]):
+            click.echo(f"wrote {path}")
 
 
 # Marcus Resolution (Predicate Logic)
-from algorithms.predicate_resolution import prove_custom_logic
 @app.route('/api/custom-logic', methods=['POST'])
 def resolve_custom_logic():
+    return solve("custom-logic", solvers.custom_logic, request.get_json())
+
+@app.route('/api/custom-logic/cache', methods=['GET'])
+def custom_logic_cache_stats():
+    return jsonify(solvers.predicate_resolution.cache_stats())
+
+
+# Offline benchmark suite for the algorithms
+@app.cli.command("bench")
+@click.option("--suite", "suites", multiple=True, help="Suite to run (repeatable). Defaults to all suites.")
+@click.option("--quick", is_flag=True, help="Smaller sizes and fewer instances.")
+@click.option("--seed", default=0, show_default=True, help="Seed for the instance generators.")
+@click.option("--repeat", default=3, show_default=True, help="Timed passes per case; the best one counts.")
+@click.option("--threshold", default=0.25, show_default=True, help="Allowed slowdown before a case fails.")
+@click.option("--baseline", type=click.Path(dir_okay=False), help="Baseline JSON. Defaults to BENCHMARK_BASELINE.")
+@click.option("--save-baseline", is_flag=True, help="Store this run as the baseline instead of comparing.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Also write this run's results here.")
+def bench_command(suites, quick, seed, repeat, threshold, baseline, save_baseline, output):
+    """Benchmark the solvers and compare against the stored baseline."""
+    from benchmarks import runner
+    from benchmarks.suites import SUITES
+
+    unknown = [name for name in suites if name not in SUITES]
+    if unknown:
+        raise click.BadParameter(f"unknown suite {unknown[0]!r}; choose from {', '.join(SUITES)}", param_hint="--suite")
+
+    def report(key, result):
+        nodes = "-" if result["nodes"] is None else result["nodes"]
+        click.echo(f"{key:32} {result['time_ms']:>12.3f} ms {result['peak_kb']:>10.1f} KB {nodes:>12} nodes")
+
+    run = runner.run_suites(suites or list(SUITES), seed=seed, quick=quick, repeat=repeat, report=report)
+    if output:
+        runner.save(run, output)
+    baseline = baseline or app.config["BENCHMARK_BASELINE"]
+    if save_baseline:
+        runner.save(run, baseline)
+        click.echo(f"wrote baseline {baseline}")
+        return
+    if not os.path.exists(baseline):
+        click.echo(f"no baseline at {baseline}; run with --save-baseline to create one")
+        return
+    regressions = runner.compare(run, runner.load(baseline), threshold)
+    if regressions:
+        raise click.ClickException(f"{len(regressions)} regression(s) against {baseline}:\n" + "\n".join(regressions))
+    click.echo(f"no regressions against {baseline}")
+
+
+# Startup cost of the app and of each algorithm module
+@app.cli.command("import-report")
+@click.option("--module", "modules", multiple=True, help="Module to measure (repeatable). Defaults to all plugins.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Also write the report here as JSON.")
+def import_report_command(modules, output):
+    """Measure the cold import time of the app and each algorithm module."""
+    report = {}
+    for name in modules or ["app"] + plugins.PLUGINS:
+        try:
+            report[name] = plugins.import_time(name)
+        except RuntimeError as e:
+            raise click.ClickException(f"importing {name} failed: {e}")
+        heaviest = ", ".join(f"{module} {ms:.1f}" for module, ms in report[name]["heaviest"].items())
+        click.echo(f"{name:40} {report[name]['ms']:>9.1f} ms   {heaviest}")
+    if output:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w") as f:
+            json.dump({"python": sys.version.split()[0], "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                       "modules": report}, f, indent=2, sort_keys=True)
+        click.echo(f"wrote {output}")
+
+
+# Batch solving across a process pool
+from batch import run_batch
+@app.route('/api/batch', methods=['POST'])
+def solve_batch():
     data = request.get_json()
-    premises = data.get("premises", [])
-    goal = data.get("goal", "")
-    result = prove_custom_logic(premises, goal)
-    return jsonify(result)
\ No newline at end of file
+    jobs = data.get("jobs") if isinstance(data, dict) else None
+    if not isinstance(jobs, list) or not all(isinstance(job, dict) for job in jobs):
+        return jsonify({"error": "'jobs' must be a list of {algorithm, params} objects"}), 400
+    if len(jobs) > app.config["BATCH_MAX_JOBS"]:
+        return jsonify({"error": f"A batch holds at most {app.config['BATCH_MAX_JOBS']} jobs"}), 400
+
+    config = {key: app.config[key] for key in solvers.CONFIG_KEYS}
+    results = run_batch(jobs, config, app.config["BATCH_WORKERS"], app.config["BATCH_JOB_TIMEOUT_MS"],
+                        app.config["BATCH_TIMEOUT_MS"])
+
+    if data.get("stream"):
+        # One NDJSON line per job, in the order the jobs finish.
+        def generate():
+            for index, result in results:
+                yield json.dumps({"index": index, **result}) + "\n"
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    ordered = [None] * len(jobs)
+    for index, result in results:
+        ordered[index] = result
+    return jsonify({"results": ordered})
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from functools import wraps
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULT_POLICY = {"ttl": 3600, "max_size": 256}
+
+
+# Request fields serialized for hashing. orjson is much quicker on large
+# bodies such as TSP matrices; both forms sort keys and are only ever compared
+# with keys made the same way.
+def canonical(data):
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str).encode()
+
+
+# True for a result cut short by a time or node limit, which the solvers mark
+# with "limited": true. Such results depend on the machine and its load, so
+# they are never stored.
+def limited(payload):
+    return isinstance(payload, dict) and payload.get("limited") is True
+
+
+# Two-tier memo for the solvers: a per-route in-process LRU, backed by an
+# optional SQLite table that survives restarts and is shared by every worker
+# using the same database. Entries are keyed on a hash of the route name and
+# the route's relevant request fields, serialized canonically. Only 2xx
+# results that were not cut short by a limit are stored, and a route can opt
+# a request out of the cache entirely with a bypass predicate.
+class SolverCache:
+    def __init__(self):
+        self.policies = {}
+        self.fields = {}
+        self.bypass = {}
+        self.memory = defaultdict(OrderedDict)
+        self.counts = defaultdict(Counter)
+        self.lock = threading.Lock()
+        self.engine = None
+        self.table = None
+
+    def configure(self, policies, engine=None, table=None):
+        self.policies = dict(policies)
+        self.engine = engine
+        self.table = table
+
+    def cacheable(self, name, data):
+        if name not in self.fields:
+            return False
+        bypass = self.bypass.get(name)
+        return bypass is None or not bypass(data)
+
+    def policy(self, name):
+        return {**DEFAULT_POLICY, **self.policies.get(name, {})}
+
+    def key(self, name, data):
+        fields = self.fields.get(name)
+        if fields is not None and isinstance(data, dict):
+            data = {field: data[field] for field in fields if field in data}
+        return hashlib.sha256(canonical([name, data])).hexdigest()
+
+    # Returns (key, (payload, status)) on a hit and (key, None) on a miss; the
+    # key is computed up front because some solvers mutate their request.
+    def lookup(self, name, data):
+        key = self.key(name, data)
+        now = time.time()
+        with self.lock:
+            entries = self.memory[name]
+            entry = entries.get(key)
+            if entry is not None:
+                expires_at, payload, status = entry
+                if expires_at > now:
+                    entries.move_to_end(key)
+                    self.counts[name]["memory_hits"] += 1
+                    return key, (payload, status)
+                del entries[key]
+
+        if self.engine is not None:
+            try:
+                with self.engine.connect() as conn:
+                    row = conn.execute(
+                        select(self.table.c.payload, self.table.c.status, self.table.c.expires_at)
+                        .where(self.table.c.key == key, self.table.c.expires_at > now)
+                    ).first()
+            except Exception:
+                row = None
+                self.counts[name]["persistent_errors"] += 1
+            if row is not None:
+                payload = json.loads(row.payload)
+                self._remember(name, key, row.expires_at, payload, row.status)
+                self.counts[name]["persistent_hits"] += 1
+                return key, (payload, row.status)
+
+        self.counts[name]["misses"] += 1
+        return key, None
+
+    def _remember(self, name, key, expires_at, payload, status):
+        with self.lock:
+            entries = self.memory[name]
+            entries[key] = (expires_at, payload, status)
+            entries.move_to_end(key)
+            while len(entries) > self.policy(name)["max_size"]:
+                entries.popitem(last=False)
+
+    def store(self, name, key, payload, status):
+        if not 200 <= status < 300 or limited(payload):
+            return
+        policy = self.policy(name)
+        now = time.time()
+        self._remember(name, key, now + policy["ttl"], payload, status)
+        self.counts[name]["stores"] += 1
+        if self.engine is None:
+            return
+        t = self.table
+        values = {"key": key, "route": name, "payload": json.dumps(payload), "status": status,
+                  "created_at": now, "expires_at": now + policy["ttl"]}
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(t).values(values).on_conflict_do_update(index_elements=[t.c.key], set_=values))
+                keep = select(t.c.key).where(t.c.route == name).order_by(t.c.created_at.desc()).limit(policy["max_size"])
+                conn.execute(delete(t).where(t.c.route == name, (t.c.expires_at <= now) | t.c.key.not_in(keep)))
+        except Exception:
+            self.counts[name]["persistent_errors"] += 1
+
+    def stats(self):
+        with self.lock:
+            routes = set(self.counts) | {name for name, entries in self.memory.items() if entries}
+            return {
+                name: {**self.counts[name], "memory_size": len(self.memory[name]), **self.policy(name)}
+                for name in sorted(routes)
+            }
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+            self.counts.clear()
+        if self.engine is not None:
+            with self.engine.begin() as conn:
+                conn.execute(delete(self.table))
+
+
+CACHE = SolverCache()
+
+
+# Memoizes a solver(data, config, stats) under `name`. `fields` lists the
+# request fields that determine the result; anything else in the body is
+# ignored. A hit only marks the stats as a cache hit. `bypass(data)` returning
+# True sends that request straight to the solver without touching the cache.
+def cached(name, fields=None, bypass=None):
+    CACHE.fields[name] = fields
+    if bypass is not None:
+        CACHE.bypass[name] = bypass
+
+    def decorator(solver):
+        @wraps(solver)
+        def wrapper(data, config, stats=None):
+            if bypass is not None and bypass(data):
+                return solver(data, config, stats)
+            key, hit = CACHE.lookup(name, data)
+            if hit is not None:
+                if stats is not None:
+                    stats.cache_hit = True
+                return hit
+            payload, status = solver(data, config, stats)
+            CACHE.store(name, key, payload, status)
+            return payload, status
+        return wrapper
+    return decorator
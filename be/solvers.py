@@ -0,0 +1,469 @@
+import time
+from functools import partial
+from algorithms.tic_tac_toe import check_winner, is_draw, make_move
+from plugins import lazy
+from solver_cache import cached
+
+tsp_dfs_bfs = lazy("algorithms.tsp_dfs_bfs")
+tsp_held_karp = lazy("algorithms.tsp_held_karp")
+tsp_local_search = lazy("algorithms.tsp_local_search")
+tsp_matrix = lazy("algorithms.tsp_matrix")
+tic_tac_toe_vsComputer = lazy("algorithms.tic_tac_toe_vsComputer")
+k_in_a_row = lazy("algorithms.k_in_a_row")
+water_jug_hill_climbing = lazy("algorithms.water_jug_hill")
+water_jug_n = lazy("algorithms.water_jug_n")
+eight_puzzle_greedy = lazy("algorithms.eight_puzzle_greedy")
+astar_eight_puzzle = lazy("algorithms.astar_eight_puzzle")
+puzzle_engine = lazy("algorithms.puzzle_engine")
+sliding = lazy("algorithms.sliding_puzzle")
+predicate_resolution = lazy("algorithms.predicate_resolution")
+
+# Request-level solvers shared by the algorithm routes and /api/batch. Each
+# takes the parsed JSON body and the app config and returns (payload, status),
+# and none of them touch Flask, so they can run in a worker process. An
+# optional SearchStats is filled in by the solvers whose searches are
+# instrumented and ignored by the rest. The algorithm modules behind them are
+# imported on first use (see plugins.py).
+
+# Config keys the solvers read; /api/batch ships these to its workers.
+CONFIG_KEYS = [
+    "TSP_MAX_CITIES", "TSP_MAX_TIME_BUDGET_MS", "PDB_FOLDER", "SLIDING_PUZZLE_MAX_TIME_MS",
+    "TICTACTOE_MAX_TIME_MS", "LOGIC_TIME_LIMIT_MS", "LOGIC_MAX_CLAUSES", "LOGIC_POOL_SIZE",
+    "STREAM_PROGRESS_MS", "STREAM_PATH_CHUNK", "SEARCH_MAX_NODES", "SEARCH_MAX_TIME_MS", "SEARCH_MAX_BEAM_WIDTH",
+    "WATER_JUG_HILL_MAX_RESTARTS", "WATER_JUG_HILL_MAX_TIME_MS", "LOGIC_ENGINE",
+]
+
+TSP_METHODS = {
+    "dfs": (tsp_dfs_bfs, "dfs_tsp"),
+    "bfs": (tsp_dfs_bfs, "bfs_tsp"),
+    "held-karp": (tsp_held_karp, "held_karp_tsp"),
+    "local": (tsp_local_search, "local_search_tsp"),
+}
+
+
+# Returns (graph, None) or (None, error). The graph is the request's
+# dict-of-dicts "graph", or a tsp_matrix.DistanceMatrix when the body has
+# "matrix" or "matrix_b64" (plus optional "cities") instead.
+def tsp_input(data, config):
+    method = data.get("method", "dfs")
+    if data.get("matrix") is not None or data.get("matrix_b64") is not None:
+        try:
+            graph = tsp_matrix.parse_matrix(data)
+        except ValueError as e:
+            return None, ({"error": str(e)}, 400)
+    else:
+        graph = data.get("graph")
+    if not graph or not data.get("start"):
+        return None, ({"error": "Missing 'graph' (or 'matrix') or 'start' parameter"}, 400)
+    if not isinstance(graph, (dict, tsp_matrix.DistanceMatrix)):
+        return None, ({"error": "'graph' must be an object of {city: {neighbour: cost}}"}, 400)
+    if not isinstance(data["start"], str):
+        return None, ({"error": "'start' must be a city name"}, 400)
+    if data["start"] not in graph:
+        return None, ({"error": f"Start city '{data['start']}' is not in the graph"}, 400)
+    if len(graph) < 2:
+        return None, ({"error": "A tour needs at least 2 cities"}, 400)
+
+    if not isinstance(method, str) or method not in TSP_METHODS:
+        return None, ({"error": "Invalid method. Choose 'dfs', 'bfs', 'held-karp' or 'local'."}, 400)
+
+    max_cities = config["TSP_MAX_CITIES"].get(method)
+    if max_cities is not None and len(graph) > max_cities:
+        return None, ({"error": f"Method '{method}' supports at most {max_cities} cities, got {len(graph)}"}, 400)
+    return graph, None
+
+
+# A tour as the TSP routes return it. When missing edges leave no tour
+# through every city, every method answers an empty path and a null cost.
+def tour(path, cost):
+    if not path or cost == float('inf'):
+        return {"path": [], "cost": None}
+    return {"path": path, "cost": cost}
+
+
+@cached("tsp", fields=["graph", "matrix", "matrix_b64", "cities", "start", "method", "time_budget_ms"])
+def tsp(data, config, stats=None):
+    try:
+        graph, error = tsp_input(data, config)
+    except (TypeError, ValueError) as e:
+        return {"error": str(e)}, 400
+    if error:
+        return error
+    try:
+        start = data.get("start")
+        method = data.get("method", "dfs")
+
+        if method == "local":
+            time_budget_ms = data.get("time_budget_ms", 1000)
+            if not isinstance(time_budget_ms, (int, float)) or time_budget_ms <= 0:
+                return {"error": "'time_budget_ms' must be a positive number"}, 400
+            time_budget_ms = min(time_budget_ms, config["TSP_MAX_TIME_BUDGET_MS"])
+            path, cost, local_stats = tsp_local_search.local_search_tsp(graph, start, time_budget_ms)
+            if stats is not None:
+                stats.algorithm = "local"
+                stats.add_phase("search", local_stats["elapsed_ms"] / 1000)
+            payload = {**tour(path, cost), "stats": local_stats}
+            if local_stats["timed_out"]:
+                payload["limited"] = True
+            return payload, 200
+
+        module, function = TSP_METHODS[method]
+        path, cost = getattr(module, function)(graph, start, stats=stats)
+        return tour(path, cost), 200
+
+    except Exception as e:
+        return {"error": str(e)}, 500
+
+
+@cached("tictactoe-vs-computer", fields=["board", "x", "y", "size", "k", "time_limit_ms"])
+def tictactoe_vs_computer(data, config, stats=None):
+    board = data.get('board')
+    x = data.get('x')
+    y = data.get('y')
+
+    if 'size' in data or 'k' in data:
+        return k_in_a_row_vs_computer(data, board, x, y, config, stats)
+
+    # Human always plays 'X', computer is 'O'
+    if not make_move(board, x, y, 'X'):
+        return {'error': 'Invalid move'}, 400
+
+    winner = check_winner(board)
+    draw = is_draw(board) if not winner else False
+
+    if winner or draw:
+        return {
+            'board': board,
+            'winner': winner,
+            'is_draw': draw
+        }, 200
+    comp_move = tic_tac_toe_vsComputer.get_computer_move(board, ai_player='O', human_player='X', stats=stats)
+    if comp_move:
+        make_move(board, comp_move[0], comp_move[1], 'O')
+    winner = check_winner(board)
+    draw = is_draw(board) if not winner else False
+    return {
+        'board': board,
+        'winner': winner,
+        'is_draw': draw
+    }, 200
+
+
+def k_in_a_row_vs_computer(data, board, x, y, config, stats=None):
+    try:
+        size = int(data.get('size', 3))
+        k = int(data.get('k', size))
+        time_limit_ms = min(data.get('time_limit_ms', 1000), config["TICTACTOE_MAX_TIME_MS"])
+        k_in_a_row.get_game(size, k)
+    except (TypeError, ValueError) as e:
+        return {'error': f'Invalid input: {e}'}, 400
+    if (not isinstance(board, list) or len(board) != size
+            or any(not isinstance(row, list) or len(row) != size for row in board)
+            or any(cell not in ('', 'X', 'O') for row in board for cell in row)):
+        return {'error': f'Board must be a {size}x{size} grid of "", "X" or "O"'}, 400
+    if not isinstance(x, int) or not isinstance(y, int) or not (0 <= x < size and 0 <= y < size):
+        return {'error': 'Invalid move'}, 400
+
+    if not make_move(board, x, y, 'X'):
+        return {'error': 'Invalid move'}, 400
+
+    winner = k_in_a_row.check_winner(board, k)
+    draw = is_draw(board) if not winner else False
+    timed_out = False
+    if not winner and not draw:
+        comp_move, timed_out = k_in_a_row.search_move(board, k, ai_player='O', human_player='X',
+                                                      time_limit_ms=time_limit_ms, stats=stats)
+        if comp_move:
+            make_move(board, comp_move[0], comp_move[1], 'O')
+        winner = k_in_a_row.check_winner(board, k)
+        draw = is_draw(board) if not winner else False
+    payload = {
+        'board': board,
+        'winner': winner,
+        'is_draw': draw,
+        'timed_out': timed_out
+    }
+    if timed_out:
+        payload['limited'] = True
+    return payload, 200
+
+
+# Unseeded randomized runs are meant to differ from call to call.
+def unseeded(data):
+    return data.get("method", "steepest") != "steepest" and data.get("seed") is None
+
+
+@cached("water-jug-hill", fields=["start", "goal", "capacities", "method", "restarts", "seed", "time_budget_ms"],
+        bypass=unseeded)
+def water_jug_hill(data, config, stats=None):
+    start = data.get("start", [0, 0])
+    goal = data.get("goal", [2, 0])
+    capacities = data.get("capacities", [4, 3])
+    method = data.get("method", "steepest")
+    if not all(isinstance(v, list) for v in (start, goal, capacities)) or len(capacities) != 2:
+        return {"error": "'start', 'goal' and 'capacities' must be lists of two amounts"}, 400
+    error = water_jug_n.infeasibility(capacities, start, goal)
+    if error:
+        return {"error": error}, 400
+    start, goal = tuple(start), tuple(goal)
+    solver = water_jug_hill_climbing.WaterJugHillClimbing(start, capacities[0], capacities[1], goal)
+    if method == "steepest":
+        path = solver.solve(start, stats)
+        return {
+            "path": path,
+            "success": path[-1] == goal
+        }, 200
+
+    restarts = data.get("restarts", 1000)
+    seed = data.get("seed")
+    time_budget_ms = data.get("time_budget_ms", 1000)
+    if not isinstance(restarts, int) or isinstance(restarts, bool) or restarts < 1:
+        return {"error": "'restarts' must be a positive integer"}, 400
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool) or seed < 0):
+        return {"error": "'seed' must be a non-negative integer"}, 400
+    if not isinstance(time_budget_ms, (int, float)) or time_budget_ms <= 0:
+        return {"error": "'time_budget_ms' must be a positive number"}, 400
+    try:
+        result = solver.solve_restarts(start, method, restarts=min(restarts, config["WATER_JUG_HILL_MAX_RESTARTS"]),
+                                       seed=seed, time_budget_ms=min(time_budget_ms, config["WATER_JUG_HILL_MAX_TIME_MS"]),
+                                       stats=stats)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    return result, 200
+
+
+@cached("eight-puzzle-gbfs", fields=["start", "goal"])
+def eight_puzzle_gbfs(data, config, stats=None):
+    start = data.get("start")
+    goal = data.get("goal")
+    if not start or not goal:
+        return {"error": "Start and goal states are required"}, 400
+    try:
+        result = eight_puzzle_greedy.greedy_best_first_search(start, goal, stats)
+    except (TypeError, ValueError) as e:
+        return {"success": False, "error": str(e)}, 400
+    response = {
+        "path": result["path"],
+        "success": result["success"]
+    }
+    for field in ("reason", "limited"):
+        if field in result:
+            response[field] = result[field]
+    return response, 200
+
+
+@cached("water-jug-astar", fields=["capacities", "capacity", "start", "goal"])
+def water_jug_astar(data, config, stats=None):
+    try:
+        capacities = data["capacities"] if "capacities" in data else data["capacity"]
+        start = data.get("start", [0] * len(capacities))
+        goal = data["goal"]
+        # Same contract as water_jug_hill: an impossible goal is a bad request.
+        error = water_jug_n.infeasibility(capacities, start, goal)
+        if error:
+            return {"error": error}, 400
+        result = water_jug_n.solve_water_jug(capacities, start, goal)
+
+        return result, 200
+
+    except Exception as e:
+        return {"error": str(e)}, 400
+
+
+# Search mode options of the A* routes (see algorithms/search_core.py), with
+# the node count and time capped by config. Raises ValueError on bad input.
+def search_options(data, config):
+    mode = data.get("mode", "astar")
+    weight = data.get("weight", 2 if mode in ("weighted", "ara") else 1)
+    beam_width = data.get("beam_width", 100)
+    time_limit_ms = data.get("time_limit_ms", config["SEARCH_MAX_TIME_MS"])
+    for name, value in (("weight", weight), ("beam_width", beam_width), ("time_limit_ms", time_limit_ms)):
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+            raise ValueError(f"'{name}' must be a positive number")
+    return {
+        "mode": mode,
+        "weight": weight,
+        "beam_width": min(int(beam_width), config["SEARCH_MAX_BEAM_WIDTH"]),
+        "time_limit_ms": min(time_limit_ms, config["SEARCH_MAX_TIME_MS"]),
+        "max_nodes": config["SEARCH_MAX_NODES"],
+    }
+
+
+@cached("eight-puzzle-astar", fields=["start", "goal", "bidirectional", "mode", "weight", "beam_width", "time_limit_ms"])
+def eight_puzzle_astar(data, config, stats=None):
+    try:
+        start = data.get('start')
+        goal = data.get('goal')
+
+        if not start or not goal:
+            raise ValueError("Missing 'start' or 'goal' board.")
+
+        if data.get('bidirectional'):
+            options = search_options(data, config)
+            result = puzzle_engine.bidirectional_search(start, goal, options["time_limit_ms"], options["max_nodes"],
+                                                        stats)
+        else:
+            result = astar_eight_puzzle.a_star_puzzle(start, goal, stats, **search_options(data, config))
+        return result, 200
+    except Exception as e:
+        return {"success": False, "error": str(e)}, 400
+
+
+@cached("sliding-puzzle", fields=["start", "goal", "time_limit_ms"])
+def sliding_puzzle(data, config, stats=None):
+    try:
+        start = data.get('start')
+        if not start:
+            raise ValueError("Missing 'start' board.")
+        n = len(start)
+        if n not in sliding.PATTERNS:
+            raise ValueError(f"Board size must be one of {sorted(sliding.PATTERNS)}, got {n}x{n}.")
+        goal = data.get('goal')
+        if not goal:
+            tiles = list(range(1, n * n)) + [0]
+            goal = [tiles[i:i + n] for i in range(0, n * n, n)]
+        time_limit_ms = data.get('time_limit_ms', config["SLIDING_PUZZLE_MAX_TIME_MS"])
+        if not isinstance(time_limit_ms, (int, float)) or isinstance(time_limit_ms, bool) or not time_limit_ms > 0:
+            raise ValueError("'time_limit_ms' must be a positive number")
+        time_limit_ms = min(time_limit_ms, config["SLIDING_PUZZLE_MAX_TIME_MS"])
+        result = sliding.ida_star(start, goal, config["PDB_FOLDER"], time_limit_ms)
+        return result, 200
+    except Exception as e:
+        return {"success": False, "error": str(e)}, 400
+
+
+def custom_logic(data, config, stats=None):
+    premises = data.get("premises", [])
+    goal = data.get("goal", "")
+    engine = data.get("engine", config["LOGIC_ENGINE"])
+    if engine not in predicate_resolution.ENGINES:
+        return {"error": f"'engine' must be one of {', '.join(predicate_resolution.ENGINES)}"}, 400
+    result = predicate_resolution.prove_custom_logic(premises, goal,
+                                                     time_limit_ms=config["LOGIC_TIME_LIMIT_MS"],
+                                                     max_clauses=config["LOGIC_MAX_CLAUSES"],
+                                                     pool_size=config["LOGIC_POOL_SIZE"],
+                                                     engine=engine)
+    return result, 200
+
+
+# Streaming variants of the search routes. They yield progress events while
+# the search runs, then the path in chunks and a final "done" event carrying the
+# rest of the result. Bad input, including input malformed enough to raise
+# TypeError or ValueError, comes out as a lone 400 "error" event before any
+# work is done. Closing the generator abandons the search.
+def result_events(payload, status, config, began):
+    if status >= 400:
+        yield {"event": "error", "http_status": status, **payload}
+        return
+    payload = dict(payload)
+    path = payload.pop("path", [])
+    chunk = config["STREAM_PATH_CHUNK"]
+    for offset in range(0, len(path), chunk):
+        yield {"event": "path", "offset": offset, "steps": path[offset:offset + chunk]}
+    payload["path_length"] = len(path)
+    payload["elapsed_ms"] = round((time.perf_counter() - began) * 1000, 3)
+    yield {"event": "done", **payload}
+
+
+def tsp_events(data, config):
+    began = time.perf_counter()
+    if data.get("method", "dfs") != "dfs":
+        yield from result_events(*tsp(data, config), config, began)
+        return
+    try:
+        graph, error = tsp_input(data, config)
+    except (TypeError, ValueError) as e:
+        graph, error = None, ({"error": str(e)}, 400)
+    if error:
+        yield from result_events(*error, config, began)
+        return
+    try:
+        path, cost = yield from tsp_dfs_bfs.dfs_tsp_events(graph, data["start"], config["STREAM_PROGRESS_MS"])
+    except Exception as e:
+        yield from result_events({"error": str(e)}, 500, config, began)
+        return
+    yield from result_events(tour(path, cost), 200, config, began)
+
+
+def eight_puzzle_events(data, config, greedy=False):
+    began = time.perf_counter()
+    if data.get("bidirectional"):
+        yield from result_events(*eight_puzzle_astar(data, config), config, began)
+        return
+    start = data.get("start")
+    goal = data.get("goal")
+    if not start or not goal:
+        yield from result_events({"error": "Missing 'start' or 'goal' board."}, 400, config, began)
+        return
+    try:
+        options = {} if greedy else search_options(data, config)
+        result = yield from puzzle_engine.best_first_events(start, goal, greedy, config["STREAM_PROGRESS_MS"],
+                                                            **options)
+    except Exception as e:
+        yield from result_events({"success": False, "error": str(e)}, 400, config, began)
+        return
+    yield from result_events(result, 200, config, began)
+
+
+# The inverse of result_events: runs a streaming solver to the end and returns
+# the (payload, status) its plain variant would have, handing each progress
+# event to `progress` on the way.
+def collect(events, progress=None):
+    path = []
+    for event in events:
+        kind = event.pop("event")
+        if kind == "progress":
+            if progress is not None:
+                progress(event)
+        elif kind == "path":
+            path.extend(event["steps"])
+        elif kind == "error":
+            status = event.pop("http_status")
+            return event, status
+        else:
+            event.pop("path_length")
+            event.pop("elapsed_ms")
+            return {**event, "path": path}, 200
+
+
+# Solvers with a streaming variant, which async jobs use to report progress.
+EVENT_SOLVERS = {
+    "tsp": tsp_events,
+    "eight-puzzle-astar": eight_puzzle_events,
+    "eight-puzzle-gbfs": partial(eight_puzzle_events, greedy=True),
+}
+SOLVERS = {
+    "tsp": tsp,
+    "tictactoe-vs-computer": tictactoe_vs_computer,
+    "water-jug-hill": water_jug_hill,
+    "eight-puzzle-gbfs": eight_puzzle_gbfs,
+    "water-jug-astar": water_jug_astar,
+    "eight-puzzle-astar": eight_puzzle_astar,
+    "sliding-puzzle": sliding_puzzle,
+    "custom-logic": custom_logic,
+}
+
+# Proofs already run in their own process pool, so batches run them inline
+# instead of sending them to a batch worker.
+INLINE = {"custom-logic"}
+
+
+# Why a batch or queued job cannot run, or None if it can.
+def job_error(algorithm, params):
+    if not isinstance(algorithm, str) or algorithm not in SOLVERS:
+        return f"Unknown algorithm '{algorithm}'"
+    if not isinstance(params, dict):
+        return "'params' must be an object"
+    return None
+
+
+# Runs one batch job and never raises, so one bad job cannot sink the batch.
+def run_job(algorithm, params, config):
+    error = job_error(algorithm, params)
+    if error:
+        return {"status": "error", "http_status": 400, "result": {"error": error}}
+    try:
+        payload, status = SOLVERS[algorithm](params, config)
+    except Exception as e:
+        payload, status = {"error": str(e)}, 500
+    return {"status": "ok" if status < 400 else "error", "http_status": status, "result": payload}
@@ -0,0 +1,136 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+from flask import Response, abort, request, send_file
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Serves the Vite build. Compressible files get .br/.gz siblings, written by
+# `flask compress-assets` after a build or on first request, and the best one
+# the client accepts is sent. Vite's fingerprinted files (assets/name-HASH.ext)
+# never change, so they are cached for a year; index.html is held in memory
+# and revalidated by ETag. Unknown non-asset paths fall back to index.html so
+# client-side routes work on reload.
+
+COMPRESSIBLE = {".js", ".mjs", ".css", ".html", ".svg", ".json", ".map", ".txt", ".xml", ".wasm", ".ico"}
+MIN_COMPRESS_SIZE = 1024
+# Vite writes fingerprinted files as assets/[name]-[hash].[ext] with an
+# 8-character base64url hash; public/ files such as service-worker.js are
+# copied to the root under their own names and must stay revalidated.
+HASHED_NAME = re.compile(r"^assets/[^/]+-[A-Za-z0-9_-]{8}\.[a-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+ENCODERS = {"gzip": (".gz", lambda data: gzip.compress(data, 9, mtime=0))}
+if brotli is not None:
+    ENCODERS["br"] = (".br", lambda data: brotli.compress(data, quality=11))
+
+
+def compressible(path):
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE and os.path.getsize(path) >= MIN_COMPRESS_SIZE
+
+
+# Writes the compressed sibling of `path` for `encoding` if it is missing or
+# older than the source; returns its path, or None if it cannot be written.
+def ensure_compressed(path, encoding):
+    suffix, encode = ENCODERS[encoding]
+    target = path + suffix
+    try:
+        if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+            return target
+        with open(path, "rb") as f:
+            data = encode(f.read())
+        tmp = f"{target}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, target)
+        return target
+    except OSError:
+        return None
+
+
+def compress_folder(folder):
+    written = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith((".gz", ".br", ".tmp")) or not compressible(path):
+                continue
+            for encoding in ENCODERS:
+                target = ensure_compressed(path, encoding)
+                if target:
+                    written.append(target)
+    return written
+
+
+def negotiate():
+    accepted = request.accept_encodings
+    best = max(ENCODERS, key=lambda encoding: (accepted[encoding], encoding == "br"), default=None)
+    return best if best and accepted[best] > 0 else None
+
+
+class IndexPage:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.key = None
+        self.bodies = {}
+        self.etag = None
+
+    def load(self, path):
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            if key != self.key:
+                with open(path, "rb") as f:
+                    data = f.read()
+                self.bodies = {None: data}
+                for encoding, (_, encode) in ENCODERS.items():
+                    self.bodies[encoding] = encode(data)
+                self.etag = hashlib.sha1(data).hexdigest()[:20]
+                self.key = key
+            return self.bodies, self.etag
+
+    def response(self, path):
+        bodies, etag = self.load(path)
+        encoding = negotiate()
+        tag = f"{etag}-{encoding}" if encoding else etag
+        if request.if_none_match.contains(tag):
+            response = Response(status=304)
+        else:
+            response = Response(bodies[encoding], mimetype="text/html")
+            if encoding:
+                response.headers["Content-Encoding"] = encoding
+        response.set_etag(tag)
+        response.headers["Cache-Control"] = REVALIDATE
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+
+index_page = IndexPage()
+
+
+def serve(folder, filename):
+    index = os.path.join(folder, "index.html")
+    path = os.path.realpath(os.path.join(folder, filename))
+    inside = path.startswith(os.path.realpath(folder) + os.sep)
+    if not filename or filename == "index.html" or not (inside and os.path.isfile(path)):
+        # Missing API routes and build files are real 404s, not the app shell.
+        if filename.startswith(("api/", "assets/")) or not os.path.isfile(index):
+            abort(404)
+        return index_page.response(index)
+
+    mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    encoding = negotiate() if compressible(path) else None
+    compressed = ensure_compressed(path, encoding) if encoding else None
+    response = send_file(compressed or path, mimetype=mimetype, conditional=True, etag=True)
+    if compressed:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = IMMUTABLE if HASHED_NAME.match(filename) else REVALIDATE
+    return response
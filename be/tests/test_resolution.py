@@ -0,0 +1,135 @@
+import random
+import time
+from itertools import product
+
+import pytest
+
+from algorithms import resolution_engine
+from algorithms.predicate_resolution import canonical_problem
+from algorithms.proof_pool import ProofPool
+from benchmarks.generators import resolution_chain
+
+TIME_LIMIT_MS = 2000
+MAX_CLAUSES = 1000
+
+
+# First-order problems with known answers. Single lowercase letters are
+# variables in nltk's syntax, so constants and functions have longer names.
+LOGIC_CORPUS = [
+    (["man(socrates)", "all x.(man(x) -> mortal(x))"], "mortal(socrates)", True),
+    (["all x.(man(x) -> mortal(x))"], "mortal(socrates)", False),
+    (["man(marcus)", "pompeian(marcus)", "all x.(pompeian(x) -> roman(x))", "ruler(caesar)",
+      "all x.(roman(x) -> (loyalto(x,caesar) | hate(x,caesar)))", "all x.exists y.loyalto(x,y)",
+      "all x.all y.((person(x) & ruler(y) & tryassassinate(x,y)) -> -loyalto(x,y))",
+      "tryassassinate(marcus,caesar)", "all x.(man(x) -> person(x))"], "hate(marcus,caesar)", True),
+    (["man(marcus)", "pompeian(marcus)", "all x.(pompeian(x) -> roman(x))",
+      "all x.(roman(x) -> (loyalto(x,caesar) | hate(x,caesar)))"], "hate(marcus,caesar)", False),
+    (["all x.(P(x) | Q(x))", "all x.(-P(x) | Q(x))"], "Q(john)", True),
+    (["all x.all y.(P(x) | P(y))"], "exists z.P(z)", True),
+    (["all x.(P(x) -> exists y.Q(x,y))", "P(alice)", "all x.all y.(Q(x,y) -> R(y))"], "exists z.R(z)", True),
+    (["all x.(dog(x) -> animal(x))", "dog(fido) | dog(rex)"], "animal(fido) | animal(rex)", True),
+    (["all x.(dog(x) -> animal(x))", "dog(fido) | dog(rex)"], "animal(fido)", False),
+    (["all x.(P(x) <-> Q(x))", "P(bob)"], "Q(bob)", True),
+    (["all x.(P(x) <-> Q(x))", "P(bob)"], "Q(alice)", False),
+    (["all x.all y.all z.((parent(x,y) & parent(y,z)) -> grandparent(x,z))",
+      "parent(anne,bill)", "parent(bill,carl)"], "grandparent(anne,carl)", True),
+    (["all x.all y.all z.((parent(x,y) & parent(y,z)) -> grandparent(x,z))",
+      "parent(anne,bill)", "parent(bill,carl)"], "grandparent(bill,carl)", False),
+    (["all x.(-loves(x,x))", "all x.exists y.loves(x,y)"], "exists x.exists y.(loves(x,y) & -(x = y))", True),
+    (["all x.(barber(x) <-> -shaves(x,x))"], "-exists x.(barber(x) & shaves(x,x))", True),
+    (["john = bob", "tall(john)"], "tall(bob)", True),
+    (["all x.(father(x) = x)", "happy(john)"], "happy(father(father(john)))", True),
+    (["john = bob", "tall(john)"], "tall(carl)", False),
+]
+
+
+# Random ground problems over a few atoms, labelled by truth table: the goal
+# follows exactly when every assignment that satisfies the premises satisfies
+# it too.
+def ground_problem(rng, atoms=4, premises=4, depth=2):
+    names = [f"{name}(today)" for name in ("rain", "wet", "cold", "windy", "sunny", "cloudy")[:atoms]]
+
+    def formula(level):
+        if level == 0 or rng.random() < 0.3:
+            atom = rng.randrange(atoms)
+            return ("not", ("atom", atom)) if rng.random() < 0.3 else ("atom", atom)
+        op = rng.choice(["and", "or", "implies", "iff", "not"])
+        if op == "not":
+            return (op, formula(level - 1))
+        return (op, formula(level - 1), formula(level - 1))
+
+    def text(f):
+        if f[0] == "atom":
+            return names[f[1]]
+        if f[0] == "not":
+            return f"-{text(f[1])}"
+        symbol = {"and": "&", "or": "|", "implies": "->", "iff": "<->"}[f[0]]
+        return f"({text(f[1])} {symbol} {text(f[2])})"
+
+    def holds(f, values):
+        if f[0] == "atom":
+            return values[f[1]]
+        if f[0] == "not":
+            return not holds(f[1], values)
+        a, b = holds(f[1], values), holds(f[2], values)
+        return {"and": a and b, "or": a or b, "implies": not a or b, "iff": a == b}[f[0]]
+
+    given = [formula(depth) for _ in range(premises)]
+    goal = formula(depth)
+    entailed = all(holds(goal, values) for values in product((False, True), repeat=atoms)
+                   if all(holds(f, values) for f in given))
+    return [text(f) for f in given], text(goal), entailed
+
+
+
+CORPUS = LOGIC_CORPUS + [(*resolution_chain(length, provable), provable)
+                         for length in range(1, 7) for provable in (True, False)]
+_rng = random.Random(0)
+CORPUS += [ground_problem(_rng, atoms=3, premises=3) for _ in range(60)]
+
+
+# Workers are daemon processes, so they go away with the test run.
+@pytest.fixture(scope="module")
+def pool():
+    return ProofPool(2)
+
+
+# The indexed engine may run out of clauses, but whatever it finishes with
+# must be right.
+@pytest.mark.parametrize("premises, goal, expected", CORPUS)
+def test_indexed_engine_is_sound(premises, goal, expected):
+    status = resolution_engine.prove(premises, goal, MAX_CLAUSES)["status"]
+    assert status in ("proved", "not_proved", "limit")
+    if status != "limit":
+        assert status == ("proved" if expected else "not_proved")
+
+
+# nltk is the reference engine, though it can prove non-theorems and time out:
+# wherever it gets the right answer, the indexed engine must give it too.
+def test_indexed_engine_matches_nltk(pool):
+    disagreements = []
+    for premises, goal, expected in CORPUS:
+        reference = pool.prove(premises, goal, TIME_LIMIT_MS, MAX_CLAUSES, "nltk")["status"]
+        if reference not in ("proved", "not_proved") or (reference == "proved") != expected:
+            continue
+        indexed = pool.prove(premises, goal, TIME_LIMIT_MS, MAX_CLAUSES, "indexed")["status"]
+        if indexed != reference:
+            disagreements.append(f"{premises} |- {goal}: nltk {reference}, indexed {indexed}")
+    assert not disagreements, "\n".join(disagreements)
+
+
+# Long clauses over a few binary predicates used to send subsumption into
+# minutes of backtracking before the clause limit was reached.
+def test_subsumption_stays_bounded():
+    premises = ["sa(cat,ann)", "pa(bob)", "sa(dan,dan)", "pa(dan)", "ta(dan)", "all z.(sa(z,z) -> pa(z))",
+                "all x z.(qa(z) & ra(x,z) -> ra(z,z))", "all x z.(ra(x,z) -> sa(x,z))",
+                "all x y z.(sa(x,z) & ra(x,y) -> ra(x,z))", "all z.(pa(z) -> sa(z,z))"]
+    began = time.perf_counter()
+    result = resolution_engine.prove(premises, "ra(ann,cat)", MAX_CLAUSES)
+    assert result["status"] in ("not_proved", "limit")
+    assert time.perf_counter() - began < 10
+
+
+def test_alpha_equivalent_problems_share_a_cache_key():
+    assert canonical_problem(["all x y.(P(x) -> Q(y))", "all x.(P(x) & exists y.Q(x,y))"], "exists y x.R(y,x)") == \
+        canonical_problem(["all y x.(P(y) -> Q(x))", "all y.(P(y) & exists x.Q(y,x))"], "exists x y.R(x,y)")
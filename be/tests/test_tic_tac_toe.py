@@ -0,0 +1,20 @@
+import pytest
+
+from algorithms import tic_tac_toe_vsComputer as ttt
+
+
+def test_move_table_matches_minimax():
+    assert ttt.verify_move_table() == []
+
+
+def test_move_table_covers_every_legal_position():
+    # Positions reachable from the empty board, finished ones included.
+    assert ttt.LEGAL_POSITIONS == 5478
+
+
+# The table is indexed from the mover's side, so it serves either symbol.
+@pytest.mark.parametrize("ai_player, human_player", [("O", "X"), ("X", "O")])
+def test_lookup_agrees_with_minimax_for_both_sides(ai_player, human_player):
+    board = [[human_player, "", ""], ["", ai_player, ""], ["", "", human_player]]
+    _, expected = ttt.minimax([row[:] for row in board], True, ai_player, human_player)
+    assert ttt.get_computer_move(board, ai_player, human_player) == expected
@@ -0,0 +1,34 @@
+import pytest
+
+import solvers
+
+CONFIG = {"TSP_MAX_CITIES": {}, "TSP_MAX_TIME_BUDGET_MS": 10000, "STREAM_PROGRESS_MS": 250, "STREAM_PATH_CHUNK": 100}
+GRAPH = {"A": {"B": 1, "C": 4}, "B": {"A": 1, "C": 2}, "C": {"A": 3, "B": 2}}
+
+
+@pytest.mark.parametrize("body", [
+    {"graph": GRAPH, "start": ["A"]},
+    {"graph": GRAPH, "start": "Z"},
+    {"graph": [1, 2], "start": "A"},
+    {"graph": GRAPH, "start": "A", "method": ["dfs"]},
+])
+@pytest.mark.parametrize("method", ["dfs", "held-karp"])
+def test_bad_input_streams_a_single_error_event(body, method):
+    events = list(solvers.tsp_events({"method": method, **body}, CONFIG))
+    assert len(events) == 1
+    assert events[0]["event"] == "error" and events[0]["http_status"] == 400
+
+
+@pytest.mark.parametrize("method", ["dfs", "bfs", "held-karp", "local"])
+def test_missing_matrix_edges_give_the_same_answer_on_every_method(method):
+    # The only tour through all three cities needs the missing 0-2 edge.
+    no_tour = {"matrix": [[0, 1, None], [1, 0, 2], [None, 2, 0]], "start": "0", "method": method}
+    payload, status = solvers.tsp.__wrapped__(no_tour, CONFIG)
+    assert status == 200
+    assert (payload["path"], payload["cost"]) == ([], None)
+
+    # With 2->0 present, only 0->2 is missing and 0-1-2-0 still works.
+    one_way = {"matrix": [[0, 1, None], [1, 0, 2], [3, 2, 0]], "start": "0", "method": method}
+    payload, status = solvers.tsp.__wrapped__(one_way, CONFIG)
+    assert status == 200
+    assert (payload["path"], payload["cost"]) == (["0", "1", "2", "0"], 6)
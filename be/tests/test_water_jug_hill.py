@@ -0,0 +1,67 @@
+import pytest
+
+from algorithms import water_jug_n
+from algorithms.water_jug_hill import WaterJugHillClimbing
+import solvers
+
+CASES = [
+    ((4, 3), (2, 0)),
+    ((8, 5), (4, 0)),
+    ((9, 4), (6, 0)),
+    ((17, 13), (9, 0)),
+    ((20, 7), (11, 7)),
+    ((97, 89), (1, 0)),
+]
+CONFIG = {"WATER_JUG_HILL_MAX_RESTARTS": 10000, "WATER_JUG_HILL_MAX_TIME_MS": 5000}
+
+
+def is_walk(solver, path):
+    return all(b in solver.get_next_states(a) for a, b in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("method", ["random-restart", "annealing"])
+@pytest.mark.parametrize("capacities, goal", [((4, 3), (2, 0)), ((17, 13), (9, 0))])
+def test_restarts_reach_goal(capacities, goal, method):
+    optimal = water_jug_n.solve_water_jug(capacities, (0, 0), goal)
+    solver = WaterJugHillClimbing((0, 0), *capacities, goal)
+    result = solver.solve_restarts((0, 0), method, restarts=1000, seed=7, time_budget_ms=5000)
+
+    assert result["success"]
+    assert result["success_rate"] == round(result["successes"] / result["restarts"], 4)
+    path = result["path"]
+    assert path[0] == (0, 0) and path[-1] == goal
+    assert is_walk(solver, path)
+    assert len(path) >= len(optimal["path"])
+
+
+# Run 0 makes no random moves, so it is a plain steepest-ascent climb and must
+# stop where no neighbour is nearer the goal.
+@pytest.mark.parametrize("capacities, goal", CASES)
+def test_random_restart_stops_at_local_maximum(capacities, goal):
+    solver = WaterJugHillClimbing((0, 0), *capacities, goal)
+    result = solver.solve_restarts((0, 0), "random-restart", restarts=1, seed=7)
+    path = result["path"]
+    assert is_walk(solver, path)
+    heights = [solver.heuristic(state) for state in path]
+    assert heights == sorted(heights, reverse=True)
+    assert result["success"] or all(solver.heuristic(s) >= heights[-1] for s in solver.get_next_states(path[-1]))
+
+
+# Frozen annealing rejects every move that gets further from the goal.
+@pytest.mark.parametrize("capacities, goal", CASES)
+def test_cold_annealing_never_moves_away(capacities, goal):
+    solver = WaterJugHillClimbing((0, 0), *capacities, goal)
+    result = solver.solve_restarts((0, 0), "annealing", restarts=50, seed=7, temperature=1e-9)
+    heights = [solver.heuristic(state) for state in result["path"]]
+    assert is_walk(solver, result["path"])
+    assert heights == sorted(heights, reverse=True)
+
+
+@pytest.mark.parametrize("goal", [[5, 0], [1, 1], [2, -1]])
+def test_infeasible_goal_is_rejected(goal):
+    for method in ("steepest", "random-restart", "annealing"):
+        payload, status = solvers.water_jug_hill.__wrapped__(
+            {"capacities": [4, 3], "goal": goal, "method": method, "seed": 1}, CONFIG)
+        assert status == 400, payload
+    payload, status = solvers.water_jug_astar.__wrapped__({"capacities": [4, 3], "goal": goal}, CONFIG)
+    assert status == 400 and "error" in payload
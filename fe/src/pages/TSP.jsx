@@ -182,6 +182,8 @@ export default function TSP() {
                         >
                             <option value="dfs">DFS</option>
                             <option value="bfs">BFS</option>
+                            <option value="held-karp">Held-Karp (DP)</option>
+                            <option value="local">Nearest Neighbour + 2-opt</option>
                         </select>
                     </div>
 